@@ -0,0 +1,295 @@
+import argparse
+import csv
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from easyAI import AI_Player
+
+from graph import GameGraph
+from search import CountingDivideByHalf
+from selfplay import AI_BUILDERS
+
+"""
+    ENGINES
+        Description:
+            Silniki porównywane w benchmarku. Każdy wpis zamienia głębokość na specyfikację z selfplay.AI_BUILDERS.
+            Dla każdej konfiguracji AI budowane jest od nowa, więc tablice transpozycji nie przenoszą wyników
+            między pomiarami i wyniki są powtarzalne.
+        Example:
+            "negamax" - Negamax(depth) z easyAI bez tablicy transpozycji
+            "negamax_tt" - Negamax(depth) z easyAI z LRUTranspositionTable(100000)
+            "alphabeta" - AlphaBetaSearch(depth) z pliku search.py
+"""
+ENGINES = {
+    "negamax": lambda depth: ("negamax", depth),
+    "negamax_tt": lambda depth: ("negamax", depth, 100000),
+    "alphabeta": lambda depth: ("alphabeta", depth),
+}
+
+FIELDS = ["engine", "depth", "start_points", "status", "moves", "nodes", "seconds", "nodes_per_sec",
+          "ms_per_move", "max_ms_per_move", "peak_memory_kb", "agreement"]
+
+
+def parse_values(text):
+    """
+    Description:
+        Zamienia tekst z linii poleceń na listę liczb. Obsługuje listy ("1,5,10"), zakresy ("1-25")
+        i zakresy potęg o wspólnej podstawie ("10^1-10^9", "2^10-2^60").
+
+    Parameters:
+        text (str): Wartości oddzielone przecinkami.
+
+    Returns:
+        values (list): Lista liczb całkowitych.
+    """
+    values = []
+    for part in text.split(","):
+        if "^" in part and "-" in part:
+            low, high = part.split("-")
+            base, low_exponent = low.split("^")
+            high_base, high_exponent = high.split("^")
+            if int(base) != int(high_base):
+                raise ValueError("Zakres potęg musi mieć wspólną podstawę, otrzymano: %s" % part)
+            values.extend(int(base) ** exponent for exponent in range(int(low_exponent), int(high_exponent) + 1))
+        elif "^" in part:
+            base, exponent = part.split("^")
+            values.append(int(base) ** int(exponent))
+        elif "-" in part:
+            low, high = part.split("-")
+            values.extend(range(int(low), int(high) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+
+def _count_nodes(ai):
+    """
+    Returns:
+        nodes (int): Liczba pozycji odwiedzonych przez AI w ostatnim ruchu (licznik AlphaBetaSearch
+            albo liczba wywołań make_move w CountingDivideByHalf dla Negamax z easyAI).
+    """
+    stats = getattr(ai, "stats", None)
+    return stats["nodes"] if stats is not None else CountingDivideByHalf.nodes
+
+
+def benchmark_game(engine, depth, start_points, graph=None):
+    """
+    Description:
+        Rozgrywa jedną grę AI kontra AI (ten sam silnik po obu stronach) i mierzy każdy ruch: czas, liczbę
+        odwiedzonych pozycji oraz zgodność z idealnym solverem (GameGraph). Ruch jest zgodny, jeżeli w pozycji
+        wygranej prowadzi do pozycji przegranej dla przeciwnika; w pozycji przegranej każdy ruch jest zgodny.
+
+    Parameters:
+        engine (str): Nazwa silnika z ENGINES.
+        depth (int): Głębokość przeszukiwania.
+        start_points (int): Liczba początkowa.
+        graph (GameGraph): Rozwiązany graf dla start_points. Default: None (kompilowany tutaj).
+
+    Returns:
+        result (dict): Wiersz wyników z kluczami z FIELDS (bez peak_memory_kb).
+    """
+    graph = graph if graph is not None else GameGraph.compile(start_points)
+    name, *args = ENGINES[engine](depth)
+    ai = AI_BUILDERS[name](*args)
+    game = CountingDivideByHalf([AI_Player(ai), AI_Player(ai)], start_points=start_points)
+
+    nodes, seconds, max_seconds, agreed, moves = 0, 0.0, 0.0, 0, 0
+    while game.points > 1:
+        points = game.points
+        CountingDivideByHalf.nodes = 0
+        start = time.perf_counter()
+        move = game.get_move()
+        elapsed = time.perf_counter() - start
+        nodes += _count_nodes(ai)
+        seconds += elapsed
+        max_seconds = max(max_seconds, elapsed)
+
+        child = points // int(move)
+        node = graph.index[points]
+        agreed += not graph.win[node] or (child >= 1 and not graph.win[graph.index[child]])
+        moves += 1
+        game.play_move(move)
+
+    return {
+        "engine": engine,
+        "depth": depth,
+        "start_points": start_points,
+        "status": "ok",
+        "moves": moves,
+        "nodes": nodes,
+        "seconds": seconds,
+        "nodes_per_sec": nodes / seconds if seconds else 0.0,
+        "ms_per_move": 1000 * seconds / moves if moves else 0.0,
+        "max_ms_per_move": 1000 * max_seconds,
+        "agreement": agreed / moves if moves else 1.0,
+    }
+
+
+def peak_memory(engine, depth, start_points):
+    """
+    Description:
+        Mierzy szczytowe zużycie pamięci (tracemalloc) przy wyborze pierwszego ruchu. Pomiar jest osobnym
+        przebiegiem, bo tracemalloc kilkukrotnie spowalnia Pythona i zafałszowałby czasy z benchmark_game.
+
+    Parameters:
+        engine (str): Nazwa silnika z ENGINES.
+        depth (int): Głębokość przeszukiwania.
+        start_points (int): Liczba początkowa.
+
+    Returns:
+        peak (float): Szczytowa ilość zaalokowanej pamięci w KB.
+    """
+    name, *args = ENGINES[engine](depth)
+    tracemalloc.start()
+    try:
+        ai = AI_BUILDERS[name](*args)
+        game = CountingDivideByHalf([AI_Player(ai), AI_Player(ai)], start_points=start_points)
+        game.get_move()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run_benchmark(engines, depths, start_values, time_cap=10.0, memory=True, log=None):
+    """
+    Description:
+        Przechodzi po wszystkich kombinacjach silnik x liczba początkowa x głębokość (rosnąco).
+        Czas przeszukiwania rośnie wykładniczo z głębokością, a Negamax z easyAI nie da się przerwać w trakcie,
+        dlatego przed każdą głębokością szacujemy jej czas jako czas poprzedniej głębokości razy zmierzony
+        współczynnik wzrostu. Jeżeli szacunek albo zmierzony czas przekracza time_cap, pozostałe głębokości
+        dla tej pary silnik/liczba są pomijane (status "skipped").
+
+    Parameters:
+        engines (list): Nazwy silników z ENGINES.
+        depths (list): Głębokości przeszukiwania.
+        start_values (list): Liczby początkowe.
+        time_cap (float): Limit czasu jednej gry w sekundach. Default: 10.0.
+        memory (bool): Czy mierzyć szczytowe zużycie pamięci. Default: True.
+        log (callable): Funkcja wywoływana z każdym wierszem wyników (np. print). Default: None.
+
+    Returns:
+        results (list): Lista wierszy wyników (słowniki z kluczami z FIELDS).
+    """
+    results = []
+    for start_points in start_values:
+        graph = GameGraph.compile(start_points)
+        for engine in engines:
+            previous, growth, over_cap = None, 3.0, False
+            for depth in sorted(depths):
+                if over_cap or (previous is not None and previous * growth > time_cap):
+                    over_cap = True
+                    row = {field: None for field in FIELDS}
+                    row.update(engine=engine, depth=depth, start_points=start_points, status="skipped")
+                else:
+                    row = benchmark_game(engine, depth, start_points, graph)
+                    row["peak_memory_kb"] = peak_memory(engine, depth, start_points) if memory else None
+                    if previous:
+                        growth = max(1.0, row["seconds"] / previous)
+                    previous = max(row["seconds"], 1e-6)
+                    over_cap = row["seconds"] > time_cap
+                results.append(row)
+                if log is not None:
+                    log(row)
+    return results
+
+
+def write_json(results, path):
+    """
+    Description:
+        Zapisuje wyniki razem z informacjami o środowisku (wersja Pythona, platforma), aby porównywać
+        pomiary z tej samej maszyny.
+
+    Parameters:
+        results (list): Wiersze wyników.
+        path (str): Ścieżka do pliku .json.
+    """
+    meta = {"python": sys.version.split()[0], "platform": platform.platform(), "created": time.strftime("%Y-%m-%d %H:%M:%S")}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"meta": meta, "results": results}, file, indent=2)
+
+
+def write_csv(results, path):
+    """
+    Parameters:
+        results (list): Wiersze wyników.
+        path (str): Ścieżka do pliku .csv.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def find_regressions(results, baseline_path, slowdown=1.5):
+    """
+    Description:
+        Porównuje wyniki z wcześniejszym plikiem JSON z write_json. Regresją jest spadek zgodności z solverem
+        albo wzrost liczby odwiedzonych pozycji lub czasu na ruch ponad slowdown razy.
+
+    Parameters:
+        results (list): Aktualne wiersze wyników.
+        baseline_path (str): Plik JSON z wynikami odniesienia.
+        slowdown (float): Dopuszczalny współczynnik spowolnienia. Default: 1.5.
+
+    Returns:
+        regressions (list): Opisy regresji (puste, gdy wszystko w porządku).
+    """
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {(row["engine"], row["depth"], row["start_points"]): row
+                    for row in json.load(file)["results"] if row["status"] == "ok"}
+
+    regressions = []
+    for row in results:
+        old = baseline.get((row["engine"], row["depth"], row["start_points"]))
+        if row["status"] != "ok" or old is None:
+            continue
+        key = "%s depth=%d start=%d" % (row["engine"], row["depth"], row["start_points"])
+        if row["agreement"] < old["agreement"]:
+            regressions.append("%s: zgodność %.3f -> %.3f" % (key, old["agreement"], row["agreement"]))
+        if row["nodes"] > old["nodes"] * slowdown:
+            regressions.append("%s: pozycje %d -> %d" % (key, old["nodes"], row["nodes"]))
+        if row["ms_per_move"] > old["ms_per_move"] * slowdown:
+            regressions.append("%s: ms/ruch %.2f -> %.2f" % (key, old["ms_per_move"], row["ms_per_move"]))
+    return regressions
+
+
+def _print_row(row):
+    if row["status"] == "skipped":
+        print("%-10s depth=%-2d start=%-10d pominięto (limit czasu)" % (row["engine"], row["depth"], row["start_points"]))
+    else:
+        print("%-10s depth=%-2d start=%-10d %9.0f poz/s %9.3f ms/ruch %8.1f KB zgodność %.2f" % (
+            row["engine"], row["depth"], row["start_points"], row["nodes_per_sec"], row["ms_per_move"],
+            row["peak_memory_kb"] or 0, row["agreement"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark silników AI dla gry "Podział na pół"')
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=sorted(ENGINES), help='Silniki do porównania (domyślnie wszystkie)')
+    parser.add_argument('--depths', type=parse_values, default=parse_values('1-25'), help='Głębokości, np. "1-25" albo "5,10,15" (domyślnie 1-25)')
+    parser.add_argument('--starts', type=parse_values, default=parse_values('10^1-10^9'), help='Liczby początkowe, np. "10^1-10^9" albo "1000,5000" (domyślnie 10^1-10^9)')
+    parser.add_argument('--time-cap', type=float, default=10.0, help='Limit czasu jednej gry w sekundach (domyślnie 10)')
+    parser.add_argument('--no-memory', action='store_true', help='Nie mierz szczytowego zużycia pamięci')
+    parser.add_argument('--json', type=str, help='Plik wynikowy JSON')
+    parser.add_argument('--csv', type=str, help='Plik wynikowy CSV')
+    parser.add_argument('--baseline', type=str, help='Plik JSON z wcześniejszymi wynikami do wykrywania regresji')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.engines, args.depths, args.starts, args.time_cap, not args.no_memory, _print_row)
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.baseline:
+        regressions = find_regressions(results, args.baseline)
+        for regression in regressions:
+            print("Regresja: %s" % regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
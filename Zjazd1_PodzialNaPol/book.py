@@ -0,0 +1,149 @@
+import numpy as np
+
+from graph import GameGraph
+
+"""
+    DEFAULT_START_VALUES
+        Description:
+            Najczęściej używane liczby początkowe, dla których budujemy książkę otwarć.
+"""
+DEFAULT_START_VALUES = (1000, 10 ** 4, 10 ** 6)
+
+
+class OpeningBook:
+    """
+    Książka otwarć: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Wymagane biblioteki:
+    1. numpy
+
+    Opis:
+    Dla typowych liczb początkowych pierwsze ruchy gry są zawsze takie same, a mimo to AI przeszukuje je od nowa
+    w każdej grze. Książka zawiera najlepszy ruch dla każdej liczby osiągalnej w pierwszych plies ruchach
+    z dowolnej z podanych liczb początkowych (przy dowolnych ruchach przeciwnika). Ruchy pochodzą z rozwiązanego
+    grafu gry (GameGraph), więc są idealne: najszybsza wygrana albo najdłuższa obrona.
+
+    Gra jest bezstronna (obaj gracze mają te same ruchy), dlatego kluczem jest sama liczba punktów.
+    Książkę można zapisać do pliku .npy (posortowane liczby i ruchy) i wczytać przy starcie serwera.
+
+    Example:
+        book = OpeningBook.build((1000, 10 ** 4, 10 ** 6), plies=8)
+        ai = BookPlayer(book, AlphaBetaSearch(15))
+    """
+
+    def __init__(self, moves=None):
+        """
+        Parameters:
+            moves (dict): Słownik liczba punktów -> najlepszy dzielnik. Default: None (pusta książka).
+        """
+        self.moves = dict(moves or {})
+
+    @classmethod
+    def build(cls, start_values=DEFAULT_START_VALUES, plies=8):
+        """
+        Description:
+            Dla każdej liczby początkowej kompiluje i rozwiązuje graf gry, a następnie przechodzi go wszerz
+            do głębokości plies, zapisując najlepszy ruch każdej odwiedzonej pozycji.
+
+        Parameters:
+            start_values (iterable): Liczby początkowe. Default: DEFAULT_START_VALUES.
+            plies (int): Liczba pierwszych ruchów gry objętych książką. Default: 8.
+
+        Returns:
+            OpeningBook: Zbudowana książka.
+        """
+        book = cls()
+        for start_points in start_values:
+            graph = GameGraph.compile(start_points)
+            frontier = {graph.root}
+            for _ in range(plies):
+                next_frontier = set()
+                for node in frontier:
+                    if graph.best_move[node]:
+                        book.moves[int(graph.values[node])] = int(graph.best_move[node])
+                        next_frontier.update(graph.children(node)[0].tolist())
+                frontier = next_frontier
+        return book
+
+    def get(self, points):
+        """
+        Parameters:
+            points (int): Liczba punktów.
+
+        Returns:
+            move (int | None): Najlepszy dzielnik albo None, gdy pozycji nie ma w książce.
+        """
+        return self.moves.get(points)
+
+    def __contains__(self, points):
+        return points in self.moves
+
+    def __len__(self):
+        return len(self.moves)
+
+    def save(self, path):
+        """
+        Description:
+            Zapisuje książkę jako tablicę .npy o kształcie (2, liczba pozycji): posortowane liczby punktów i ruchy.
+
+        Parameters:
+            path (str): Ścieżka do pliku .npy.
+        """
+        points = np.array(sorted(self.moves), dtype=np.int64)
+        moves = np.array([self.moves[value] for value in points.tolist()], dtype=np.int64)
+        np.save(path, np.stack((points, moves)))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Parameters:
+            path (str): Ścieżka do pliku zapisanego przez save().
+
+        Returns:
+            OpeningBook: Wczytana książka.
+        """
+        points, moves = np.load(path)
+        return cls(zip(points.tolist(), moves.tolist()))
+
+
+class BookPlayer:
+    """
+    Description:
+        AI, które najpierw sprawdza książkę otwarć, a dopiero gdy pozycji w niej nie ma, wywołuje przeszukiwanie
+        (dowolny algorytm zgodny z easyAI.AI_Player, np. Negamax albo AlphaBetaSearch).
+        Licznik book_hits / searches pokazuje, ile ruchów pochodziło z książki.
+
+    Example:
+        ai = BookPlayer(OpeningBook.build([1000]), Negamax(15))
+        game = DivideByHalf([Human_Player(), AI_Player(ai)])
+    """
+
+    def __init__(self, book, fallback):
+        """
+        Parameters:
+            book (OpeningBook): Książka otwarć.
+            fallback (callable): Algorytm AI używany poza książką.
+        """
+        self.book = book
+        self.fallback = fallback
+        self.book_hits = 0
+        self.searches = 0
+
+    def __call__(self, game):
+        """
+        Parameters:
+            game (DivideByHalf): Aktualny stan gry.
+
+        Returns:
+            move (str): Dzielnik w tym samym formacie co DivideByHalf.possible_moves().
+        """
+        move = self.book.get(game.points)
+        if move is not None:
+            self.book_hits += 1
+            return str(move)
+        self.searches += 1
+        return str(self.fallback(game))
@@ -1,7 +1,11 @@
+import copy
 import math
 import matplotlib.pyplot as plt
 from easyAI import TwoPlayerGame, Human_Player, AI_Player, Negamax
 from tabulate import tabulate
+from book import BookPlayer, OpeningBook
+from history import GameHistory
+from transposition import LRUTranspositionTable
 
 class DivideByHalf(TwoPlayerGame):
     """
@@ -25,7 +29,7 @@ class DivideByHalf(TwoPlayerGame):
     5. Gra trwa, dopóki jeden z graczy nie zmusi przeciwnika do sytuacji, w której nie można wykonać ruchu
     """
 
-    def __init__(self, players=None):
+    def __init__(self, players=None, start_points=1000):
         """
         Description:
             Inicjalizuje nową grę "Podział na pół".
@@ -33,9 +37,10 @@ class DivideByHalf(TwoPlayerGame):
 
         Parameters:
             players (list): Lista graczy. Default: None.
+            start_points (int): Początkowa liczba punktów. Default: 1000.
         """
         self.players = players
-        self.start_points = 1000
+        self.start_points = start_points
         self.points = self.start_points
         self.current_player = 1
 
@@ -45,14 +50,14 @@ class DivideByHalf(TwoPlayerGame):
             Wyświetla wprowadzenie do gry i jej zasady.
         """
         print('\n\t\t\tZapraszamy do gry "PODZIAŁ NA PÓŁ", w której zmierzysz się z AI jako swoim przeciwnikiem\n'
-              f'{'*' * 130}\n'
+              f'{"*" * 130}\n'
               'Zasady:\n'
               f'1. Gra zaczyna się od ustalonej liczby (np. {self.start_points})\n'
               '2. Gracze na zmianę dzielą aktualną liczbę przez 2, 3 lub 4 (Wynik dzielenia jest zawsze zaokrąglany w dół)\n'
               '3. Gracz, który nie może wykonać poprawnego podziału, gdy liczba wynosi 1, przegrywa grę\n'
               '4. Jeśli gracz wybierze dzielnik, który spowodowałby wynik równy 0, przegrywa\n'
               '5. Gra trwa, dopóki jeden z graczy nie zmusi przeciwnika do sytuacji, w której nie można wykonać ruchu\n'
-              f'{'*' * 130}\n')
+              f'{"*" * 130}\n')
 
     def possible_moves(self):
         """
@@ -98,6 +103,29 @@ class DivideByHalf(TwoPlayerGame):
         """
         return self.win()
 
+    def copy(self):
+        """
+        Description:
+            Tworzy kopię stanu gry dla algorytmów przeszukiwania. Stan to tylko self.points i self.current_player,
+            więc wystarczy płytka kopia - domyślny deepcopy z easyAI kopiowałby przy każdym węźle także graczy
+            razem z ich AI i tablicą transpozycji.
+
+        Returns:
+            game (DivideByHalf): Kopia gry współdzieląca listę graczy.
+        """
+        return copy.copy(self)
+
+    def ttentry(self):
+        """
+        Description:
+            Klucz pozycji dla tablicy transpozycji. Stan gry to tylko liczba punktów i gracz wykonujący ruch,
+            więc ta sama liczba osiągnięta różnymi kolejnościami dzielenia ma ten sam klucz.
+
+        Returns:
+            (self.points, self.current_player) (tuple): Klucz pozycji.
+        """
+        return self.points, self.current_player
+
     def show(self):
         """
         Description:
@@ -205,7 +233,10 @@ class DivideByHalf(TwoPlayerGame):
                         move = self.get_move()
                         print("AI wybiera: %s \n" % move)
                 * Każdy wykonany ruch jest zapisywany do historii ruchów, przy okazji aktualizowany.
-                    history = []
+                    history = GameHistory(self.points, self.current_player)
+                        Description:
+                            Zwięzła historia z pliku history.py - zapisuje tylko dzielniki (1 bajt na ruch),
+                            a zachowuje się jak lista krotek (len, indeksowanie, iteracja, print).
                     ...
                     history.append((self.current_player, int(move), int(self.points), self.play_move(move)))
                         Description:
@@ -238,10 +269,10 @@ class DivideByHalf(TwoPlayerGame):
                 * Wyświetla w formie wykresu historię przebiegu gry
                     self.plot_game_history(history)
         Returns:
-            history (list): Historia wykonanych ruchów przez całą grę
+            history (GameHistory): Historia wykonanych ruchów przez całą grę
         """
         self.show_welcome_message()
-        history = []
+        history = GameHistory(self.points, self.current_player)
         while not self.is_over():
             self.show()
             if self.current_player == 1:
@@ -270,38 +301,82 @@ class DivideByHalf(TwoPlayerGame):
         self.show_history_table(history)
         self.plot_game_history(history)
         return history
-"""
-    ai = Negamax(depth)
-        Description:
-            Inicjalizuje AI z użyciem algorytmu Negamax. Jest to strategia oparta na algorytmie minimax. 
-        Parameters:
-            depth (int) - oznacza głebokość przesukiwania czyli maksymalną ilość ruchów, z którą myśli do przodu. Im więcej tym cięższy jest do pokonania, co za czym idzie więcej obliczeń potrzebuje.
-        Example:
-            ai = Negamax(15)
-"""
-ai = Negamax(15)
-"""
-    game = DivideByHalf(TwoPlayerGame)
-        Description:
-            Tworzona jest instancja DivideByHalf z wyborem graczy.
-        Parameters:
-            TwoPlayerGame (list): lista dwóch graczy, którzy biorą udział w grze.
-        Example:
-            game = DivideByHalf([Human_Player(), AI_Player(ai)])
-                Parameters:
-                    Human_Player() - Gracz jest człowiekiem
-                    AI_Player(ai) - Gracz jest AI
-"""
-game = DivideByHalf([Human_Player(), AI_Player(ai)])
-"""
+
+
+if __name__ == "__main__":
+    """
+        ai = Negamax(depth, tt=tt)
+            Description:
+                Inicjalizuje AI z użyciem algorytmu Negamax. Jest to strategia oparta na algorytmie minimax. 
+            Parameters:
+                depth (int) - oznacza głebokość przesukiwania czyli maksymalną ilość ruchów, z którą myśli do przodu. Im więcej tym cięższy jest do pokonania, co za czym idzie więcej obliczeń potrzebuje.
+                tt (LRUTranspositionTable) - tablica transpozycji (plik transposition.py), dzięki której ta sama liczba punktów
+                    osiągnięta różnymi kolejnościami dzielenia nie jest przeszukiwana ponownie.
+            Example:
+                ai = Negamax(15, tt=LRUTranspositionTable(100000))
+
+        ai = RetrogradeSolver(start_points)
+            Description:
+                Tryb solvera (plik solver.py). Zamiast przeszukiwać drzewo gry przy każdym ruchu, raz wylicza
+                status wygrana/przegrana dla wszystkich liczb od 1 do start_points i wybiera ruch z tablicy w O(1).
+            Example:
+                ai = RetrogradeSolver(1000)
+
+        ai = IterativeDeepening(budget_ms)
+            Description:
+                Pogłębianie iteracyjne z budżetem czasu (plik search.py). Przeszukuje coraz większe głębokości,
+                dopóki nie minie budget_ms milisekund, i zwraca najlepszy ruch z ostatniej ukończonej głębokości.
+            Example:
+                ai = IterativeDeepening(budget_ms=50)
+
+        ai = AlphaBetaSearch(depth)
+            Description:
+                Własny Negamax z cięciami alfa-beta, tablicą transpozycji oraz kolejnością ruchów "killer"/historia
+                (plik search.py). Liczniki odwiedzonych pozycji, cięć i czasu dla głębokości są w ai.stats.
+            Example:
+                ai = AlphaBetaSearch(15)
+
+        ai = ParallelRootSearch(depth, processes)
+            Description:
+                Głębokie przeszukiwanie na wszystkich rdzeniach (plik search.py). Ruchy w korzeniu i odpowiedzi
+                przeciwnika są rozdzielane między procesy ze wspólnym ograniczeniem alfa-beta.
+                Po grze należy zamknąć pulę procesów: ai.close().
+            Example:
+                ai = ParallelRootSearch(25, processes=4)
+
+        ai = BookPlayer(book, fallback)
+            Description:
+                Książka otwarć (plik book.py). OpeningBook.build(start_values, plies) zapisuje idealne ruchy dla
+                pierwszych plies ruchów z podanych liczb początkowych, a BookPlayer odpowiada z książki bez
+                przeszukiwania i dopiero poza nią wywołuje fallback (np. Negamax).
+            Example:
+                ai = BookPlayer(OpeningBook.build([1000], plies=8), Negamax(15))
+    """
+    tt = LRUTranspositionTable(100000)
+    ai = BookPlayer(OpeningBook.build([1000], plies=8), Negamax(15, tt=tt))
+    """
+        game = DivideByHalf(TwoPlayerGame)
+            Description:
+                Tworzona jest instancja DivideByHalf z wyborem graczy.
+            Parameters:
+                TwoPlayerGame (list): lista dwóch graczy, którzy biorą udział w grze.
+            Example:
+                game = DivideByHalf([Human_Player(), AI_Player(ai)])
+                    Parameters:
+                        Human_Player() - Gracz jest człowiekiem
+                        AI_Player(ai) - Gracz jest AI
+    """
+    game = DivideByHalf([Human_Player(), AI_Player(ai)])
+    """
+        history = game.play()
+            Description:
+                Zaczynamy grę poprzez wywołanie funkcji game.play().
+                Opcjonalnie możemy do niej przypisać zmienną, na przykład "history". Zwraca do niej całą naszą historię gry.
+            Example:
+                print(history) #output [(1, 2, 1000, 500), (2, 4, 500, 125), (1, 3, 125, 41), (2, 3, 41, 13), (1, 4, 13, 3), (2, 2, 3, 1)]
+                Format:
+                    Gracz | Ruch/Dzielnik | Wynik przed dzieleniem | Wynik po dzieleniu
+    """
     history = game.play()
-        Description:
-            Zaczynamy grę poprzez wywołanie funkcji game.play().
-            Opcjonalnie możemy do niej przypisać zmienną, na przykład "history". Zwraca do niej całą naszą historię gry.
-        Example:
-            print(history) #output [(1, 2, 1000, 500), (2, 4, 500, 125), (1, 3, 125, 41), (2, 3, 41, 13), (1, 4, 13, 3), (2, 2, 3, 1)]
-            Format:
-                Gracz | Ruch/Dzielnik | Wynik przed dzieleniem | Wynik po dzieleniu
-"""
-history = game.play()
-print(history)
+    print(history)
+    print("Tablica transpozycji: %s" % tt.stats())
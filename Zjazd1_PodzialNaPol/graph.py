@@ -0,0 +1,242 @@
+import numpy as np
+
+from variants import normalize_divisors
+
+
+class GameGraph:
+    """
+    Graf gry: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Wymagane biblioteki:
+    1. numpy
+
+    Opis:
+    Z liczby start_points dzieleniem przez 2, 3 i 4 da się osiągnąć tylko liczby postaci start_points // (2^a * 3^b),
+    czyli O(log^2 n) różnych wartości (dla 10^18 ok. tysiąca). Graf zawiera dokładnie te liczby:
+        values (numpy.ndarray) - liczba punktów w każdym węźle, rosnąco, więc id dziecka < id rodzica,
+        indptr, indices, moves - krawędzie w formacie CSR: krawędzie węzła i to indices[indptr[i]:indptr[i + 1]],
+            a moves zawiera dzielnik odpowiadający każdej krawędzi (uint8, a dla dzielników > 255 szerszy typ),
+        root - id węzła start_points.
+
+    Po solve() dla każdego węzła znamy wynik (win), najlepszy ruch (best_move) i długość gry przy idealnej grze obu
+    stron (length). Zwycięzca wybiera najszybszą wygraną, przegrywający najdłuższą obronę.
+    Rozwiązywanie, AI, historia gry dla plot_game_history i analizy korzystają z tego samego grafu.
+
+    Example:
+        graph = GameGraph.compile(10 ** 18)
+        print(graph.win[graph.root], graph.best_move[graph.root])
+    """
+
+    def __init__(self, values, indptr, indices, moves, start_points, divisors=(2, 3, 4), terminal_points=1,
+                 terminal_loses=True):
+        """
+        Description:
+            Tworzy graf z gotowych tablic. Zwykle używamy GameGraph.compile().
+
+        Parameters:
+            values (numpy.ndarray): Liczby punktów węzłów (rosnąco).
+            indptr (numpy.ndarray): Początki list krawędzi (CSR).
+            indices (numpy.ndarray): Id dzieci (CSR).
+            moves (numpy.ndarray): Dzielnik dla każdej krawędzi.
+            start_points (int): Liczba początkowa.
+            divisors (tuple): Dozwolone dzielniki. Default: (2, 3, 4).
+            terminal_points (int): Jak w DivideGame. Default: 1.
+            terminal_loses (bool): Jak w DivideGame. Default: True.
+        """
+        self.values = values
+        self.indptr = indptr
+        self.indices = indices
+        self.moves = moves
+        self.start_points = start_points
+        self.divisors = normalize_divisors(divisors)
+        self.terminal_points = terminal_points
+        self.terminal_loses = terminal_loses
+        self.index = {int(value): node for node, value in enumerate(values.tolist())}
+        self.root = self.index[start_points]
+        self.win = None
+        self.best_move = None
+        self.length = None
+
+    @classmethod
+    def compile(cls, start_points, divisors=(2, 3, 4), terminal_points=1, terminal_loses=True):
+        """
+        Description:
+            Wylicza wszystkie liczby osiągalne ze start_points i buduje z nich graf, a następnie go rozwiązuje.
+
+        Parameters:
+            start_points (int): Liczba początkowa.
+            divisors (tuple): Dozwolone dzielniki. Default: (2, 3, 4).
+            terminal_points (int): Jak w DivideGame. Default: 1.
+            terminal_loses (bool): Jak w DivideGame. Default: True.
+
+        Returns:
+            GameGraph: Rozwiązany graf gry.
+        """
+        divisors = normalize_divisors(divisors)
+        reachable = {start_points}
+        frontier = [start_points]
+        while frontier:
+            next_frontier = []
+            for points in frontier:
+                if points <= terminal_points:
+                    continue
+                for divisor in divisors:
+                    child = points // divisor
+                    if child < 1:
+                        break
+                    if child not in reachable:
+                        reachable.add(child)
+                        next_frontier.append(child)
+            frontier = next_frontier
+
+        ordered = sorted(reachable)
+        dtype = np.int64 if ordered[-1] <= np.iinfo(np.int64).max else object
+        values = np.array(ordered, dtype=dtype)
+        index = {points: node for node, points in enumerate(ordered)}
+
+        indptr = np.zeros(len(ordered) + 1, dtype=np.int64)
+        indices = []
+        moves = []
+        for node, points in enumerate(ordered):
+            if points > terminal_points:
+                for divisor in divisors:
+                    child = points // divisor
+                    if child < 1:
+                        break
+                    indices.append(index[child])
+                    moves.append(divisor)
+            indptr[node + 1] = len(indices)
+
+        move_dtype = np.min_scalar_type(divisors[-1])
+        graph = cls(values, indptr, np.array(indices, dtype=np.int32), np.array(moves, dtype=move_dtype),
+                    start_points, divisors, terminal_points, terminal_loses)
+        graph.solve()
+        return graph
+
+    def __len__(self):
+        return len(self.values)
+
+    def children(self, node):
+        """
+        Parameters:
+            node (int): Id węzła.
+
+        Returns:
+            indices (numpy.ndarray): Id dzieci węzła.
+            moves (numpy.ndarray): Dzielniki prowadzące do kolejnych dzieci.
+        """
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.moves[start:end]
+
+    def solve(self):
+        """
+        Description:
+            Rozwiązuje graf od najmniejszych liczb do największych (to jest porządek topologiczny,
+            bo każdy ruch zmniejsza liczbę punktów).
+
+        Returns:
+            win (numpy.ndarray): Czy gracz wykonujący ruch w węźle wygrywa.
+        """
+        count = len(self.values)
+        win = np.zeros(count, dtype=bool)
+        best_move = np.zeros(count, dtype=self.moves.dtype)
+        length = np.zeros(count, dtype=np.int32)
+        indptr, indices, moves = self.indptr.tolist(), self.indices.tolist(), self.moves.tolist()
+
+        for node in range(count):
+            start, end = indptr[node], indptr[node + 1]
+            if start == end:
+                win[node] = not self.terminal_loses
+                continue
+            best_win, best_length, best = None, None, None
+            for edge in range(start, end):
+                child = indices[edge]
+                if not win[child] and (best_win is not True or length[child] < best_length):
+                    best_win, best_length, best = True, length[child], moves[edge]
+                elif best_win is not True and (best_length is None or length[child] > best_length):
+                    best_win, best_length, best = False, length[child], moves[edge]
+            win[node] = best_win
+            best_move[node] = best
+            length[node] = best_length + 1
+
+        self.win, self.best_move, self.length = win, best_move, length
+        return win
+
+    def principal_variation(self, node=None):
+        """
+        Description:
+            Rozgrywa grę na grafie - obie strony grają idealnie od węzła node.
+
+        Parameters:
+            node (int): Węzeł początkowy. Default: None (korzeń).
+
+        Returns:
+            path (list): Id kolejnych węzłów, od node do pozycji końcowej.
+        """
+        node = self.root if node is None else node
+        path = [node]
+        while self.best_move[node]:
+            node = self.index[int(self.values[node]) // int(self.best_move[node])]
+            path.append(node)
+        return path
+
+    def history(self, path, first_player=1):
+        """
+        Description:
+            Zamienia ścieżkę w grafie na historię w formacie DivideByHalf.play(), dzięki czemu można ją przekazać
+            do show_history_table i plot_game_history.
+
+        Parameters:
+            path (list): Id kolejnych węzłów.
+            first_player (int): Gracz wykonujący pierwszy ruch. Default: 1.
+
+        Returns:
+            history (list): [(gracz, dzielnik, wynik przed, wynik po)].
+        """
+        history = []
+        player = first_player
+        for before, after in zip(path, path[1:]):
+            children, moves = self.children(before)
+            move = int(moves[list(children).index(after)])
+            history.append((player, move, int(self.values[before]), int(self.values[after])))
+            player = 3 - player
+        return history
+
+    def summary(self):
+        """
+        Description:
+            Prosta analiza grafu: liczba węzłów, krawędzi, pozycji wygranych i przegranych oraz długość gry
+            przy idealnej grze od korzenia.
+
+        Returns:
+            stats (dict): nodes, edges, winning, losing, root_win, root_length.
+        """
+        return {
+            "nodes": len(self.values),
+            "edges": len(self.indices),
+            "winning": int(self.win.sum()),
+            "losing": int((~self.win).sum()),
+            "root_win": bool(self.win[self.root]),
+            "root_length": int(self.length[self.root]),
+        }
+
+    def __call__(self, game):
+        """
+        Description:
+            Pozwala użyć grafu jako AI. Jeżeli aktualnej liczby punktów nie ma w grafie (gra zaczęła się od innej
+            liczby), graf jest kompilowany od nowa od tej liczby.
+
+        Parameters:
+            game (DivideByHalf): Aktualny stan gry.
+
+        Returns:
+            move (str): Dzielnik w tym samym formacie co DivideByHalf.possible_moves().
+        """
+        if game.points not in self.index:
+            graph = GameGraph.compile(game.points, self.divisors, self.terminal_points, self.terminal_loses)
+            self.__dict__.update(graph.__dict__)
+        return str(self.best_move[self.index[game.points]])
@@ -0,0 +1,341 @@
+import os
+from array import array
+
+import numpy as np
+
+COLUMNS = ("start_points", "first_player", "offsets", "moves")
+REPLAY_CHUNK = 1 << 16
+MAX_PRODUCT_BITS = 63.5
+
+
+class MoveRecord:
+    """
+    Description:
+        Jeden ruch w historii gry: (gracz, dzielnik, wynik przed, wynik po). Zachowuje się jak krotka z
+        DivideByHalf.play() (indeksowanie, rozpakowanie), ale dzięki __slots__ nie ma słownika atrybutów.
+    """
+    __slots__ = ("player", "move", "before", "after")
+
+    def __init__(self, player, move, before, after):
+        self.player = player
+        self.move = move
+        self.before = before
+        self.after = after
+
+    def __getitem__(self, index):
+        return (self.player, self.move, self.before, self.after)[index]
+
+    def __iter__(self):
+        return iter((self.player, self.move, self.before, self.after))
+
+    def __len__(self):
+        return 4
+
+    def __eq__(self, other):
+        if not isinstance(other, (MoveRecord, tuple)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+def _divide_by_products(start_points, moves):
+    """
+    Description:
+        Dzieli start_points (uint64) przez iloczyny kolejnych dzielników wzdłuż ostatniej osi moves.
+        Iloczyn w uint64 może się przepełnić (np. dla długiej listy ruchów spoza gry), dlatego tam, gdzie
+        suma log2 dzielników przekracza MAX_PRODUCT_BITS, iloczyn na pewno jest większy od każdej liczby
+        początkowej int64 i wynik wynosi 0 bez liczenia iloczynu.
+
+    Parameters:
+        start_points (numpy.ndarray): Liczby początkowe (uint64), rozgłaszane na moves.
+        moves (numpy.ndarray): Dzielniki (>= 1).
+
+    Returns:
+        numpy.ndarray: start_points // iloczyn pierwszych k dzielników dla każdego k (uint64).
+    """
+    divisors = moves.astype(np.uint64)
+    too_large = np.cumsum(np.log2(divisors), axis=-1) > MAX_PRODUCT_BITS
+    divisors[too_large] = 1
+    result = start_points // np.cumprod(divisors, axis=-1)
+    result[too_large] = 0
+    return result
+
+
+def replay(start_points, moves):
+    """
+    Description:
+        Odtwarza wyniki przed i po każdym ruchu bez pętli w Pythonie:
+        floor(floor(n / a) / b) = floor(n / (a * b)), więc wynik po k ruchach to start_points // iloczyn
+        pierwszych k dzielników (np.cumprod).
+
+    Parameters:
+        start_points (int): Liczba początkowa.
+        moves (numpy.ndarray): Dzielniki w kolejności ruchów.
+
+    Returns:
+        before (numpy.ndarray): Wynik przed każdym ruchem.
+        after (numpy.ndarray): Wynik po każdym ruchu.
+    """
+    dtype = np.uint64 if start_points < 2 ** 61 else object
+    if not len(moves):
+        return np.array([], dtype=dtype), np.array([], dtype=dtype)
+    if dtype is object:
+        after = start_points // np.cumprod(np.asarray(moves).astype(object))
+    else:
+        after = _divide_by_products(np.uint64(start_points), np.asarray(moves))
+    before = np.concatenate((np.array([start_points], dtype=dtype), after[:-1]))
+    return before, after
+
+
+class GameHistory:
+    """
+    Historia gry: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Opis:
+    Zwięzła historia jednej gry. Zamiast listy krotek (gracz, dzielnik, wynik przed, wynik po) zapisujemy
+    tylko liczbę początkową, pierwszego gracza i dzielniki jako bajty (array('B')) - 1 bajt na ruch.
+    Gracze zmieniają się co ruch, a wyniki odtwarza funkcja replay().
+
+    Obiekt zachowuje się jak lista z DivideByHalf.play(): len(), indeksowanie i iteracja zwracają MoveRecord,
+    więc show_history_table i plot_game_history działają bez zmian.
+    """
+
+    def __init__(self, start_points, first_player=1, moves=()):
+        """
+        Parameters:
+            start_points (int): Liczba początkowa.
+            first_player (int): Gracz wykonujący pierwszy ruch. Default: 1.
+            moves (iterable): Dzielniki już wykonanych ruchów. Default: ().
+        """
+        self.start_points = start_points
+        self.first_player = first_player
+        self.moves = array("B", moves)
+        self.points = start_points
+        for move in self.moves:
+            self.points //= move
+
+    def append(self, record):
+        """
+        Description:
+            Dodaje ruch w formacie krotki z DivideByHalf.play(). Zapamiętywany jest tylko dzielnik -
+            pozostałe pola są sprawdzane z aktualnym stanem, aby historia nie rozjechała się z grą.
+
+        Parameters:
+            record (tuple): (gracz, dzielnik, wynik przed, wynik po).
+        """
+        player, move, before, after = record
+        move = int(move)
+        if before != self.points or after != before // move or player != self.player(len(self.moves)):
+            raise ValueError("Ruch %s nie pasuje do stanu gry (wynik %d)." % (tuple(record), self.points))
+        self.moves.append(move)
+        self.points = after
+
+    def player(self, index):
+        """
+        Parameters:
+            index (int): Numer ruchu.
+
+        Returns:
+            int: Gracz wykonujący ruch o danym numerze.
+        """
+        return self.first_player if index % 2 == 0 else 3 - self.first_player
+
+    def replay(self):
+        """
+        Returns:
+            before (numpy.ndarray): Wynik przed każdym ruchem.
+            after (numpy.ndarray): Wynik po każdym ruchu.
+        """
+        return replay(self.start_points, np.frombuffer(self.moves, dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        before = self.start_points
+        for move in self.moves[:index]:
+            before //= move
+        move = self.moves[index]
+        return MoveRecord(self.player(index), move, before, before // move)
+
+    def __iter__(self):
+        before = self.start_points
+        for index, move in enumerate(self.moves):
+            yield MoveRecord(self.player(index), move, before, before // move)
+            before //= move
+
+    def __repr__(self):
+        return repr([tuple(record) for record in self])
+
+
+class HistoryStore:
+    """
+    Description:
+        Kolumnowy zapis wielu gier (np. milionów z selfplay.simulate_games):
+            start_points (int64) - liczba początkowa gry
+            first_player (uint8) - gracz wykonujący pierwszy ruch
+            offsets (int64) - początek ruchów danej gry w tablicy moves (długość = liczba gier + 1)
+            moves (uint8) - dzielniki wszystkich gier zapisane jedna za drugą
+        Na ruch przypada 1 bajt, na grę 17 bajtów. Zapis do katalogu z plikami .npy (odczyt przez memmap)
+        albo do Parquet (jeden wiersz na ruch, wymaga pyarrow).
+    """
+    columns = COLUMNS
+
+    def __init__(self, start_points=(), first_player=None, lengths=None, moves=(), offsets=None):
+        """
+        Parameters:
+            start_points (array): Liczby początkowe gier.
+            first_player (array): Pierwszy gracz w każdej grze. Default: None (zawsze gracz 1).
+            lengths (array): Liczba ruchów każdej gry (gdy nie podano offsets).
+            moves (array): Połączone ruchy wszystkich gier.
+            offsets (array): Gotowe offsety (długość = liczba gier + 1). Default: None.
+        """
+        self.start_points = np.asarray(start_points, dtype=np.int64)
+        if first_player is None:
+            first_player = np.ones(len(self.start_points), dtype=np.uint8)
+        self.first_player = np.asarray(first_player, dtype=np.uint8)
+        if offsets is None:
+            offsets = np.zeros(len(self.start_points) + 1, dtype=np.int64)
+            np.cumsum(np.asarray(lengths, dtype=np.int64), out=offsets[1:])
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.moves = np.asarray(moves, dtype=np.uint8)
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    @classmethod
+    def from_histories(cls, histories):
+        """
+        Description:
+            Składa magazyn z listy historii (GameHistory albo listy krotek z DivideByHalf.play()).
+
+        Parameters:
+            histories (list): Historie gier.
+
+        Returns:
+            HistoryStore: Magazyn ze wszystkimi grami.
+        """
+        start_points, first_player, lengths, moves = [], [], [], array("B")
+        for history in histories:
+            if not isinstance(history, GameHistory):
+                if not len(history):
+                    raise ValueError("Pusta lista ruchów nie zawiera liczby początkowej - użyj GameHistory.")
+                history = GameHistory(history[0][2], history[0][0], [record[1] for record in history])
+            start_points.append(history.start_points)
+            first_player.append(history.first_player)
+            lengths.append(len(history))
+            moves.extend(history.moves)
+        return cls(start_points, first_player, lengths, np.frombuffer(moves, dtype=np.uint8))
+
+    def game(self, index):
+        """
+        Parameters:
+            index (int): Numer gry.
+
+        Returns:
+            GameHistory: Historia jednej gry.
+        """
+        moves = self.moves[self.offsets[index]:self.offsets[index + 1]]
+        return GameHistory(int(self.start_points[index]), int(self.first_player[index]), moves.tobytes())
+
+    def game_moves(self, index):
+        """
+        Parameters:
+            index (int): Numer gry.
+
+        Returns:
+            moves (numpy.ndarray): Dzielniki wybrane w tej grze (widok, bez kopiowania).
+        """
+        return self.moves[self.offsets[index]:self.offsets[index + 1]]
+
+    def __len__(self):
+        return len(self.start_points)
+
+    def replay_all(self):
+        """
+        Description:
+            Odtwarza wszystkie gry naraz. Ruchy każdej grupy gier układamy w macierz (gry x najdłuższa gra)
+            uzupełnioną jedynkami, liczymy np.cumprod wzdłuż wierszy i dzielimy liczby początkowe przez iloczyny.
+
+        Returns:
+            columns (dict): Tablice o długości równej liczbie ruchów: game, ply, player, move, before, after.
+        """
+        lengths = self.lengths
+        game = np.repeat(np.arange(len(self), dtype=np.int64), lengths)
+        ply = np.arange(len(self.moves), dtype=np.int64) - np.repeat(self.offsets[:-1], lengths)
+        first = np.repeat(self.first_player, lengths)
+        player = np.where(ply % 2 == 0, first, 3 - first).astype(np.uint8)
+        after = np.empty(len(self.moves), dtype=np.int64)
+
+        for start in range(0, len(self), REPLAY_CHUNK):
+            end = min(start + REPLAY_CHUNK, len(self))
+            chunk_lengths = lengths[start:end]
+            if not chunk_lengths.size or not chunk_lengths.max():
+                continue
+            mask = np.arange(chunk_lengths.max()) < chunk_lengths[:, None]
+            divisors = np.ones(mask.shape, dtype=np.uint64)
+            divisors[mask] = self.moves[self.offsets[start]:self.offsets[end]]
+            values = _divide_by_products(self.start_points[start:end, None].astype(np.uint64), divisors)
+            after[self.offsets[start]:self.offsets[end]] = values[mask]
+
+        before = np.where(ply == 0, np.repeat(self.start_points, lengths), np.roll(after, 1))
+        return {"game": game, "ply": ply, "player": player, "move": self.moves, "before": before, "after": after}
+
+    def save(self, directory):
+        """
+        Description:
+            Zapisuje kolumny jako osobne pliki .npy w katalogu.
+
+        Parameters:
+            directory (str): Katalog docelowy (zostanie utworzony).
+        """
+        os.makedirs(directory, exist_ok=True)
+        for column in self.columns:
+            np.save(os.path.join(directory, column + ".npy"), getattr(self, column))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Description:
+            Wczytuje magazyn zapisany przez save(). Domyślnie kolumny są otwierane przez memmap.
+
+        Parameters:
+            directory (str): Katalog z plikami .npy.
+            mmap (bool): Czy otworzyć pliki przez memmap (tylko do odczytu). Default: True.
+
+        Returns:
+            HistoryStore: Wczytany magazyn.
+        """
+        columns = {column: np.load(os.path.join(directory, column + ".npy"), mmap_mode="r" if mmap else None)
+                   for column in cls.columns}
+        store = cls.__new__(cls)
+        store.__dict__.update(columns)
+        return store
+
+    def to_parquet(self, path):
+        """
+        Description:
+            Zapisuje wszystkie ruchy do pliku Parquet (jeden wiersz na ruch, kolumny jak w replay_all).
+
+        Parameters:
+            path (str): Ścieżka do pliku .parquet.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Zapis do Parquet wymaga biblioteki pyarrow (pip install pyarrow).")
+        pq.write_table(pa.table(self.replay_all()), path)
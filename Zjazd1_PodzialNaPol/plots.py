@@ -0,0 +1,152 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import LogNorm, to_rgba
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from history import HistoryStore
+
+PLAYER_COLORS = {1: "red", 2: "green"}
+RASTERIZE_LIMIT = 20000
+FILL_LIMIT = 100
+
+
+def history_segments(store):
+    """
+    Description:
+        Zamienia wszystkie ruchy z HistoryStore na odcinki wykresu (runda, log10 wyniku przed) ->
+        (runda + 1, log10 wyniku po) jednym wywołaniem replay_all, bez pętli po ruchach.
+        Logarytm liczymy sami, bo oś logarytmiczna matplotlib przekształca każdą ścieżkę osobno w Pythonie,
+        co przy dziesiątkach tysięcy odcinków zajmuje większość czasu rysowania.
+        Wynik 0 (przegrana z zasady 4) nie ma logarytmu, dlatego rysujemy go jako 0.5, czyli poniżej linii wyniku 1.
+
+    Parameters:
+        store (HistoryStore): Historie gier.
+
+    Returns:
+        segments (numpy.ndarray): Tablica (liczba ruchów, 2, 2) z początkiem i końcem każdego odcinka (y = log10).
+        players (numpy.ndarray): Gracz wykonujący każdy ruch.
+    """
+    columns = store.replay_all()
+    ply = columns["ply"].astype(np.float64)
+    before = np.log10(np.maximum(columns["before"].astype(np.float64), 0.5))
+    after = np.log10(np.maximum(columns["after"].astype(np.float64), 0.5))
+    segments = np.empty((len(ply), 2, 2))
+    segments[:, 0, 0] = ply
+    segments[:, 0, 1] = before
+    segments[:, 1, 0] = ply + 1
+    segments[:, 1, 1] = after
+    return segments, columns["player"]
+
+
+def plot_histories(histories, path, density=False, fill=None, alpha=None, bins=80, title="Historia gier",
+                   figsize=(12, 6), dpi=100):
+    """
+    Description:
+        Rysuje wiele historii gier na jednym wykresie i zapisuje go do pliku (PNG, SVG, PDF - według rozszerzenia).
+        W przeciwieństwie do DivideByHalf.plot_game_history nie tworzy osobnego plt.plot i fill_between dla
+        każdego ruchu: wszystkie odcinki trafiają do jednej LineCollection (i jednej PolyCollection dla
+        wypełnienia) na gracza. Gry z bliskich liczb początkowych mają wiele wspólnych odcinków, więc każdy
+        odcinek rysujemy raz, z przezroczystością odpowiadającą nałożeniu wszystkich jego kopii.
+        Rysowanie odbywa się na płótnie Agg bez pyplot, więc nie wymaga okna ani interaktywnego backendu.
+
+        Przy density=True zamiast linii rysowana jest mapa gęstości: ile gier przechodzi przez dany wynik
+        w danej rundzie (histogram 2D z logarytmiczną osią wyniku). Przy tysiącach gier linie zlewają się
+        w jedną plamę, a mapa nadal pokazuje typowy przebieg.
+
+        Przy zapisie wektorowym (SVG, PDF) i ponad RASTERIZE_LIMIT odcinkach kolekcje są rastrowane,
+        aby plik nie zawierał setek tysięcy ścieżek.
+
+    Parameters:
+        histories (HistoryStore | list): Historie gier - HistoryStore albo lista GameHistory / list krotek
+            z DivideByHalf.play().
+        path (str): Plik wynikowy.
+        density (bool): Mapa gęstości zamiast linii. Default: False.
+        fill (bool): Wypełnienie pod liniami jak w plot_game_history (tylko bez density). Każdy wypełniony
+            wielokąt sięga do osi, więc koszt rysowania rośnie z liczbą gier znacznie szybciej niż dla linii.
+            Default: None (wypełnienie tylko do FILL_LIMIT gier).
+        alpha (float): Przezroczystość linii. Default: None (dobierana do liczby gier).
+        bins (int): Liczba przedziałów osi wyniku dla mapy gęstości. Default: 80.
+        title (str): Tytuł wykresu. Default: "Historia gier".
+        figsize (tuple): Rozmiar wykresu w calach. Default: (12, 6).
+        dpi (int): Rozdzielczość dla formatów rastrowych. Default: 100.
+
+    Returns:
+        figure (matplotlib.figure.Figure): Narysowany wykres.
+
+    Example:
+        results = simulate_games([(start, (("alphabeta", 15), ("graph",))) for start in range(10, 10010)])
+        plot_histories(results, "historia.png", density=True)
+    """
+    store = histories if isinstance(histories, HistoryStore) else HistoryStore.from_histories(histories)
+    segments, players = history_segments(store)
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+
+    if density:
+        _draw_density(figure, axes, segments, bins)
+    else:
+        if alpha is None:
+            alpha = min(1.0, max(0.02, 20 / max(len(store), 1)))
+        if fill is None:
+            fill = len(store) <= FILL_LIMIT
+        rasterized = len(segments) > RASTERIZE_LIMIT
+        for player, color in PLAYER_COLORS.items():
+            player_segments, counts = np.unique(segments[players == player], axis=0, return_counts=True)
+            if fill:
+                polygons = np.empty((len(player_segments), 4, 2))
+                polygons[:, 0] = player_segments[:, 0] * [1, 0]
+                polygons[:, 1:3] = player_segments
+                polygons[:, 3] = player_segments[:, 1] * [1, 0]
+                axes.add_collection(PolyCollection(polygons, facecolors=_stacked_colors(color, 0.3 * alpha, counts),
+                                                   edgecolors="none", rasterized=rasterized))
+            axes.add_collection(LineCollection(player_segments, colors=_stacked_colors(color, alpha, counts),
+                                               rasterized=rasterized))
+        axes.autoscale_view()
+        axes.legend(handles=[Line2D([], [], color=color, label="Gracz %d" % player)
+                             for player, color in PLAYER_COLORS.items()], loc="upper right")
+
+    axes.yaxis.set_major_locator(MaxNLocator(integer=True))
+    axes.yaxis.set_major_formatter(FuncFormatter(lambda value, _: "%g" % 10 ** value))
+    axes.axhline(0, color="black", linewidth=0.8, linestyle="--")
+    axes.set_xlabel("Runda")
+    axes.set_ylabel("Wynik")
+    axes.set_title("%s (%d gier)" % (title, len(store)))
+    axes.grid()
+    figure.savefig(path, dpi=dpi)
+    return figure
+
+
+def _stacked_colors(color, alpha, counts):
+    """
+    Description:
+        Kolor odcinka narysowanego raz zamiast counts razy: counts warstw o przezroczystości alpha daje
+        łącznie krycie 1 - (1 - alpha)^counts.
+    """
+    colors = np.tile(to_rgba(color), (len(counts), 1))
+    colors[:, 3] = 1 - (1 - alpha) ** counts
+    return colors
+
+
+def _draw_density(figure, axes, segments, bins):
+    """
+    Description:
+        Mapa gęstości: histogram 2D punktów (runda, log10 wyniku) ze wszystkich gier - początki wszystkich ruchów
+        oraz końcowe wyniki gier.
+    """
+    if not len(segments):
+        return
+    ends = np.ones(len(segments), dtype=bool)
+    ends[:-1] = segments[1:, 0, 0] == 0
+    points = np.concatenate((segments[:, 0], segments[ends, 1]))
+
+    x_edges = np.arange(int(points[:, 0].max()) + 2) - 0.5
+    y_edges = np.linspace(np.log10(0.5), max(points[:, 1].max(), np.log10(2)), bins + 1)
+    counts, _, _ = np.histogram2d(points[:, 0], points[:, 1], bins=(x_edges, y_edges))
+    counts = np.ma.masked_equal(counts.T, 0)
+    mesh = axes.pcolormesh(x_edges, y_edges, counts, norm=LogNorm(), cmap="viridis", shading="flat")
+    figure.colorbar(mesh, ax=axes, label="Liczba gier")
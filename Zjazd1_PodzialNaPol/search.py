@@ -0,0 +1,700 @@
+import math
+import multiprocessing
+import time
+
+from easyAI import AI_Player, Negamax
+
+from game import DivideByHalf
+from solver import DIVISORS
+from transposition import EXACT, LOWERBOUND, UPPERBOUND, LRUTranspositionTable
+
+"""
+    WIN_SCORE
+        Description:
+            Wartość wygranej. Musi być większa od każdej oceny heurystycznej (-points), dlatego jest tak duża.
+            Od wartości odejmujemy liczbę ruchów do końca gry, więc szybsza wygrana ma wyższą ocenę,
+            a dłuższa obrona przed porażką - wyższą niż szybka porażka.
+            Ocena heurystyczna jest ograniczona do HEURISTIC_LIMIT, aby nawet ogromne liczby punktów
+            nie dawały ocen większych niż wygrana.
+"""
+WIN_SCORE = 10 ** 20
+HEURISTIC_LIMIT = WIN_SCORE // 2
+MAX_PLY = 256
+ORDERING_REDUCTION = 4
+
+
+class SearchTimeout(Exception):
+    """
+    Description:
+        Zgłaszany wewnątrz przeszukiwania, gdy skończył się czas na ruch.
+    """
+
+
+def legal_moves(points):
+    """
+    Description:
+        Zwraca dzielniki, które nie dają wyniku 0 (zgodnie z zasadą 4 taki ruch przegrywa, więc go pomijamy).
+        Dla points >= 2 dzielnik 2 jest zawsze dozwolony.
+
+    Parameters:
+        points (int): Aktualna liczba punktów.
+
+    Returns:
+        moves (list): Lista dozwolonych dzielników (int).
+    """
+    return [divisor for divisor in DIVISORS if points // divisor >= 1]
+
+
+def is_mate_score(value):
+    """
+    Description:
+        Sprawdza czy ocena oznacza rozstrzygniętą grę (wygraną lub przegraną), a nie ocenę heurystyczną.
+
+    Parameters:
+        value (int): Ocena pozycji.
+
+    Returns:
+        bool: True dla rozstrzygniętej pozycji.
+    """
+    return abs(value) >= WIN_SCORE - MAX_PLY
+
+
+def value_to_tt(value, ply):
+    """
+    Description:
+        Zamienia ocenę rozstrzygniętej gry z odległości od korzenia na odległość od danej pozycji,
+        aby wpis w tablicy transpozycji był poprawny niezależnie od tego, na jakiej głębokości go odczytamy.
+
+    Parameters:
+        value (int): Ocena pozycji.
+        ply (int): Odległość pozycji od korzenia.
+
+    Returns:
+        value (int): Ocena do zapisania w tablicy.
+    """
+    if is_mate_score(value):
+        return value + ply if value > 0 else value - ply
+    return value
+
+
+def value_from_tt(value, ply):
+    """
+    Description:
+        Odwrotność value_to_tt - odczytana ocena rozstrzygniętej gry znów liczy ruchy od korzenia.
+
+    Parameters:
+        value (int): Ocena z tablicy.
+        ply (int): Odległość pozycji od korzenia.
+
+    Returns:
+        value (int): Ocena pozycji.
+    """
+    if is_mate_score(value):
+        return value - ply if value > 0 else value + ply
+    return value
+
+
+class AlphaBetaSearch:
+    """
+    Silnik przeszukiwania: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Opis:
+    Własna implementacja Negamax z cięciami alfa-beta działająca bezpośrednio na liczbie punktów
+    (bez kopiowania obiektu gry i zamiany ruchów na tekst). Koniec gry wykrywany jest według zasad z DivideByHalf:
+        * przy 1 punkcie gracz wykonujący ruch przegrywa (zasada 3),
+        * dzielniki dające wynik 0 przegrywają (zasada 4), więc nie są w ogóle rozważane.
+
+    Kolejność sprawdzania ruchów:
+        1. ruch z tablicy transpozycji albo z poprzedniego przeszukania tej samej liczby punktów,
+        2. ruchy "killer" - ruchy, które spowodowały cięcie na tej samej głębokości w innej gałęzi,
+        3. pozostałe ruchy według heurystyki historii (suma depth^2 za każde cięcie).
+
+    Liczniki w self.stats pozwalają sprawdzić, ile daje każda optymalizacja:
+        nodes - liczba odwiedzonych pozycji, cutoffs - liczba cięć beta, tt_hits - trafienia w tablicy transpozycji,
+        depth_times / depth_nodes - czas i liczba pozycji dla każdej przeszukanej głębokości.
+
+    Example:
+        ai = AlphaBetaSearch(15)
+        game = DivideByHalf([Human_Player(), AI_Player(ai)])
+    """
+
+    def __init__(self, depth=15, killers=True, history=True, tt=None, tt_size=100000, exact_depth=False):
+        """
+        Parameters:
+            depth (int): Głębokość przeszukiwania. Default: 15.
+            killers (bool): Czy używać ruchów "killer". Default: True.
+            history (bool): Czy używać heurystyki historii. Default: True.
+            tt (LRUTranspositionTable): Tablica transpozycji, klucz (points, player). Nie należy współdzielić jej
+                z Negamax z easyAI, bo oceny są w innej skali. Default: None (własna tablica o rozmiarze tt_size).
+            tt_size (int): Rozmiar własnej tablicy transpozycji, 0 wyłącza tablicę. Default: 100000.
+            exact_depth (bool): Czy ocena z tablicy może zastąpić przeszukanie tylko przy tej samej pozostałej
+                głębokości. Głębszy wpis daje inną (dokładniejszą) ocenę niż przeszukanie do zadanej głębokości,
+                więc wynik zależałby od tego, co wcześniej trafiło do tablicy. Default: False.
+        """
+        self.depth = depth
+        self.use_killers = killers
+        self.use_history = history
+        self.exact_depth = exact_depth
+        self.tt = tt if tt is not None or not tt_size else LRUTranspositionTable(tt_size)
+        self.deadline = None
+        self.hash_moves = {}
+        self.killer_moves = []
+        self.history_scores = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Description:
+            Zeruje liczniki przeszukiwania.
+        """
+        self.stats = {"nodes": 0, "cutoffs": 0, "tt_hits": 0, "depth_times": {}, "depth_nodes": {}}
+
+    def __call__(self, game):
+        """
+        Description:
+            Wybiera ruch dla aktualnego stanu gry, przeszukując do głębokości self.depth.
+
+        Parameters:
+            game (DivideByHalf): Aktualny stan gry.
+
+        Returns:
+            move (str): Dzielnik w tym samym formacie co DivideByHalf.possible_moves().
+        """
+        self.reset_stats()
+        self.hash_moves = {}
+        self.killer_moves = [[] for _ in range(self.depth + 1)]
+        self.history_scores = {}
+        _, move = self.search(game.points, self.depth, game.current_player)
+        return str(move)
+
+    def search(self, points, depth, player=1):
+        """
+        Description:
+            Przeszukuje pozycję do zadanej głębokości i zapisuje czas oraz liczbę pozycji dla tej głębokości.
+
+        Parameters:
+            points (int): Aktualna liczba punktów (co najmniej 2).
+            depth (int): Głębokość przeszukiwania.
+            player (int): Gracz wykonujący ruch (ważny tylko dla klucza tablicy transpozycji). Default: 1.
+
+        Returns:
+            value (int): Ocena pozycji z punktu widzenia gracza wykonującego ruch.
+            move (int): Najlepszy dzielnik.
+        """
+        if len(self.killer_moves) <= depth:
+            self.killer_moves.extend([] for _ in range(depth + 1 - len(self.killer_moves)))
+        nodes_before = self.stats["nodes"]
+        start = time.perf_counter()
+        value = self.negamax(points, depth, 0, -WIN_SCORE, WIN_SCORE, player)
+        self.stats["depth_times"][depth] = time.perf_counter() - start
+        self.stats["depth_nodes"][depth] = self.stats["nodes"] - nodes_before
+        return value, self.hash_moves[points]
+
+    def order_moves(self, points, ply, hash_move):
+        """
+        Description:
+            Ustala kolejność sprawdzania ruchów: ruch z tablicy, ruchy "killer", reszta według historii.
+
+        Parameters:
+            points (int): Liczba punktów w pozycji.
+            ply (int): Odległość od korzenia.
+            hash_move (int | None): Ruch zapamiętany dla tej pozycji.
+
+        Returns:
+            moves (list): Dozwolone dzielniki w kolejności sprawdzania.
+        """
+        moves = legal_moves(points)
+        if self.use_history:
+            moves.sort(key=lambda move: -self.history_scores.get(move, 0))
+        if self.use_killers:
+            for killer in reversed(self.killer_moves[ply]):
+                if killer in moves:
+                    moves.remove(killer)
+                    moves.insert(0, killer)
+        if hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+        return moves
+
+    def negamax(self, points, depth, ply, alpha, beta, player=1):
+        """
+        Description:
+            Negamax z cięciami alfa-beta, tablicą transpozycji i kolejnością ruchów z order_moves.
+
+        Parameters:
+            points (int): Liczba punktów w pozycji.
+            depth (int): Pozostała głębokość.
+            ply (int): Odległość od korzenia.
+            alpha (int): Dolne ograniczenie oceny.
+            beta (int): Górne ograniczenie oceny.
+            player (int): Gracz wykonujący ruch. Default: 1.
+
+        Returns:
+            value (int): Ocena pozycji z punktu widzenia gracza wykonującego ruch.
+        """
+        stats = self.stats
+        stats["nodes"] += 1
+        if self.deadline is not None and not stats["nodes"] & 255 and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+        if points == 1:
+            return -WIN_SCORE + ply
+        if depth == 0:
+            return -min(points, HEURISTIC_LIMIT)
+
+        alpha_orig = alpha
+        hash_move = self.hash_moves.get(points)
+        if self.tt is not None:
+            entry = self.tt.get((points, player))
+            if entry is not None:
+                hash_move = entry["move"]
+                if entry["depth"] == depth or entry["depth"] > depth and not self.exact_depth:
+                    stats["tt_hits"] += 1
+                    value = value_from_tt(entry["value"], ply)
+                    if entry["flag"] == EXACT:
+                        self.hash_moves[points] = hash_move
+                        return value
+                    if entry["flag"] == LOWERBOUND:
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        self.hash_moves[points] = hash_move
+                        return value
+
+        best_value = -WIN_SCORE
+        best_move = None
+        for move in self.order_moves(points, ply, hash_move):
+            value = -self.negamax(points // move, depth - 1, ply + 1, -beta, -alpha, 3 - player)
+            if value > best_value:
+                best_value = value
+                best_move = move
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    stats["cutoffs"] += 1
+                    if self.use_killers and move not in self.killer_moves[ply]:
+                        self.killer_moves[ply] = [move] + self.killer_moves[ply][:1]
+                    if self.use_history:
+                        self.history_scores[move] = self.history_scores.get(move, 0) + depth * depth
+                    break
+
+        self.hash_moves[points] = best_move
+        if self.tt is not None:
+            if best_value <= alpha_orig:
+                flag = UPPERBOUND
+            elif best_value >= beta:
+                flag = LOWERBOUND
+            else:
+                flag = EXACT
+            self.tt.put((points, player), depth, value_to_tt(best_value, ply), best_move, flag)
+        return best_value
+
+
+class IterativeDeepening(AlphaBetaSearch):
+    """
+    AI z pogłębianiem iteracyjnym: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Opis:
+    Negamax(15) ma stałą głębokość - dla dużych start_points czas ruchu rośnie bez ograniczeń.
+    Ten algorytm przeszukuje kolejno głębokości 1, 2, 3, ... (AlphaBetaSearch), dopóki nie skończy się
+    budżet czasu podany w milisekundach. Zwraca najlepszy ruch z ostatniej w pełni przeszukanej głębokości.
+
+    Najlepsze ruchy znalezione w poprzedniej iteracji są zapamiętywane dla każdej liczby punktów i sprawdzane
+    jako pierwsze w następnej, dzięki czemu cięcia alfa-beta zdarzają się wcześniej.
+    Jeżeli któraś głębokość rozstrzygnie grę (wygrana lub przegrana), dalsze iteracje nie są potrzebne.
+
+    Ocena liści jest taka sama jak DivideByHalf.scoring(), czyli -points (ograniczona do HEURISTIC_LIMIT).
+
+    Example:
+        ai = IterativeDeepening(budget_ms=50)
+        game = DivideByHalf([Human_Player(), AI_Player(ai)])
+    """
+
+    def __init__(self, budget_ms=100, max_depth=64, killers=True, history=True, tt=None, tt_size=100000):
+        """
+        Parameters:
+            budget_ms (float): Budżet czasu na jeden ruch w milisekundach. Default: 100.
+            max_depth (int): Maksymalna głębokość przeszukiwania. Default: 64.
+            killers (bool): Czy używać ruchów "killer". Default: True.
+            history (bool): Czy używać heurystyki historii. Default: True.
+            tt (LRUTranspositionTable): Tablica transpozycji. Default: None (własna tablica o rozmiarze tt_size).
+            tt_size (int): Rozmiar własnej tablicy transpozycji, 0 wyłącza tablicę. Default: 100000.
+        """
+        super().__init__(max_depth, killers, history, tt, tt_size)
+        self.budget_ms = budget_ms
+        self.max_depth = max_depth
+        self.completed_depth = 0
+        self.value = None
+
+    def __call__(self, game):
+        """
+        Description:
+            Wybiera ruch dla aktualnego stanu gry w ramach budżetu czasu.
+
+        Parameters:
+            game (DivideByHalf): Aktualny stan gry.
+
+        Returns:
+            move (str): Dzielnik w tym samym formacie co DivideByHalf.possible_moves().
+        """
+        return str(self.iterate(game.points, game.current_player))
+
+    def iterate(self, points, player=1):
+        """
+        Description:
+            Pogłębianie iteracyjne od korzenia points. Przynajmniej głębokość 1 jest zawsze kończona,
+            więc zwracany ruch jest poprawny nawet przy bardzo małym budżecie.
+
+        Parameters:
+            points (int): Aktualna liczba punktów (co najmniej 2).
+            player (int): Gracz wykonujący ruch. Default: 1.
+
+        Returns:
+            move (int): Najlepszy znaleziony dzielnik.
+        """
+        self.reset_stats()
+        self.deadline = None
+        self.hash_moves = {}
+        self.killer_moves = [[] for _ in range(self.max_depth + 1)]
+        self.history_scores = {}
+        best_move = legal_moves(points)[0]
+        start = time.perf_counter()
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value, move = self.search(points, depth, player)
+            except SearchTimeout:
+                break
+            best_move = move
+            self.completed_depth = depth
+            self.value = value
+            if is_mate_score(value):
+                break
+            if depth == 1:
+                self.deadline = start + self.budget_ms / 1000
+                if time.perf_counter() >= self.deadline:
+                    break
+
+        self.deadline = None
+        return best_move
+
+
+_worker = {}
+
+
+def _float_below(value):
+    """
+    Returns:
+        float: Największa liczba zmiennoprzecinkowa <= value (ograniczenie dolne zapisane bez zawyżenia).
+    """
+    result = float(value)
+    return math.nextafter(result, -math.inf) if result > value else result
+
+
+def _float_above(value):
+    """
+    Returns:
+        float: Najmniejsza liczba zmiennoprzecinkowa >= value (ograniczenie górne zapisane bez zaniżenia).
+    """
+    result = float(value)
+    return math.nextafter(result, math.inf) if result < value else result
+
+
+def _int_bound(value, rounding):
+    """
+    Returns:
+        int: Ograniczenie okna z tablicy wspólnej zaokrąglone funkcją rounding i przycięte do [-WIN_SCORE, WIN_SCORE].
+    """
+    if value <= -WIN_SCORE:
+        return -WIN_SCORE
+    if value >= WIN_SCORE:
+        return WIN_SCORE
+    return rounding(value)
+
+
+def _init_parallel_worker(bounds, killers, history, tt_size):
+    """
+    Description:
+        Inicjalizacja procesu roboczego ParallelRootSearch: zapamiętuje wspólne ograniczenia okna i tworzy
+        własny silnik AlphaBetaSearch. Tablica transpozycji silnika zostaje w procesie między kolejnymi zadaniami
+        i ruchami, dlatego silnik używa tylko wpisów o tej samej pozostałej głębokości (exact_depth) - wtedy
+        wynik zadania nie zależy od tego, które zadania ten sam proces liczył wcześniej.
+    """
+    _worker["bounds"] = bounds
+    _worker["engine"] = AlphaBetaSearch(0, killers, history, tt_size=tt_size, exact_depth=True)
+
+
+def _search_task(task):
+    """
+    Description:
+        Przeszukuje jedną pozycję z podziału korzenia. Okno (alpha, beta) z punktu widzenia gracza w korzeniu
+        odczytywane jest ze wspólnej tablicy dopiero w chwili rozpoczęcia zadania, więc zadania startujące
+        później korzystają z ocen ruchów policzonych przez inne procesy.
+
+    Parameters:
+        task (tuple): (root_index, points, depth, ply, player) - indeks ruchu w korzeniu, pozycja po ply ruchach,
+            pozostała głębokość i gracz wykonujący ruch w tej pozycji.
+
+    Returns:
+        root_index (int): Indeks ruchu w korzeniu.
+        value (int): Ocena z punktu widzenia gracza w korzeniu.
+        alpha (int): Dolne ograniczenie okna użytego w przeszukiwaniu.
+        beta (int): Górne ograniczenie okna użytego w przeszukiwaniu.
+        nodes (int): Liczba odwiedzonych pozycji.
+    """
+    root_index, points, depth, ply, player = task
+    bounds, engine = _worker["bounds"], _worker["engine"]
+    with bounds.get_lock():
+        alpha_bound, beta_bound = bounds[0], bounds[1 + root_index]
+    alpha = _int_bound(alpha_bound, math.floor)
+    beta = _int_bound(beta_bound, math.ceil)
+    if alpha >= beta:
+        return root_index, beta, alpha, beta, 0
+
+    engine.reset_stats()
+    engine.hash_moves = {}
+    engine.killer_moves = [[] for _ in range(ply + depth + 1)]
+    if ply % 2:
+        value = -engine.negamax(points, depth, ply, -beta, -alpha, player)
+    else:
+        value = engine.negamax(points, depth, ply, alpha, beta, player)
+    return root_index, value, alpha, beta, engine.stats["nodes"]
+
+
+class ParallelRootSearch:
+    """
+    Równoległe przeszukiwanie: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Opis:
+    AlphaBetaSearch sprawdza trzy dzielniki w korzeniu jeden po drugim. Tutaj ruchy w korzeniu (split_depth=1)
+    albo pary ruch + odpowiedź przeciwnika (split_depth=2, do 9 zadań) są rozdzielane między procesy z puli.
+    Każdy proces ma własny AlphaBetaSearch z tablicą transpozycji, z której bierze tylko oceny o tej samej
+    pozostałej głębokości, więc wynik nie zależy od przydziału zadań do procesów.
+
+    Kolejność jak w algorytmie "Young Brothers Wait": płytsze przeszukanie (depth - ORDERING_REDUCTION)
+    w bieżącym procesie wskazuje najlepszy ruch w korzeniu i najlepsze odpowiedzi. Najpierw równolegle liczone są
+    zadania najlepszego ruchu, a dopiero gdy znamy jego ocenę (alpha), pozostałe - już z wąskim oknem.
+
+    Wspólne ograniczenia okna są w tablicy multiprocessing.Array:
+        bounds[0] - alpha - 1, gdzie alpha to najlepsza dokładna ocena ruchu w korzeniu znana do tej pory,
+        bounds[1 + i] - beta dla ruchu i (split_depth=2): najmniejsza ocena odpowiedzi przeciwnika na ten ruch.
+    Proces główny aktualizuje je po każdym wyniku, a zadania odczytują je przy starcie. Ruch, którego
+    któraś odpowiedź jest mniejsza od alpha, jest odrzucany, a jego pozostałe zadania kończą się natychmiast.
+    Okno zaczyna się od alpha - 1, więc ruch o ocenie równej alpha nie jest odrzucany i dostaje dokładną ocenę -
+    przy równych ocenach wybierany jest ruch wcześniejszy w kolejności z płytszego przeszukania, niezależnie
+    od tego, który proces skończył pierwszy.
+    Oceny (do 10^20) nie mieszczą się w int64, dlatego tablica przechowuje liczby zmiennoprzecinkowe
+    zaokrąglane bezpiecznie: alpha w dół, beta w górę. Okno może być przez to minimalnie szersze, ale nigdy węższe,
+    więc ocena jest taka sama jak w AlphaBetaSearch o tej samej głębokości z exact_depth=True (albo bez tablicy
+    transpozycji), a wynik nie zależy od liczby procesów i kolejności kończenia zadań.
+
+    Dla głębokości nie większych niż split_depth + 2 narzut puli przewyższa zysk i ruch liczony jest w bieżącym
+    procesie. Nie należy tworzyć ParallelRootSearch wewnątrz procesów z puli (np. SessionManager(use_processes=True)),
+    bo procesy robocze nie mogą mieć własnych procesów potomnych.
+
+    Example:
+        ai = ParallelRootSearch(25, processes=4)
+        game = DivideByHalf([Human_Player(), AI_Player(ai)], start_points=10 ** 18)
+        ...
+        ai.close()
+    """
+
+    def __init__(self, depth=15, processes=None, split_depth=2, killers=True, history=True, tt_size=100000):
+        """
+        Parameters:
+            depth (int): Głębokość przeszukiwania. Default: 15.
+            processes (int): Liczba procesów. Default: None (liczba rdzeni).
+            split_depth (int): Liczba ruchów od korzenia rozdzielanych między procesy (1 lub 2). Default: 2.
+            killers (bool): Czy używać ruchów "killer". Default: True.
+            history (bool): Czy używać heurystyki historii. Default: True.
+            tt_size (int): Rozmiar tablicy transpozycji w każdym procesie. Default: 100000.
+        """
+        if split_depth not in (1, 2):
+            raise ValueError("split_depth musi wynosić 1 lub 2, otrzymano: %s" % split_depth)
+        self.depth = depth
+        self.processes = processes
+        self.split_depth = split_depth
+        self.killers = killers
+        self.history = history
+        self.tt_size = tt_size
+        self.serial = AlphaBetaSearch(depth, killers, history, tt_size=tt_size)
+        self.bounds = None
+        self.pool = None
+        self.alpha = -WIN_SCORE
+        self.stats = {"nodes": 0, "tasks": 0, "refuted": 0}
+
+    def _ensure_pool(self):
+        if self.pool is None:
+            self.bounds = multiprocessing.Array("d", 1 + len(DIVISORS))
+            self.pool = multiprocessing.Pool(self.processes, _init_parallel_worker,
+                                             (self.bounds, self.killers, self.history, self.tt_size))
+        return self.pool
+
+    def close(self):
+        """
+        Description:
+            Zamyka pulę procesów.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __call__(self, game):
+        """
+        Parameters:
+            game (DivideByHalf): Aktualny stan gry.
+
+        Returns:
+            move (str): Dzielnik w tym samym formacie co DivideByHalf.possible_moves().
+        """
+        _, move = self.search(game.points, self.depth, game.current_player)
+        return str(move)
+
+    def search(self, points, depth, player=1):
+        """
+        Description:
+            Przeszukuje pozycję do zadanej głębokości, rozdzielając pierwsze split_depth ruchów między procesy.
+
+        Parameters:
+            points (int): Aktualna liczba punktów (co najmniej 2).
+            depth (int): Głębokość przeszukiwania.
+            player (int): Gracz wykonujący ruch. Default: 1.
+
+        Returns:
+            value (int): Ocena pozycji z punktu widzenia gracza wykonującego ruch.
+            move (int): Najlepszy dzielnik.
+        """
+        self.stats = {"nodes": 0, "tasks": 0, "refuted": 0}
+        self.serial.hash_moves = {}
+        if depth <= self.split_depth + 2:
+            self.serial.reset_stats()
+            result = self.serial.search(points, depth, player)
+            self.stats["nodes"] = self.serial.stats["nodes"]
+            return result
+
+        self.serial.reset_stats()
+        self.serial.search(points, max(1, depth - ORDERING_REDUCTION), player)
+        self.stats["nodes"] = self.serial.stats["nodes"]
+        moves = self._ordered(points)
+        upper = [WIN_SCORE] * len(moves)
+        refuted = [False] * len(moves)
+        groups = []
+        for index, move in enumerate(moves):
+            child = points // move
+            if child == 1:
+                upper[index] = WIN_SCORE - 1
+                groups.append([])
+            elif self.split_depth == 1:
+                groups.append([(index, child, depth - 1, 1, 3 - player)])
+            else:
+                groups.append([(index, child // reply, depth - 2, 2, player) for reply in self._ordered(child)])
+        pending = [len(group) for group in groups]
+        self.alpha = max((upper[index] for index, group in enumerate(groups) if not group), default=-WIN_SCORE)
+
+        pool = self._ensure_pool()
+        with self.bounds.get_lock():
+            self.bounds[0] = _float_below(self.alpha - 1)
+            for index in range(len(DIVISORS)):
+                self.bounds[1 + index] = math.inf
+
+        phases = [groups[0], [task for group in groups[1:] for task in group]]
+        for tasks in phases:
+            for index, value, task_alpha, task_beta, nodes in pool.imap_unordered(_search_task, tasks):
+                self.stats["nodes"] += nodes
+                self.stats["tasks"] += 1
+                pending[index] -= 1
+                if value <= task_alpha:
+                    refuted[index] = True
+                upper[index] = min(upper[index], value)
+                if not refuted[index] and not pending[index] and upper[index] > self.alpha:
+                    self.alpha = upper[index]
+                with self.bounds.get_lock():
+                    self.bounds[0] = _float_below(self.alpha - 1)
+                    self.bounds[1 + index] = -math.inf if refuted[index] else _float_above(upper[index])
+
+        self.stats["refuted"] = sum(refuted)
+        best = max((index for index in range(len(moves)) if not refuted[index]), key=lambda index: (upper[index], -index))
+        return upper[best], moves[best]
+
+    def _ordered(self, points):
+        """
+        Returns:
+            moves (list): Dozwolone dzielniki, najlepszy ruch z płytszego przeszukania jako pierwszy.
+        """
+        moves = legal_moves(points)
+        hash_move = self.serial.hash_moves.get(points)
+        if hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+        return moves
+
+
+class CountingDivideByHalf(DivideByHalf):
+    """
+    Description:
+        DivideByHalf liczący wywołania make_move, czyli pozycje odwiedzone przez Negamax z easyAI.
+    """
+    nodes = 0
+
+    def make_move(self, move):
+        CountingDivideByHalf.nodes += 1
+        return super().make_move(move)
+
+
+def compare_with_negamax(points, depth, tt=None):
+    """
+    Description:
+        Porównuje liczbę odwiedzonych pozycji i czas Negamax z easyAI oraz AlphaBetaSearch na tej samej głębokości.
+        Pozwala sprawdzić, że własny silnik odwiedza znacznie mniej pozycji.
+
+    Parameters:
+        points (int): Liczba punktów w pozycji startowej.
+        depth (int): Głębokość przeszukiwania.
+        tt (LRUTranspositionTable): Opcjonalna tablica transpozycji dla Negamax z easyAI. Jeżeli jest podana,
+            AlphaBetaSearch również używa (własnej) tablicy transpozycji. Default: None.
+
+    Returns:
+        result (dict): Liczba pozycji, czas i wybrany ruch dla obu silników oraz liczniki AlphaBetaSearch.
+    """
+    CountingDivideByHalf.nodes = 0
+    negamax = Negamax(depth, tt=tt)
+    game = CountingDivideByHalf([AI_Player(negamax), AI_Player(negamax)], start_points=points)
+    start = time.perf_counter()
+    negamax_move = game.get_move()
+    negamax_time = time.perf_counter() - start
+
+    alpha_beta = AlphaBetaSearch(depth, tt_size=100000 if tt is not None else 0)
+    game = DivideByHalf([AI_Player(alpha_beta), AI_Player(alpha_beta)], start_points=points)
+    start = time.perf_counter()
+    alpha_beta_move = game.get_move()
+    alpha_beta_time = time.perf_counter() - start
+
+    return {
+        "negamax_nodes": CountingDivideByHalf.nodes + 1,
+        "negamax_time": negamax_time,
+        "negamax_move": negamax_move,
+        "alpha_beta_nodes": alpha_beta.stats["nodes"],
+        "alpha_beta_time": alpha_beta_time,
+        "alpha_beta_move": alpha_beta_move,
+        "alpha_beta_stats": alpha_beta.stats,
+    }
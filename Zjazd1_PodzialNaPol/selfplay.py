@@ -0,0 +1,157 @@
+import multiprocessing
+
+import numpy as np
+from easyAI import AI_Player, Negamax
+
+from book import DEFAULT_START_VALUES, BookPlayer, OpeningBook
+from game import DivideByHalf
+from graph import GameGraph
+from history import COLUMNS, HistoryStore
+from search import AlphaBetaSearch, IterativeDeepening, ParallelRootSearch
+from solver import PersistentSolver, RetrogradeSolver
+from transposition import LRUTranspositionTable
+
+"""
+    AI_BUILDERS
+        Description:
+            Słownik budujący algorytm AI na podstawie specyfikacji gracza. Specyfikacja to krotka (nazwa, *argumenty),
+            którą da się przesłać do procesu roboczego, w przeciwieństwie do gotowego obiektu AI.
+        Example:
+            ("negamax", 15) - Negamax(15)
+            ("negamax", 15, 100000) - Negamax(15) z tablicą transpozycji na 100000 pozycji
+            ("solver",) - RetrogradeSolver, tablica rozszerzana w miarę potrzeb
+            ("cached", "divide_by_half.npy") - PersistentSolver, tablica czytana z pliku współdzielonego przez procesy
+            ("deepening", 50) - IterativeDeepening z budżetem 50 ms na ruch
+            ("alphabeta", 15) - AlphaBetaSearch z głębokością 15
+            ("parallel", 25, 4) - ParallelRootSearch z głębokością 25 na 4 procesach (tylko z processes=1 w simulate_games)
+            ("graph",) - GameGraph, graf osiągalnych liczb kompilowany od liczby startowej gry
+            ("book", (1000,), 8, ("alphabeta", 15)) - książka otwarć na 8 ruchów, poza nią AlphaBetaSearch(15)
+"""
+AI_BUILDERS = {
+    "negamax": lambda depth=15, tt_size=None: Negamax(depth, tt=LRUTranspositionTable(tt_size) if tt_size else None),
+    "solver": lambda max_points=1000: RetrogradeSolver(max_points),
+    "cached": lambda path, max_points=1000: PersistentSolver(path, max_points),
+    "deepening": lambda budget_ms=100, max_depth=64: IterativeDeepening(budget_ms, max_depth),
+    "alphabeta": lambda depth=15, tt_size=100000: AlphaBetaSearch(depth, tt_size=tt_size),
+    "parallel": lambda depth=25, processes=None, split_depth=2: ParallelRootSearch(depth, processes, split_depth),
+    "graph": lambda start_points=2: GameGraph.compile(start_points),
+    "book": lambda start_values=DEFAULT_START_VALUES, plies=8, fallback=("alphabeta", 15): BookPlayer(
+        OpeningBook.build(start_values, plies), AI_BUILDERS[fallback[0]](*fallback[1:])),
+}
+
+_ai_cache = {}
+
+
+def build_ai(spec):
+    """
+    Description:
+        Buduje algorytm AI na podstawie specyfikacji. W obrębie jednego procesu ta sama specyfikacja zwraca
+        ten sam obiekt, więc tablice solvera i tablice transpozycji są współdzielone między kolejnymi grami.
+
+    Parameters:
+        spec (tuple): Specyfikacja gracza (nazwa, *argumenty), np. ("negamax", 15).
+
+    Returns:
+        ai (callable): Algorytm AI zgodny z easyAI.AI_Player.
+    """
+    spec = tuple(spec)
+    if spec not in _ai_cache:
+        name, *args = spec
+        if name not in AI_BUILDERS:
+            raise ValueError("Nieznany typ AI: %s. Dostępne: %s" % (name, sorted(AI_BUILDERS)))
+        _ai_cache[spec] = AI_BUILDERS[name](*args)
+    return _ai_cache[spec]
+
+
+def play_headless(game):
+    """
+    Description:
+        Rozgrywa grę do końca bez wypisywania, tabel i wykresów (odpowiednik game.play() dla symulacji).
+        Gra kończy się, gdy liczba punktów spadnie do 1 (wygrywa gracz, który wykonał ruch)
+        albo do 0 (zasada 4 - gracz, który wykonał ruch, przegrywa).
+
+    Parameters:
+        game (DivideByHalf): Gra z ustawionymi graczami.
+
+    Returns:
+        moves (list): Lista wybranych dzielników (int) w kolejności ruchów.
+        winner (int): Numer zwycięskiego gracza (1 lub 2).
+    """
+    moves = []
+    while game.points > 1:
+        move = game.get_move()
+        game.play_move(move)
+        moves.append(int(move))
+    winner = game.opponent_index if game.points == 1 else game.current_player
+    return moves, winner
+
+
+def _play_match(match):
+    """
+    Description:
+        Funkcja wykonywana w procesie roboczym - buduje graczy i rozgrywa jedną grę.
+
+    Parameters:
+        match (tuple): (start_points, (spec_gracza_1, spec_gracza_2)).
+
+    Returns:
+        moves (bytes): Dzielniki zapisane jako bajty.
+        winner (int): Numer zwycięskiego gracza.
+    """
+    start_points, (spec1, spec2) = match
+    game = DivideByHalf([AI_Player(build_ai(spec1)), AI_Player(build_ai(spec2))], start_points=start_points)
+    moves, winner = play_headless(game)
+    return bytes(moves), winner
+
+
+class SelfPlayResults(HistoryStore):
+    """
+    Description:
+        Wyniki wielu gier: HistoryStore (liczby początkowe, offsety i połączone ruchy jako tablice numpy)
+        uzupełniony o tablicę winners (int8) z numerem zwycięzcy (1 lub 2) każdej gry.
+    """
+    columns = COLUMNS + ("winners",)
+
+    def __init__(self, start_points, winners, lengths, moves):
+        """
+        Parameters:
+            start_points (array): Liczby początkowe gier.
+            winners (array): Zwycięzcy gier.
+            lengths (array): Liczba ruchów każdej gry.
+            moves (array): Połączone ruchy wszystkich gier.
+        """
+        super().__init__(start_points, lengths=lengths, moves=moves)
+        self.winners = np.asarray(winners, dtype=np.int8)
+
+
+def simulate_games(matches, processes=None, chunksize=16):
+    """
+    Description:
+        Rozgrywa wiele gier AI kontra AI, rozdzielając je między procesy. Każdy proces buduje swoich graczy raz
+        (build_ai) i używa ich dla wszystkich przydzielonych gier. Kolejność wyników odpowiada kolejności matches.
+
+    Parameters:
+        matches (list): Lista krotek (start_points, (spec_gracza_1, spec_gracza_2)).
+        processes (int): Liczba procesów. 1 oznacza grę w bieżącym procesie. Default: None (liczba rdzeni).
+        chunksize (int): Liczba gier wysyłanych do procesu naraz. Default: 16.
+
+    Returns:
+        results (SelfPlayResults): Wyniki wszystkich gier.
+
+    Example:
+        results = simulate_games([(1000, (("negamax", 15), ("solver",)))] * 100)
+        print(np.bincount(results.winners))
+    """
+    matches = list(matches)
+    if processes == 1:
+        played = [_play_match(match) for match in matches]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            played = pool.map(_play_match, matches, chunksize)
+
+    return SelfPlayResults(
+        start_points=[match[0] for match in matches],
+        winners=[winner for _, winner in played],
+        lengths=[len(moves) for moves, _ in played],
+        moves=np.frombuffer(b"".join(moves for moves, _ in played), dtype=np.uint8),
+    )
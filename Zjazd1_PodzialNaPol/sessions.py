@@ -0,0 +1,224 @@
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from easyAI import AI_Player
+
+from game import DivideByHalf
+from selfplay import AI_BUILDERS
+from solver import DIVISORS
+
+_local = threading.local()
+
+
+def _compute_ai_move(spec, points, player):
+    """
+    Description:
+        Liczy ruch AI poza pętlą zdarzeń (w wątku albo procesie z puli). Każdy wątek/proces ma własny zestaw
+        algorytmów AI, bo silniki przeszukiwania trzymają stan (tablice transpozycji, liczniki) i nie są
+        bezpieczne przy jednoczesnym użyciu z wielu wątków.
+
+    Parameters:
+        spec (tuple): Specyfikacja AI jak w selfplay.AI_BUILDERS, np. ("alphabeta", 15).
+        points (int): Aktualna liczba punktów.
+        player (int): Gracz wykonujący ruch.
+
+    Returns:
+        move (str): Wybrany dzielnik.
+    """
+    cache = getattr(_local, "ai_cache", None)
+    if cache is None:
+        cache = _local.ai_cache = {}
+    if spec not in cache:
+        name, *args = spec
+        cache[spec] = AI_BUILDERS[name](*args)
+    ai = cache[spec]
+    game = DivideByHalf([AI_Player(ai), AI_Player(ai)], start_points=points)
+    game.current_player = player
+    return str(game.get_move())
+
+
+class GameSession:
+    """
+    Description:
+        Jedna gra człowiek kontra AI prowadzona bez input() i plt.show(). Ruch człowieka podajemy przez
+        submit_move, a ruch AI pobieramy przez await await_ai_move() - obliczenia AI wykonywane są w puli
+        menedżera, więc pętla zdarzeń może w tym czasie obsługiwać inne gry.
+
+        Historia ruchów ma ten sam format co DivideByHalf.play(): [(gracz, dzielnik, wynik przed, wynik po)].
+    """
+
+    def __init__(self, manager, session_id, start_points, ai_spec, human_player=1):
+        """
+        Parameters:
+            manager (SessionManager): Menedżer, do którego należy sesja.
+            session_id (int): Identyfikator sesji.
+            start_points (int): Początkowa liczba punktów.
+            ai_spec (tuple): Specyfikacja AI jak w selfplay.AI_BUILDERS.
+            human_player (int): Numer gracza-człowieka (1 zaczyna grę). Default: 1.
+        """
+        self.manager = manager
+        self.session_id = session_id
+        self.ai_spec = tuple(ai_spec)
+        self.human_player = human_player
+        self.start_points = start_points
+        self.points = start_points
+        self.current_player = 1
+        self.history = []
+        self.winner = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def is_over(self):
+        return self.winner is not None
+
+    def _apply(self, move):
+        """
+        Description:
+            Wykonuje ruch i sprawdza koniec gry: wynik 1 oznacza wygraną gracza wykonującego ruch,
+            wynik 0 - jego przegraną (zasada 4).
+        """
+        before = self.points
+        self.points = before // move
+        self.history.append((self.current_player, move, before, self.points))
+        if self.points == 1:
+            self.winner = self.current_player
+        elif self.points == 0:
+            self.winner = 3 - self.current_player
+        self.current_player = 3 - self.current_player
+
+    def submit_move(self, move):
+        """
+        Description:
+            Wykonuje ruch człowieka.
+
+        Parameters:
+            move (str | int): Wybrany dzielnik.
+
+        Returns:
+            self.points (int): Liczba punktów po ruchu.
+        """
+        if self.is_over:
+            raise ValueError("Gra %d jest już zakończona." % self.session_id)
+        if self.current_player != self.human_player:
+            raise ValueError("Teraz jest ruch AI.")
+        if str(move) not in [str(divisor) for divisor in DIVISORS]:
+            raise ValueError("Błąd: %s nie jest poprawnym dzielnikiem." % move)
+        self._apply(int(move))
+        return self.points
+
+    async def await_ai_move(self):
+        """
+        Description:
+            Liczy i wykonuje ruch AI w puli menedżera.
+
+        Returns:
+            move (int): Dzielnik wybrany przez AI.
+        """
+        async with self.lock:
+            if self.is_over:
+                raise ValueError("Gra %d jest już zakończona." % self.session_id)
+            if self.current_player == self.human_player:
+                raise ValueError("Teraz jest ruch człowieka.")
+            loop = asyncio.get_running_loop()
+            move = await loop.run_in_executor(self.manager.executor, _compute_ai_move,
+                                              self.ai_spec, self.points, self.current_player)
+            self._apply(int(move))
+            return int(move)
+
+    def state(self):
+        """
+        Returns:
+            state (dict): Stan gry do wysłania klientowi.
+        """
+        return {
+            "session_id": self.session_id,
+            "points": self.points,
+            "current_player": self.current_player,
+            "winner": self.winner,
+            "history": list(self.history),
+        }
+
+
+class SessionManager:
+    """
+    Sesje gier: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Opis:
+    Przechowuje wiele jednoczesnych gier człowiek kontra AI w jednej pętli asyncio. Sesja to kilka liczb
+    i lista historii, więc tysiące gier mieszczą się w jednym procesie serwera. Obliczenia AI trafiają do
+    wspólnej puli wątków albo procesów (use_processes=True dla głębokich przeszukiwań, które blokowałyby GIL).
+
+    Example:
+        async def main():
+            manager = SessionManager()
+            session = manager.create_session(1000, ("alphabeta", 15))
+            session.submit_move("2")
+            print(await session.await_ai_move())
+            manager.shutdown()
+    """
+
+    def __init__(self, max_workers=None, use_processes=False, executor=None):
+        """
+        Parameters:
+            max_workers (int): Rozmiar puli. Default: None (domyślny rozmiar puli).
+            use_processes (bool): Pula procesów zamiast wątków. Default: False.
+            executor (concurrent.futures.Executor): Własna pula, ma pierwszeństwo przed powyższymi. Default: None.
+        """
+        if executor is None:
+            executor = (ProcessPoolExecutor if use_processes else ThreadPoolExecutor)(max_workers)
+        self.executor = executor
+        self.sessions = {}
+        self.ids = itertools.count(1)
+
+    def create_session(self, start_points=1000, ai_spec=("alphabeta", 15), human_player=1):
+        """
+        Description:
+            Tworzy nową grę.
+
+        Parameters:
+            start_points (int): Początkowa liczba punktów. Default: 1000.
+            ai_spec (tuple): Specyfikacja AI jak w selfplay.AI_BUILDERS. Default: ("alphabeta", 15).
+            human_player (int): Numer gracza-człowieka (1 zaczyna grę). Default: 1.
+
+        Returns:
+            session (GameSession): Nowa sesja.
+        """
+        name = ai_spec[0]
+        if name not in AI_BUILDERS:
+            raise ValueError("Nieznany typ AI: %s. Dostępne: %s" % (name, sorted(AI_BUILDERS)))
+        session = GameSession(self, next(self.ids), start_points, ai_spec, human_player)
+        self.sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id):
+        """
+        Parameters:
+            session_id (int): Identyfikator sesji.
+
+        Returns:
+            session (GameSession): Sesja o danym identyfikatorze.
+        """
+        return self.sessions[session_id]
+
+    def close(self, session_id):
+        """
+        Description:
+            Usuwa sesję (np. po zakończeniu gry albo rozłączeniu gracza).
+
+        Parameters:
+            session_id (int): Identyfikator sesji.
+        """
+        self.sessions.pop(session_id, None)
+
+    def shutdown(self):
+        """
+        Description:
+            Zamyka pulę wątków/procesów.
+        """
+        self.executor.shutdown()
@@ -0,0 +1,191 @@
+import os
+
+import numpy as np
+
+DIVISORS = (2, 3, 4)
+CHUNK_SIZE = 1 << 20
+
+
+class RetrogradeSolver:
+    """
+    Solver: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Wymagane biblioteki:
+    1. numpy
+
+    Opis:
+    Stan gry to jedna liczba całkowita self.points, a każdy ruch zmniejsza ją co najmniej o połowę.
+    Dzięki temu status każdej liczby (wygrana/przegrana dla gracza wykonującego ruch) można policzyć
+    od dołu, od 1 do max_points, w jednej tablicy:
+        * liczba 1 jest przegrana (gracz nie może wykonać ruchu),
+        * liczba p >= 2 jest wygrana, jeżeli istnieje dzielnik d, dla którego p // d >= 1 jest przegraną.
+    W tablicy self.best_moves zapisujemy wygrywający dzielnik (2, 3 lub 4) albo 0 dla pozycji przegranej.
+
+    Liczby z przedziału [lo, 2 * lo) zależą wyłącznie od liczb mniejszych niż lo, więc każdy taki przedział
+    liczymy wektorowo w numpy zamiast w pętli Pythona.
+    """
+
+    def __init__(self, max_points=1000):
+        """
+        Description:
+            Tworzy solver i od razu rozwiązuje grę dla wszystkich liczb od 1 do max_points.
+
+        Parameters:
+            max_points (int): Największa liczba punktów, dla której liczymy tablicę. Default: 1000.
+        """
+        self.max_points = 3
+        self.best_moves = np.array([0, 0, 2, 2], dtype=np.uint8)
+        self.solve(max_points)
+
+    def solve(self, max_points):
+        """
+        Description:
+            Rozszerza tablicę self.best_moves tak, aby obejmowała liczby do max_points włącznie.
+            Już policzone wartości nie są liczone ponownie.
+
+        Parameters:
+            max_points (int): Największa liczba punktów, dla której liczymy tablicę.
+
+        Returns:
+            self.best_moves (numpy.ndarray): Tablica wygrywających dzielników (0 dla pozycji przegranej).
+        """
+        if max_points <= self.max_points:
+            return self.best_moves
+
+        best_moves = np.zeros(max_points + 1, dtype=np.uint8)
+        best_moves[:self.max_points + 1] = self.best_moves
+
+        lo = self.max_points + 1
+        while lo <= max_points:
+            hi = min(2 * lo, max_points + 1)
+            for start in range(lo, hi, CHUNK_SIZE):
+                points = np.arange(start, min(start + CHUNK_SIZE, hi), dtype=np.int64)
+                moves = np.zeros(len(points), dtype=np.uint8)
+                for divisor in reversed(DIVISORS):
+                    moves[best_moves[points // divisor] == 0] = divisor
+                best_moves[start:start + len(points)] = moves
+            lo = hi
+
+        self.best_moves = best_moves
+        self.max_points = max_points
+        return self.best_moves
+
+    def save(self, path):
+        """
+        Description:
+            Zapisuje tablicę self.best_moves do pliku .npy. Zapis idzie do pliku tymczasowego, który następnie
+            podmieniamy, więc inne procesy czytające plik nigdy nie zobaczą go w połowie zapisanego.
+
+        Parameters:
+            path (str): Ścieżka do pliku .npy.
+        """
+        tmp_path = "%s.%d.tmp.npy" % (path, os.getpid())
+        np.save(tmp_path, self.best_moves)
+        os.replace(tmp_path, path)
+
+    def is_winning(self, points):
+        """
+        Description:
+            Sprawdza czy gracz wykonujący ruch przy danej liczbie punktów wygrywa przy idealnej grze.
+
+        Parameters:
+            points (int): Aktualna liczba punktów.
+
+        Returns:
+            bool: True jeżeli pozycja jest wygrana, False jeżeli przegrana.
+        """
+        self.solve(points)
+        return bool(self.best_moves[points])
+
+    def best_move(self, points):
+        """
+        Description:
+            Zwraca najlepszy dzielnik dla danej liczby punktów. W pozycji przegranej zwracamy 2,
+            czyli ruch, który zawsze jest poprawny i najdłużej odsuwa porażkę.
+
+        Parameters:
+            points (int): Aktualna liczba punktów (co najmniej 2).
+
+        Returns:
+            move (int): Wybrany dzielnik.
+        """
+        self.solve(points)
+        return int(self.best_moves[points]) or DIVISORS[0]
+
+    def __call__(self, game):
+        """
+        Description:
+            Pozwala użyć solvera jako algorytmu AI w easyAI, np. AI_Player(RetrogradeSolver(1000)).
+            Jeżeli gra zaczęła się od liczby większej niż policzona tablica, tablica jest rozszerzana.
+
+        Parameters:
+            game (DivideByHalf): Aktualny stan gry.
+
+        Returns:
+            move (str): Dzielnik w tym samym formacie co DivideByHalf.possible_moves().
+        """
+        return str(self.best_move(game.points))
+
+
+class PersistentSolver(RetrogradeSolver):
+    """
+    Description:
+        RetrogradeSolver z tablicą zapisaną na dysku, dzięki czemu kolejne uruchomienia game.py nie liczą
+        gry od nowa. Plik jest otwierany leniwie, dopiero przy pierwszym ruchu AI, przez np.load(mmap_mode='r'),
+        więc wiele procesów (np. w selfplay.simulate_games) współdzieli te same strony pamięci tylko do odczytu.
+        Jeżeli pliku nie ma albo obejmuje za mały zakres, tablica jest liczona, zapisywana i otwierana ponownie.
+
+    Example:
+        ai = PersistentSolver("divide_by_half.npy", 10 ** 7)
+        game = DivideByHalf([Human_Player(), AI_Player(ai)], start_points=10 ** 7)
+    """
+
+    def __init__(self, path, max_points=1000):
+        """
+        Parameters:
+            path (str): Ścieżka do pliku .npy z tablicą najlepszych ruchów.
+            max_points (int): Zakres liczony przy braku pliku. Default: 1000.
+        """
+        self.path = path
+        self.min_points = max_points
+        self.max_points = -1
+        self.best_moves = None
+
+    def _load(self):
+        """
+        Description:
+            Otwiera plik z dysku, a gdy go nie ma - zaczyna od tablicy dla liczb 0..3.
+        """
+        if os.path.exists(self.path):
+            self.best_moves = np.load(self.path, mmap_mode="r")
+        else:
+            self.best_moves = np.array([0, 0, 2, 2], dtype=np.uint8)
+        self.max_points = len(self.best_moves) - 1
+
+    def solve(self, max_points):
+        """
+        Description:
+            Zapewnia, że tablica obejmuje max_points. Tablica z pliku jest używana bez kopiowania;
+            dopiero brakujący zakres jest liczony i zapisywany na dysk.
+
+        Parameters:
+            max_points (int): Największa liczba punktów, dla której potrzebujemy wyniku.
+
+        Returns:
+            self.best_moves (numpy.ndarray): Tablica wygrywających dzielników (0 dla pozycji przegranej).
+        """
+        if max_points <= self.max_points:
+            return self.best_moves
+        if self.best_moves is None:
+            self._load()
+            if max_points <= self.max_points:
+                return self.best_moves
+
+        super().solve(max(max_points, self.min_points))
+        self.save(self.path)
+        self.best_moves = np.load(self.path, mmap_mode="r")
+        return self.best_moves
@@ -0,0 +1,14 @@
+import pytest
+
+from benchmark import parse_values
+
+
+def test_parse_values():
+    assert parse_values("1,5,3-5") == [1, 5, 3, 4, 5]
+    assert parse_values("10^1-10^3") == [10, 100, 1000]
+    assert parse_values("2^10-2^12,3^2") == [1024, 2048, 4096, 9]
+
+
+def test_parse_values_rejects_mixed_bases():
+    with pytest.raises(ValueError):
+        parse_values("2^1-10^3")
@@ -0,0 +1,16 @@
+from graph import GameGraph
+from variants import VariantSolver
+
+
+def test_default_divisors_use_bytes():
+    graph = GameGraph.compile(10 ** 18)
+    assert graph.moves.dtype.itemsize == 1
+    assert graph.best_move[graph.root] == 4
+
+
+def test_large_divisors_are_not_truncated():
+    graph = GameGraph.compile(10 ** 6, (2, 300, 70000))
+    assert set(graph.moves.tolist()) == {2, 300, 70000}
+    assert graph.best_move.dtype == graph.moves.dtype
+    assert set(graph.best_move.tolist()) <= {0, 2, 300, 70000}
+    assert bool(graph.win[graph.root]) == VariantSolver((2, 300, 70000)).solve(10 ** 6)[0]
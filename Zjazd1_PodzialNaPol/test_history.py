@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from history import GameHistory, HistoryStore, MoveRecord, replay
+
+
+def test_replay_matches_move_by_move_division():
+    before, after = replay(1000, [2, 3, 4])
+    assert before.tolist() == [1000, 500, 166]
+    assert after.tolist() == [500, 166, 41]
+
+
+def test_replay_without_moves_returns_empty_arrays():
+    before, after = replay(1000, np.array([], dtype=np.uint8))
+    assert len(before) == len(after) == 0
+    assert before.dtype == after.dtype
+
+
+def test_empty_game_history():
+    history = GameHistory(1000, 1)
+    assert len(history) == 0
+    assert list(history) == []
+    before, after = history.replay()
+    assert len(before) == len(after) == 0
+
+
+def test_move_record_equality_and_hash():
+    record = MoveRecord(1, 2, 10, 5)
+    assert record == (1, 2, 10, 5)
+    assert record == MoveRecord(1, 2, 10, 5)
+    assert record != 5
+    assert record != "(1, 2, 10, 5)"
+    assert len({record, MoveRecord(1, 2, 10, 5), (1, 2, 10, 5)}) == 1
+
+
+def test_from_histories_rejects_empty_move_list():
+    with pytest.raises(ValueError):
+        HistoryStore.from_histories([[]])
+
+
+def test_from_histories_with_empty_game():
+    store = HistoryStore.from_histories([GameHistory(10, 1), GameHistory(10, 2, [2])])
+    assert len(store) == 2
+    assert store.replay_all()["after"].tolist() == [5]
+
+
+def test_replay_all_does_not_overflow():
+    moves = [3] * 60
+    store = HistoryStore([10 ** 18], lengths=[len(moves)], moves=moves)
+    before, after = replay(10 ** 18, moves)
+    assert store.replay_all()["after"].tolist() == after.tolist()
+    assert after.tolist() == [10 ** 18 // 3 ** k for k in range(1, 61)]
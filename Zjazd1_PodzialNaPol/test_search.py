@@ -0,0 +1,55 @@
+import pytest
+
+from search import WIN_SCORE, AlphaBetaSearch, ParallelRootSearch
+
+POSITIONS = [612748349624468, 10 ** 15, 987654321987654, 2 ** 50 + 12345]
+TIED_POSITIONS = [17711, 15555, 134094, 145467]
+
+
+@pytest.fixture(scope="module")
+def parallel():
+    with ParallelRootSearch(12, processes=3, split_depth=2) as ai:
+        yield ai
+
+
+@pytest.mark.parametrize("points", POSITIONS)
+def test_parallel_matches_serial_with_transposition_table(parallel, points):
+    expected = AlphaBetaSearch(12, exact_depth=True).search(points, 12, 1)
+    for _ in range(3):
+        assert parallel.search(points, 12, 1) == expected
+
+
+def test_parallel_is_deterministic_across_pools():
+    points = 612748349624468
+    expected = AlphaBetaSearch(12).search(points, 12, 1)
+    assert expected == (-2337449453, 4)
+    for _ in range(5):
+        with ParallelRootSearch(12, processes=3, split_depth=2) as ai:
+            assert ai.search(points, 12, 1) == expected
+
+
+def _root_values(points, depth):
+    values = {}
+    for move in (2, 3, 4):
+        if points // move == 1:
+            values[move] = WIN_SCORE - 1
+        elif points // move:
+            engine = AlphaBetaSearch(depth, tt_size=0)
+            engine.killer_moves = [[] for _ in range(depth + 1)]
+            values[move] = -engine.negamax(points // move, depth - 1, 1, -WIN_SCORE, WIN_SCORE, 2)
+    return values
+
+
+@pytest.mark.parametrize("points", TIED_POSITIONS)
+def test_parallel_breaks_ties_by_root_order(points):
+    values = _root_values(points, 10)
+    best = max(values.values())
+    assert list(values.values()).count(best) > 1
+    results = set()
+    for processes in (1, 3, 3, 3):
+        with ParallelRootSearch(10, processes=processes, split_depth=2) as ai:
+            value, move = ai.search(points, 10, 1)
+            expected = next(move for move in ai._ordered(points) if values[move] == best)
+            assert (value, move) == (best, expected)
+            results.add(move)
+    assert len(results) == 1
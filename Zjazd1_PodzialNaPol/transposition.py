@@ -0,0 +1,159 @@
+from collections import OrderedDict
+
+LOWERBOUND, EXACT, UPPERBOUND = -1, 0, 1
+
+
+class LRUTranspositionTable:
+    """
+    Tablica transpozycji: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Opis:
+    Ta sama liczba punktów pojawia się w drzewie gry wiele razy, np. 1000 / 2 / 3 i 1000 / 3 / 2 dają 166.
+    Tablica zapamiętuje wynik przeszukania każdej pozycji (wartość dokładną albo ograniczenie, głębokość
+    i najlepszy ruch), dzięki czemu Negamax nie przeszukuje ponownie tego samego poddrzewa.
+
+    Tablica ma ograniczony rozmiar - po przekroczeniu max_entries usuwamy najdawniej używany wpis (LRU).
+    Kluczem jest game.ttentry(), czyli (points, current_player) dla DivideByHalf.
+
+    Interfejs (lookup / store) jest zgodny z easyAI, więc tablicę przekazujemy bezpośrednio do Negamax:
+        ai = Negamax(15, tt=LRUTranspositionTable())
+    """
+
+    def __init__(self, max_entries=100000):
+        """
+        Description:
+            Tworzy pustą tablicę transpozycji.
+
+        Parameters:
+            max_entries (int): Maksymalna liczba przechowywanych pozycji. Default: 100000.
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def lookup(self, game):
+        """
+        Description:
+            Szuka pozycji w tablicy i oznacza ją jako ostatnio używaną.
+
+        Parameters:
+            game (DivideByHalf): Aktualny stan gry.
+
+        Returns:
+            entry (dict | None): Słownik z kluczami depth, value, move, flag albo None, gdy pozycji nie ma.
+        """
+        return self.get(game.ttentry())
+
+    def get(self, key):
+        """
+        Description:
+            Jak lookup, ale przyjmuje bezpośrednio klucz (points, player).
+            Przydatne dla silników, które nie operują na obiektach gry.
+
+        Parameters:
+            key (tuple): Klucz pozycji (points, player).
+
+        Returns:
+            entry (dict | None): Zapisany wpis albo None.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def store(self, **data):
+        """
+        Description:
+            Zapisuje wynik przeszukania pozycji. Wpis z większą głębokością nie jest nadpisywany
+            płytszym wynikiem, bo jest od niego dokładniejszy.
+
+        Parameters:
+            **data: game, depth, value, move, flag - tak jak przekazuje je easyAI.
+        """
+        self.put(data.pop("game").ttentry(), **data)
+
+    def put(self, key, depth, value, move, flag):
+        """
+        Description:
+            Jak store, ale przyjmuje bezpośrednio klucz (points, player).
+
+        Parameters:
+            key (tuple): Klucz pozycji (points, player).
+            depth (int): Głębokość przeszukania, z której pochodzi wynik.
+            value (float): Wartość pozycji.
+            move (str): Najlepszy znaleziony ruch.
+            flag (int): EXACT, LOWERBOUND lub UPPERBOUND.
+        """
+        old = self.entries.get(key)
+        if old is not None:
+            self.entries.move_to_end(key)
+            if old["depth"] > depth:
+                return
+        self.entries[key] = {"depth": depth, "value": value, "move": move, "flag": flag}
+        self.stores += 1
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def hit_rate(self):
+        """
+        Description:
+            Oblicza odsetek zapytań, dla których pozycja była już w tablicy.
+
+        Returns:
+            float: Wartość od 0 do 1 (0 gdy nie było jeszcze zapytań).
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """
+        Description:
+            Zwraca statystyki użycia tablicy.
+
+        Returns:
+            stats (dict): entries, hits, misses, hit_rate, stores, evictions.
+        """
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        """
+        Description:
+            Usuwa wszystkie wpisy i zeruje statystyki.
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __call__(self, game):
+        """
+        Description:
+            Pozwala użyć tablicy jako AI (tak jak TranspositionTable z easyAI). Działa tylko dla pozycji,
+            które są już w tablicy.
+
+        Parameters:
+            game (DivideByHalf): Aktualny stan gry.
+
+        Returns:
+            move (str): Zapisany najlepszy ruch.
+        """
+        return self.lookup(game)["move"]
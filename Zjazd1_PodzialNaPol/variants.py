@@ -0,0 +1,219 @@
+import copy
+
+from easyAI import TwoPlayerGame
+
+
+class DivideGame(TwoPlayerGame):
+    """
+    Gra: Podział na pół z własnymi zasadami | Divide by half with custom rules
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Wymagane biblioteki:
+    1. easyAI
+
+    Opis:
+    Uogólnienie DivideByHalf do badania wariantów zasad:
+        * dzielniki są dowolnym zbiorem liczb całkowitych >= 2 (w DivideByHalf: 2, 3, 4),
+        * ruchy są liczbami całkowitymi, a nie tekstem, więc make_move nie wywołuje int(move),
+        * dzielnik dający wynik 0 nie jest dozwolony (zasada 4),
+        * gra kończy się, gdy points <= terminal_points albo gdy nie ma dozwolonego dzielnika;
+          gracz, który ma wtedy wykonać ruch, przegrywa (terminal_loses=True) albo wygrywa (terminal_loses=False).
+    Dla domyślnych parametrów zasady są takie same jak w DivideByHalf.
+
+    Example:
+        game = DivideGame([Human_Player(), AI_Player(VariantSolver((2, 3, 5)))], divisors=(2, 3, 5))
+    """
+
+    def __init__(self, players=None, start_points=1000, divisors=(2, 3, 4), terminal_points=1, terminal_loses=True):
+        """
+        Parameters:
+            players (list): Lista graczy. Default: None.
+            start_points (int): Początkowa liczba punktów. Default: 1000.
+            divisors (tuple): Dozwolone dzielniki. Default: (2, 3, 4).
+            terminal_points (int): Liczba punktów, przy której (lub poniżej której) gra się kończy. Default: 1.
+            terminal_loses (bool): Czy gracz, który ma wykonać ruch w pozycji końcowej, przegrywa. Default: True.
+        """
+        self.divisors = normalize_divisors(divisors)
+        self.terminal_points = terminal_points
+        self.terminal_loses = terminal_loses
+        self.players = players
+        self.start_points = start_points
+        self.points = start_points
+        self.current_player = 1
+
+    def possible_moves(self):
+        """
+        Returns:
+            possible_moves (list): Dzielniki (int), które nie dają wyniku 0.
+        """
+        return [divisor for divisor in self.divisors if self.points // divisor >= 1]
+
+    def make_move(self, move):
+        """
+        Parameters:
+            move (int): Wybrany dzielnik.
+
+        Returns:
+            self.points (int): Aktualny stan punktacji.
+        """
+        self.points //= move
+        return self.points
+
+    def is_over(self):
+        """
+        Returns:
+            bool: True jeżeli points <= terminal_points albo nie ma dozwolonego dzielnika.
+        """
+        return self.points <= self.terminal_points or self.points < self.divisors[0]
+
+    def scoring(self):
+        """
+        Description:
+            Ocena dla AI z easyAI: -100 gdy gracz wykonujący ruch przegrał, 100 gdy wygrał, 0 w trakcie gry.
+
+        Returns:
+            int: Ocena pozycji.
+        """
+        if not self.is_over():
+            return 0
+        return -100 if self.terminal_loses else 100
+
+    def copy(self):
+        """
+        Returns:
+            game (DivideGame): Płytka kopia stanu gry (jak DivideByHalf.copy).
+        """
+        return copy.copy(self)
+
+    def ttentry(self):
+        """
+        Returns:
+            (self.points, self.current_player) (tuple): Klucz pozycji dla tablicy transpozycji.
+        """
+        return self.points, self.current_player
+
+    def show(self):
+        """
+        Description:
+            Pokazuje aktualny stan gry, wyświetlając bieżącą punktacje self.points.
+        """
+        print("Wynik: %d \n" % self.points)
+
+
+def normalize_divisors(divisors):
+    """
+    Description:
+        Sprawdza i porządkuje zbiór dzielników: liczby całkowite >= 2, bez powtórzeń, rosnąco.
+
+    Parameters:
+        divisors (iterable): Dzielniki.
+
+    Returns:
+        divisors (tuple): Posortowane, unikalne dzielniki.
+    """
+    divisors = tuple(sorted({int(divisor) for divisor in divisors}))
+    if not divisors or divisors[0] < 2:
+        raise ValueError("Dzielniki muszą być liczbami całkowitymi >= 2, otrzymano: %s" % (divisors,))
+    return divisors
+
+
+class VariantSolver:
+    """
+    Description:
+        Dokładny solver dla DivideGame z dowolnym zbiorem dzielników. Odwiedza tylko liczby osiągalne z pozycji
+        startowej (floor(floor(n / a) / b) = floor(n / (a * b)), więc różnych liczb jest niewiele) i zapamiętuje
+        wynik każdej z nich w słowniku self.memo, który jest współdzielony między kolejnymi wywołaniami.
+
+        Rekurencja jest zapisana jako pętla ze stosem (bez limitu głębokości Pythona) i jest leniwa: dzieci pozycji
+        sprawdzamy po kolei, a pierwsze przegrane dziecko kończy analizę - pozostałe nie są odwiedzane.
+
+        self.memo[points] = (win, move), gdzie win mówi czy gracz wykonujący ruch wygrywa,
+        a move to wygrywający dzielnik (None, gdy pozycja jest przegrana albo końcowa).
+
+    Example:
+        solver = VariantSolver(divisors=range(2, 22))
+        solver.solve(10 ** 12)
+    """
+
+    def __init__(self, divisors=(2, 3, 4), terminal_points=1, terminal_loses=True):
+        """
+        Parameters:
+            divisors (tuple): Dozwolone dzielniki. Default: (2, 3, 4).
+            terminal_points (int): Jak w DivideGame. Default: 1.
+            terminal_loses (bool): Jak w DivideGame. Default: True.
+        """
+        self.divisors = normalize_divisors(divisors)
+        self.terminal_points = terminal_points
+        self.terminal_loses = terminal_loses
+        self.memo = {}
+
+    def is_terminal(self, points):
+        """
+        Returns:
+            bool: True jeżeli pozycja points kończy grę.
+        """
+        return points <= self.terminal_points or points < self.divisors[0]
+
+    def solve(self, points):
+        """
+        Description:
+            Rozwiązuje pozycję points i wszystkie potrzebne do tego pozycje osiągalne.
+
+        Parameters:
+            points (int): Liczba punktów.
+
+        Returns:
+            win (bool): Czy gracz wykonujący ruch wygrywa.
+            move (int | None): Wygrywający dzielnik albo None.
+        """
+        memo = self.memo
+        divisors = self.divisors
+        stack = [points]
+        while stack:
+            current = stack[-1]
+            if current in memo:
+                stack.pop()
+                continue
+            if self.is_terminal(current):
+                memo[current] = (not self.terminal_loses, None)
+                stack.pop()
+                continue
+
+            result = (False, None)
+            unknown = None
+            for divisor in divisors:
+                child = current // divisor
+                if child < 1:
+                    break
+                known = memo.get(child)
+                if known is None:
+                    if unknown is None:
+                        unknown = child
+                elif not known[0]:
+                    result = (True, divisor)
+                    break
+            if result[0] or unknown is None:
+                memo[current] = result
+                stack.pop()
+            else:
+                stack.append(unknown)
+
+        return memo[points]
+
+    def __call__(self, game):
+        """
+        Description:
+            Pozwala użyć solvera jako AI dla DivideGame. W pozycji przegranej wybiera najmniejszy dzielnik,
+            czyli najdłuższą obronę.
+
+        Parameters:
+            game (DivideGame): Aktualny stan gry.
+
+        Returns:
+            move (int): Wybrany dzielnik.
+        """
+        _, move = self.solve(game.points)
+        return move if move is not None else game.possible_moves()[0]
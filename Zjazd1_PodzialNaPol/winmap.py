@@ -0,0 +1,207 @@
+import os
+
+import numpy as np
+
+from solver import RetrogradeSolver
+
+ALIGNMENT = 96
+CHUNK_SIZE = ALIGNMENT << 16
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class WinLossMap:
+    """
+    Mapa wygranych: Podział na pół | Divide by half
+
+    Autorzy:
+    Kamil Powierza
+    Dawid Feister
+
+    Wymagane biblioteki:
+    1. numpy
+
+    Opis:
+    Odpowiada na pytanie "które liczby początkowe od 1 do N wygrywa gracz rozpoczynający?" dla N rzędu 10^9.
+    Wynik trzymamy jako bitset w pliku .npy otwieranym przez np.memmap - bit p jest ustawiony, jeżeli
+    gracz wykonujący ruch przy p punktach wygrywa (bit 0 nie ma znaczenia). 10^9 liczb zajmuje ok. 125 MB
+    i plik można używać ponownie między uruchomieniami.
+
+    Mapa liczona jest fragmentami [a, b), gdzie b <= 2a, więc wszystkie liczby p // 2, p // 3 i p // 4
+    są już policzone. Jeżeli a jest wielokrotnością 96, to a / 2, a / 3 oraz a / 4 są wielokrotnościami 8,
+    więc dla każdego dzielnika wystarczy rozpakować ciągły kawałek bajtów i powtórzyć każdy bit
+    d razy (np.repeat) - bez dzielenia i indeksowania każdej liczby osobno.
+    """
+
+    def __init__(self, bits):
+        """
+        Description:
+            Opakowuje gotowy bitset. Zwykle używamy WinLossMap.open() albo WinLossMap.build().
+
+        Parameters:
+            bits (numpy.ndarray): Spakowane bity (uint8, kolejność bitów 'little').
+        """
+        self.bits = bits
+
+    @property
+    def max_points(self):
+        """
+        Returns:
+            int: Największa liczba, dla której mapa jest policzona.
+        """
+        return len(self.bits) * 8 - 1
+
+    @classmethod
+    def open(cls, path):
+        """
+        Description:
+            Otwiera policzoną wcześniej mapę tylko do odczytu (memmap).
+
+        Parameters:
+            path (str): Ścieżka do pliku .npy.
+
+        Returns:
+            WinLossMap: Mapa oparta na pliku.
+        """
+        return cls(np.load(path, mmap_mode="r"))
+
+    @classmethod
+    def build(cls, path, max_points):
+        """
+        Description:
+            Liczy mapę dla liczb od 1 do co najmniej max_points i zapisuje ją w pliku .npy.
+            Jeżeli plik już istnieje i obejmuje max_points, jest tylko otwierany. Jeżeli obejmuje mniejszy zakres,
+            policzone bity są przepisywane i liczymy jedynie brakującą część.
+
+        Parameters:
+            path (str): Ścieżka do pliku .npy.
+            max_points (int): Największa liczba, dla której potrzebujemy wyniku.
+
+        Returns:
+            WinLossMap: Mapa oparta na pliku, otwarta tylko do odczytu.
+        """
+        end = -(-(max_points + 1) // ALIGNMENT) * ALIGNMENT
+        start = 0
+        previous = None
+        if os.path.exists(path):
+            previous = cls.open(path)
+            if previous.max_points >= max_points:
+                return previous
+            start = (len(previous.bits) * 8) // ALIGNMENT * ALIGNMENT
+
+        tmp_path = "%s.%d.tmp.npy" % (path, os.getpid())
+        bits = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8, shape=(end // 8,))
+        if start < ALIGNMENT:
+            first = RetrogradeSolver(ALIGNMENT - 1).best_moves > 0
+            bits[:ALIGNMENT // 8] = np.packbits(first, bitorder="little")
+            start = ALIGNMENT
+        else:
+            bits[:start // 8] = previous.bits[:start // 8]
+        del previous
+
+        a = start
+        while a < end:
+            b = min(a + CHUNK_SIZE, 2 * a, end)
+            losing = np.ones(b - a, dtype=np.uint8)
+            for divisor in (2, 3, 4):
+                step = 8 * divisor
+                children = np.unpackbits(bits[a // step:b // step], bitorder="little")
+                losing &= np.repeat(children, divisor)
+            bits[a // 8:b // 8] = np.packbits(losing ^ 1, bitorder="little")
+            a = b
+
+        bits.flush()
+        del bits
+        os.replace(tmp_path, path)
+        return cls.open(path)
+
+    def _check_range(self, lo, hi):
+        if lo < 1 or hi > self.max_points + 1 or lo > hi:
+            raise ValueError("Zakres [%d, %d) wykracza poza policzoną mapę [1, %d]." % (lo, hi, self.max_points))
+
+    def _unpack(self, lo, hi):
+        """
+        Description:
+            Rozpakowuje bity liczb z zakresu [lo, hi) do tablicy 0/1.
+        """
+        raw = np.unpackbits(self.bits[lo // 8:(hi + 7) // 8], bitorder="little")
+        return raw[lo % 8:lo % 8 + hi - lo]
+
+    def is_win(self, points):
+        """
+        Description:
+            Sprawdza czy gracz rozpoczynający od points punktów wygrywa.
+
+        Parameters:
+            points (int): Liczba początkowa.
+
+        Returns:
+            bool: True dla wygranej, False dla przegranej.
+        """
+        self._check_range(points, points + 1)
+        return bool(self.bits[points >> 3] >> (points & 7) & 1)
+
+    def count_wins(self, lo, hi):
+        """
+        Description:
+            Liczy wygrywające liczby początkowe w zakresie [lo, hi). Pełne bajty liczymy tablicą popcount,
+            rozpakowujemy tylko niepełne bajty na brzegach.
+
+        Parameters:
+            lo (int): Początek zakresu (włącznie).
+            hi (int): Koniec zakresu (wyłącznie).
+
+        Returns:
+            int: Liczba wygranych pozycji.
+        """
+        self._check_range(lo, hi)
+        first, last = -(-lo // 8), hi // 8
+        if first >= last:
+            return int(self._unpack(lo, hi).sum())
+        total = int(self._unpack(lo, first * 8).sum()) + int(self._unpack(last * 8, hi).sum())
+        for start in range(first, last, CHUNK_SIZE):
+            total += int(_POPCOUNT[self.bits[start:min(start + CHUNK_SIZE, last)]].sum(dtype=np.int64))
+        return total
+
+    def wins_in_range(self, lo, hi):
+        """
+        Description:
+            Zwraca wszystkie wygrywające liczby początkowe z zakresu [lo, hi).
+
+        Parameters:
+            lo (int): Początek zakresu (włącznie).
+            hi (int): Koniec zakresu (wyłącznie).
+
+        Returns:
+            numpy.ndarray: Posortowane liczby (int64).
+        """
+        self._check_range(lo, hi)
+        return np.flatnonzero(self._unpack(lo, hi)) + lo
+
+    def runs(self, lo=1, hi=None):
+        """
+        Description:
+            Zwraca mapę w postaci skompresowanej: granice kolejnych przedziałów o tym samym wyniku.
+            Dla dzielników 2, 3, 4 przegrane tworzą tylko przedziały [8^k, 2 * 8^k), więc cała mapa do 10^9
+            mieści się w kilkudziesięciu liczbach.
+
+        Parameters:
+            lo (int): Początek zakresu (włącznie). Default: 1.
+            hi (int): Koniec zakresu (wyłącznie). Default: None (do końca mapy).
+
+        Returns:
+            starts (numpy.ndarray): Początki kolejnych przedziałów (pierwszy to lo).
+            wins (numpy.ndarray): Wynik (True - wygrana) dla każdego przedziału.
+        """
+        hi = self.max_points + 1 if hi is None else hi
+        self._check_range(lo, hi)
+        starts, wins = [], []
+        previous = None
+        for start in range(lo, hi, CHUNK_SIZE):
+            chunk = self._unpack(start, min(start + CHUNK_SIZE, hi))
+            changes = np.flatnonzero(np.diff(chunk)) + 1
+            if previous != chunk[0]:
+                changes = np.concatenate(([0], changes))
+            starts.append(changes + start)
+            wins.append(chunk[changes].astype(bool))
+            previous = chunk[-1]
+        return np.concatenate(starts), np.concatenate(wins)
@@ -1,11 +1,673 @@
+import functools
+import json
+import operator
+import os
 import numpy as np
 import skfuzzy as fuzz
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import pygame
 import sys
 from skfuzzy import control as ctrl
 
-def ocena_ryzyka_jazdy(widocznosc_v, intensywnosc_opadow_v, natezenie_ruchu_v):
+"""
+    BAZA_REGUL, WEJSCIA
+        Description:
+            Domyślny opis systemu rozmytego: zmienne wejściowe, zmienna wyjściowa i reguły, które definiują,
+            jak poziomy zmiennych wejściowych wpływają na poziom ryzyka. Ten sam format ma plik wczytywany przez
+            wczytaj_baze() (JSON albo YAML, przykład w reguly.yaml):
+                wejscia - nazwa zmiennej -> uniwersum [start, stop, krok] oraz automf (liczba terminów,
+                          opcjonalnie nazwy) albo terminy (termin -> {funkcja z skfuzzy: parametry}),
+                wyjscie - nazwa, uniwersum i terminy zmiennej wyjściowej,
+                reguly - lista reguł: jezeli (przesłanki [zmienna, termin]), operator ('or' albo 'and',
+                         domyślnie 'or') i to (termin zmiennej wyjściowej).
+            WEJSCIA to nazwy zmiennych wejściowych domyślnej bazy, w kolejności argumentów ocen_wsadowo.
+"""
+BAZA_REGUL = {
+    'wejscia': {
+        'widocznosc': {'uniwersum': [0, 101, 0.1], 'automf': 3},
+        'intensywnosc_opadow': {'uniwersum': [0, 101, 0.1], 'automf': 3},
+        'natezenie_ruchu': {'uniwersum': [0, 101, 0.1], 'automf': 3},
+    },
+    'wyjscie': {
+        'nazwa': 'ryzyko',
+        'uniwersum': [0, 101, 0.1],
+        'terminy': {
+            'poor': {'trimf': [0, 0, 50]},
+            'average': {'trimf': [0, 50, 100]},
+            'good': {'trimf': [50, 100, 100]},
+        },
+    },
+    'reguly': [
+        {'jezeli': [['widocznosc', 'good'], ['intensywnosc_opadow', 'poor'], ['natezenie_ruchu', 'poor']], 'to': 'poor'},
+        {'jezeli': [['widocznosc', 'average'], ['intensywnosc_opadow', 'average'], ['natezenie_ruchu', 'average']], 'to': 'average'},
+        {'jezeli': [['widocznosc', 'poor'], ['intensywnosc_opadow', 'good'], ['natezenie_ruchu', 'good']], 'to': 'good'},
+    ],
+}
+WEJSCIA = tuple(BAZA_REGUL['wejscia'])
+OPERATORY = {'or': operator.or_, 'and': operator.and_}
+
+"""
+    RZADKIE_OD, BLOK_RZADKI
+        Description:
+            RZADKIE_OD - liczba reguł, od której SilnikRyzyka domyślnie liczy siły reguł rzadko (tylko reguły,
+            które mogą zadziałać w danej komórce nośników). Dla kilku reguł grupowanie wierszy kosztuje więcej
+            niż ocena wszystkich reguł.
+            BLOK_RZADKI - minimalna liczba wierszy grupowanych naraz w trybie rzadkim. Koszt grupowania zależy
+            od liczby komórek w bloku, więc większy blok daje więcej wierszy na komórkę.
+"""
+RZADKIE_OD = 32
+BLOK_RZADKI = 16384
+
+
+def wczytaj_baze(sciezka):
+    """
+        Description:
+            Wczytuje opis zmiennych i reguł w formacie BAZA_REGUL z pliku JSON albo YAML (.yaml, .yml).
+
+        Parametry:
+            sciezka (str): Ścieżka do pliku.
+
+        Zwraca:
+            dict: Baza reguł dla SilnikRyzyka.
+    """
+    with open(sciezka, encoding='utf-8') as plik:
+        if sciezka.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Odczyt plików YAML wymaga biblioteki PyYAML (pip install pyyaml).")
+            return yaml.safe_load(plik)
+        return json.load(plik)
+
+
+def _zmienna(klasa, nazwa, opis):
+    """
+        Description:
+            Tworzy zmienną skfuzzy (Antecedent albo Consequent) z opisu w formacie BAZA_REGUL. Funkcje trimf
+            i trapmf dostają listę parametrów, pozostałe funkcje z skfuzzy (np. gaussmf) - parametry po kolei.
+    """
+    zmienna = klasa(np.arange(*opis['uniwersum']), nazwa)
+    if 'automf' in opis:
+        zmienna.automf(opis['automf'], names=opis.get('nazwy'))
+    for termin, funkcja in opis.get('terminy', {}).items():
+        (typ, parametry), = funkcja.items()
+        if typ in ('trimf', 'trapmf'):
+            zmienna[termin] = getattr(fuzz, typ)(zmienna.universe, parametry)
+        else:
+            zmienna[termin] = getattr(fuzz, typ)(zmienna.universe, *parametry)
+    return zmienna
+
+
+class SilnikRyzyka:
+    """
+        Autorzy:
+            Kamil Powierza
+            Dawid Feister
+
+        Description:
+            Silnik oceny ryzyka jazdy na podstawie widoczności, intensywności opadów i natężenia ruchu.
+            Zmienne rozmyte, reguły, ControlSystem oraz ControlSystemSimulation są tworzone raz (zmienne i reguły
+            w konstruktorze, symulacja przy pierwszym użyciu). Każda kolejna ocena tylko ustawia wartości wejściowe
+            i wywołuje compute(), dzięki czemu jeden obiekt może liczyć tysiące ocen ryzyka bez ponownego
+            budowania systemu.
+
+            Zmienne i reguły pochodzą z bazy reguł (domyślnie BAZA_REGUL, albo plik z wczytaj_baze()).
+            Na potrzeby obliczeń wektorowych reguły są kompilowane do macierzy indeksów (reguły x przesłanki):
+            siły wszystkich reguł dla bloku wierszy to jedno pobranie kolumn z macierzy przynależności
+            i jedna redukcja max (OR) albo min (AND), bez pętli po regułach w Pythonie.
+
+            Przy dużych bazach większość reguł ma dla danego odczytu siłę 0, bo terminy (np. trójkąty z automf)
+            mają ograniczone nośniki. Końce nośników dzielą uniwersum każdej zmiennej na przedziały, w których
+            zbiór terminów o niezerowej przynależności się nie zmienia, a przedziały wszystkich zmiennych
+            tworzą komórki. W trybie rzadkim wiersze bloku są grupowane według komórek i dla każdej komórki
+            liczone są tylko reguły, które mogą w niej zadziałać (lista zapamiętywana przy pierwszym użyciu),
+            więc koszt zależy od liczby aktywnych reguł, a nie wszystkich.
+
+        Przykład:
+            silnik = SilnikRyzyka()
+            ryzyko = silnik.ocen(80, 10, 30)
+            silnik_regionu = SilnikRyzyka(wczytaj_baze('reguly.yaml'))
+    """
+
+    def __init__(self, baza=None, rzadkie=None):
+        """
+            Parametry:
+                baza (dict): Opis zmiennych i reguł w formacie BAZA_REGUL (np. z wczytaj_baze()).
+                    Default: None (BAZA_REGUL).
+                rzadkie (bool): Rzadkie liczenie sił reguł. Default: None (gdy reguł jest co najmniej RZADKIE_OD).
+        """
+        self.baza = baza if baza is not None else BAZA_REGUL
+        self.rzadkie = len(self.baza['reguly']) >= RZADKIE_OD if rzadkie is None else rzadkie
+        """
+            Description:
+                Tworzenie zmiennych rozmytych [Antecedents] oraz zmiennej wyjściowej [Consequent] wraz
+                z funkcjami przynależności (automf albo funkcje z bazy, np. trimf dla trzech poziomów ryzyka).
+        """
+        self.zmienne = {nazwa: _zmienna(ctrl.Antecedent, nazwa, opis) for nazwa, opis in self.baza['wejscia'].items()}
+        self.wejscia = list(self.zmienne)
+        self.ryzyko = _zmienna(ctrl.Consequent, self.baza['wyjscie'].get('nazwa', 'ryzyko'), self.baza['wyjscie'])
+        self.poziomy = list(self.ryzyko.terms)
+        self.lamane = [lamana(self.ryzyko.universe, self.ryzyko[poziom].mf) for poziom in self.poziomy]
+        self.zalamania = _punkty_zalaman(self.lamane)
+        """
+            Description:
+                Ustalanie reguł rozmytych, które definiują, jak poziomy zmiennych wejściowych
+                wpływają na poziom ryzyka.
+        """
+        self._kompiluj_reguly()
+        self.reguly = [
+            ctrl.Rule(functools.reduce(OPERATORY[regula.get('operator', 'or')],
+                                       [self.zmienne[zmienna][termin] for zmienna, termin in regula['jezeli']]),
+                      self.ryzyko[regula['to']])
+            for regula in self.baza['reguly']
+        ]
+        """
+            Description:
+                System kontrolny zdefiniowany wcześniej regułami jest tworzony przy pierwszym użyciu ryzyko_sim.
+        """
+        self.ryzyko_ctrl = None
+        self._ryzyko_sim = None
+
+    @property
+    def ryzyko_sim(self):
+        """
+            Description:
+                ControlSystem i ControlSystemSimulation z skfuzzy są potrzebne tylko w ocen() i w wykresie
+                ryzyko.view(sim=...). Czas budowy ControlSystem szybko rośnie z liczbą reguł (dla 300 reguł
+                ponad minutę), więc są tworzone raz, przy pierwszym użyciu, a obliczenia wektorowe z nich
+                nie korzystają. Symulacja jest używana ponownie przy każdej ocenie.
+
+            Zwraca:
+                skfuzzy.control.ControlSystemSimulation: Symulacja systemu rozmytego.
+        """
+        if self._ryzyko_sim is None:
+            self.ryzyko_ctrl = ctrl.ControlSystem(self.reguly)
+            self._ryzyko_sim = ctrl.ControlSystemSimulation(self.ryzyko_ctrl)
+        return self._ryzyko_sim
+
+    def _kompiluj_reguly(self):
+        """
+            Description:
+                Kompilacja reguł do postaci macierzowej:
+                    kolumny - pary (zmienna, termin) w kolejności kolumn macierzy przynależności; za nimi są
+                              dwie kolumny stałe: zer (element neutralny max) i jedynek (element neutralny min),
+                    indeksy_regul - macierz (reguły x najdłuższa lista przesłanek) z indeksami kolumn; krótsze
+                              reguły są uzupełnione kolumną neutralną dla swojego operatora,
+                    czy_and - maska reguł z operatorem AND,
+                    kolejnosc_regul, poczatki_poziomow, poziomy_z_regulami - reguły posortowane według
+                              poziomu ryzyka, do łączenia sił reguł tego samego poziomu przez np.maximum.reduceat,
+                    granice - dla każdej zmiennej posortowane końce nośników jej terminów (z końcami uniwersum),
+                    terminy_przedzialow - dla każdej zmiennej maska (przedziały x terminy) terminów, które mogą
+                              mieć niezerową przynależność w przedziale.
+        """
+        self.kolumny = [(nazwa, termin) for nazwa, zmienna in self.zmienne.items() for termin in zmienna.terms]
+        indeks = {kolumna: i for i, kolumna in enumerate(self.kolumny)}
+        zera, jedynki = len(self.kolumny), len(self.kolumny) + 1
+        reguly = self.baza['reguly']
+        if not reguly:
+            raise ValueError("Baza reguł nie zawiera żadnej reguły.")
+
+        self.indeksy_regul = np.empty((len(reguly), max(len(regula['jezeli']) for regula in reguly)), dtype=np.intp)
+        self.czy_and = np.zeros(len(reguly), dtype=bool)
+        poziomy = np.empty(len(reguly), dtype=np.intp)
+        for r, regula in enumerate(reguly):
+            operator_reguly = regula.get('operator', 'or')
+            if operator_reguly not in OPERATORY:
+                raise ValueError(f"Reguła {r}: nieznany operator {operator_reguly}. Dostępne: 'or', 'and'.")
+            if regula['to'] not in self.poziomy:
+                raise ValueError(f"Reguła {r}: nieznany poziom {regula['to']}. Dostępne: {', '.join(self.poziomy)}.")
+            self.czy_and[r] = operator_reguly == 'and'
+            self.indeksy_regul[r] = jedynki if self.czy_and[r] else zera
+            for a, (zmienna, termin) in enumerate(regula['jezeli']):
+                if (zmienna, termin) not in indeks:
+                    raise ValueError(f"Reguła {r}: nieznana przesłanka ({zmienna}, {termin}).")
+                self.indeksy_regul[r, a] = indeks[zmienna, termin]
+            poziomy[r] = self.poziomy.index(regula['to'])
+
+        self.poziomy_regul = poziomy
+        self.kolejnosc_regul = np.argsort(poziomy, kind='stable')
+        self.poziomy_z_regulami, self.poczatki_poziomow = np.unique(poziomy[self.kolejnosc_regul], return_index=True)
+
+        self.granice, self.terminy_przedzialow = [], []
+        for zmienna in self.zmienne.values():
+            nosniki = np.array([_nosnik(zmienna.universe, zmienna[termin].mf) for termin in zmienna.terms])
+            granice = np.unique(np.concatenate((nosniki.ravel(), zmienna.universe[[0, -1]])))
+            granice = granice[(granice >= zmienna.universe.min()) & (granice <= zmienna.universe.max())]
+            self.granice.append(granice)
+            self.terminy_przedzialow.append((nosniki[:, 0] < granice[1:, None]) & (nosniki[:, 1] > granice[:-1, None]))
+        self.reguly_komorek = {}
+
+    def ocen(self, *wartosci):
+        """
+            Description:
+                Ustawienie wartości wejściowych dla zmiennych rozmytych i wykonanie obliczeń w systemie rozmytym.
+
+            Parametry:
+                wartosci (float): Wartości zmiennych wejściowych w kolejności self.wejscia; dla domyślnej bazy:
+                    widocznosc_v (float): Widoczność od 0 (najgorsza) do 100 (najlepsza).
+                    intensywnosc_opadow_v (float): Intensywność opadów od 0 (brak) do 100 (intensywne opady).
+                    natezenie_ruchu_v (float): Natężenie ruchu od 0 (puste drogi) do 100 (duży ruch).
+
+            Zwraca:
+                float: Poziom ryzyka jazdy w zakresie od 0 do 100.
+        """
+        self._sprawdz(wartosci)
+        for nazwa, wartosc in zip(self.wejscia, wartosci):
+            self.ryzyko_sim.input[nazwa] = wartosc
+        self.ryzyko_sim.compute()
+        return self.ryzyko_sim.output[self.ryzyko.label]
+
+    def ocen_wsadowo(self, *wartosci, rozmiar_bloku=2048, metoda='probkowanie'):
+        """
+            Description:
+                Wektorowa ocena ryzyka dla tablic odczytów (np. 10^5 - 10^6 wierszy telemetrii), bez pętli
+                po wierszach w Pythonie. Obliczenia odpowiadają temu, co robi skfuzzy dla pojedynczej oceny:
+                    1. Rozmycie - przynależność każdej wartości do terminów [poor, average, good] przez interpolację
+                       liniową funkcji przynależności (np.interp), wartości spoza uniwersum są przycinane.
+                    2. Reguły - OR to maksimum, a AND minimum przynależności przesłanek (skompilowana macierz
+                       indeksy_regul); reguły z tym samym poziomem ryzyka łączy maksimum.
+                    3. Agregacja - każdy termin ryzyka obcięty do siły reguły (minimum), terminy łączy maksimum.
+                    4. Wyostrzanie metodą środka ciężkości.
+
+                Metoda 'probkowanie' liczy agregację w każdym z 1010 punktów uniwersum i całkuje dokładnie funkcję
+                liniową między kolejnymi punktami (te same wzory co skfuzzy.defuzzify.centroid). Agregacja ma
+                rozmiar (wiersze x 1010), dlatego wiersze są liczone blokami po rozmiar_bloku. W odróżnieniu
+                od skfuzzy uniwersum nie jest zagęszczane w punktach obcięcia, więc wynik może różnić się
+                od ocen() o setne części (w testach maksymalnie ok. 0.012).
+
+                Metoda 'analityczna' korzysta z tego, że terminy ryzyka są łamanymi (self.lamane). Agregacja
+                jest wtedy też łamaną, której załamania leżą tylko w wierzchołkach terminów, w punktach przecięcia
+                odcinków różnych terminów (stałe dla silnika) i w punktach, gdzie odcinek osiąga siłę reguły.
+                Wystarczy więc policzyć agregację w kilkudziesięciu takich punktach zamiast w 1010 i scałkować
+                ją dokładnie. Wynik jest dokładnym środkiem ciężkości (bez błędu próbkowania), a obliczenia
+                są kilkanaście razy szybsze. porownaj_wyostrzanie() sprawdza zgodność obu metod i skfuzzy.
+
+            Parametry:
+                wartosci (numpy.ndarray): Tablice wartości zmiennych wejściowych w kolejności self.wejscia
+                    (dla domyślnej bazy: widoczności, intensywności opadów, natężenia ruchu, 0 - 100).
+                rozmiar_bloku (int): Liczba wierszy liczonych naraz. Default: 2048.
+                metoda (str): 'probkowanie' albo 'analityczna'. Default: 'probkowanie'.
+
+            Zwraca:
+                numpy.ndarray: Poziomy ryzyka jazdy (0 - 100), jeden dla każdego wiersza. Gdy dla wiersza żadna
+                    reguła nie działa (możliwe np. przy regułach 'and'), agregacja ma pole 0 i wynikiem jest NaN -
+                    ocen() (skfuzzy) zgłasza w takim przypadku wyjątek.
+        """
+        sily = self.sily_regul(*wartosci, rozmiar_bloku=rozmiar_bloku)
+        if metoda == 'probkowanie':
+            return self._srodek_probkowany(sily, rozmiar_bloku)
+        if metoda == 'analityczna':
+            return self._srodek_analityczny(sily, rozmiar_bloku)
+        raise ValueError(f"Nieznana metoda wyostrzania: {metoda}. Dostępne: 'probkowanie', 'analityczna'.")
+
+    def _srodek_probkowany(self, sily, rozmiar_bloku):
+        """
+            Description:
+                Środek ciężkości agregacji policzonej w punktach uniwersum (metoda 'probkowanie').
+        """
+        uniwersum = self.ryzyko.universe
+        terminy = np.array([self.ryzyko[poziom].mf for poziom in self.poziomy])
+        x1, x2 = uniwersum[:-1], uniwersum[1:]
+        dx = x2 - x1
+        wagi1, wagi2 = dx * (2 * x1 + x2) / 6, dx * (x1 + 2 * x2) / 6
+
+        wynik = np.empty(len(sily))
+        for poczatek in range(0, len(sily), rozmiar_bloku):
+            blok = sily[poczatek:poczatek + rozmiar_bloku]
+            agregat = np.minimum(blok[:, 0, None], terminy[0])
+            for k in range(1, len(terminy)):
+                np.maximum(agregat, np.minimum(blok[:, k, None], terminy[k]), out=agregat)
+            y1, y2 = agregat[:, :-1], agregat[:, 1:]
+            pole = (y1 + y2) @ (dx / 2)
+            moment = y1 @ wagi1 + y2 @ wagi2
+            wynik[poczatek:poczatek + rozmiar_bloku] = _iloraz(moment, pole)
+        return wynik
+
+    def _srodek_analityczny(self, sily, rozmiar_bloku):
+        """
+            Description:
+                Dokładny środek ciężkości agregacji łamanych (metoda 'analityczna'). Dla każdego wiersza punkty
+                załamania to stałe punkty silnika oraz przecięcia każdego pochyłego odcinka z poziomem siły
+                każdej reguły. Punkty przecięcia leżące poza swoim odcinkiem nie są odrzucane - po przycięciu
+                do uniwersum są tylko dodatkowymi punktami podziału, co nie zmienia wyniku.
+        """
+        uniwersum = self.ryzyko.universe
+        poczatek_u, koniec_u = uniwersum[0], uniwersum[-1]
+        stale, odcinki = self.zalamania
+        x1, y1, nachylenie = odcinki
+
+        wynik = np.empty(len(sily))
+        for poczatek in range(0, len(sily), rozmiar_bloku):
+            blok = sily[poczatek:poczatek + rozmiar_bloku]
+            przeciecia = x1 + (blok[:, :, None] - y1) / nachylenie
+            punkty = np.concatenate((np.broadcast_to(stale, (len(blok), len(stale))),
+                                     przeciecia.reshape(len(blok), -1)), axis=1)
+            punkty = np.sort(np.clip(punkty, poczatek_u, koniec_u), axis=1)
+
+            agregat = np.minimum(blok[:, 0, None], np.interp(punkty, *self.lamane[0]))
+            for k in range(1, len(self.lamane)):
+                np.maximum(agregat, np.minimum(blok[:, k, None], np.interp(punkty, *self.lamane[k])), out=agregat)
+            xa, xb = punkty[:, :-1], punkty[:, 1:]
+            ya, yb = agregat[:, :-1], agregat[:, 1:]
+            dx = xb - xa
+            pole = np.sum(dx * (ya + yb), axis=1) / 2
+            moment = np.sum(dx * (ya * (2 * xa + xb) + yb * (xa + 2 * xb)), axis=1) / 6
+            wynik[poczatek:poczatek + rozmiar_bloku] = _iloraz(moment, pole)
+        return wynik
+
+    def porownaj_wyostrzanie(self, liczba_probek=100000, liczba_probek_skfuzzy=200, ziarno=0):
+        """
+            Description:
+                Sprawdzenie zgodności metody 'analityczna' z metodą 'probkowanie' oraz z ocen() (skfuzzy)
+                na losowych punktach z [0, 100]^3. ocen() jest wolne, dlatego porównanie z nim używa tylko
+                pierwszych liczba_probek_skfuzzy punktów.
+
+            Parametry:
+                liczba_probek (int): Liczba losowych punktów. Default: 100000.
+                liczba_probek_skfuzzy (int): Liczba punktów porównywanych z ocen(). Default: 200.
+                ziarno (int): Ziarno generatora liczb losowych. Default: 0.
+
+            Zwraca:
+                dict: probkowanie (największa różnica względem metody 'probkowanie'), skfuzzy (największa różnica
+                    względem ocen()), punkt (wejście z największą różnicą względem metody 'probkowanie').
+        """
+        punkty = np.random.default_rng(ziarno).uniform(0, 100, (3, liczba_probek))
+        analityczna = self.ocen_wsadowo(*punkty, metoda='analityczna')
+        roznica = np.abs(analityczna - self.ocen_wsadowo(*punkty, metoda='probkowanie'))
+        skfuzzy = [self.ocen(*punkt) for punkt in punkty[:, :liczba_probek_skfuzzy].T]
+        return {
+            'probkowanie': float(roznica.max()),
+            'skfuzzy': float(np.abs(analityczna[:liczba_probek_skfuzzy] - skfuzzy).max()),
+            'punkt': punkty[:, roznica.argmax()].tolist(),
+        }
+
+    def sily_regul(self, *wartosci, rozmiar_bloku=2048):
+        """
+            Description:
+                Wektorowe rozmycie wejść i obliczenie siły każdego poziomu ryzyka (kroki 1 i 2 z ocen_wsadowo).
+                Reguły z tym samym poziomem ryzyka łączy maksimum (np.maximum.reduceat po regułach posortowanych
+                według poziomu); poziom bez żadnej reguły ma siłę 0.
+
+            Zwraca:
+                numpy.ndarray: Tablica (wiersze x poziomy ryzyka) z siłą reguł dla poziomów z self.poziomy.
+        """
+        wartosci = self._sprawdz(wartosci)
+        sily = np.zeros((len(wartosci[0]), len(self.poziomy)))
+        if self.rzadkie:
+            rozmiar_bloku = max(rozmiar_bloku, BLOK_RZADKI)
+        for poczatek in range(0, len(sily), rozmiar_bloku):
+            blok = [wartosc[poczatek:poczatek + rozmiar_bloku] for wartosc in wartosci]
+            if self.rzadkie:
+                sily[poczatek:poczatek + rozmiar_bloku] = self._sily_rzadkie(blok)
+            else:
+                aktywacje = self._aktywacje(blok)
+                sily[poczatek:poczatek + rozmiar_bloku, self.poziomy_z_regulami] = np.maximum.reduceat(
+                    aktywacje[:, self.kolejnosc_regul], self.poczatki_poziomow, axis=1)
+        return sily
+
+    def _sily_rzadkie(self, wartosci):
+        """
+            Description:
+                Siły poziomów dla bloku wierszy w trybie rzadkim: numer komórki każdego wiersza (przedziały
+                wszystkich zmiennych, np.searchsorted w granicach), sortowanie wierszy według komórek i ocena
+                w każdej komórce tylko jej reguł. Reguły pominięte w komórce mają tam siłę 0, więc wynik jest
+                taki sam jak przy ocenie wszystkich reguł.
+
+            Zwraca:
+                numpy.ndarray: Tablica (wiersze x poziomy ryzyka).
+        """
+        macierz = self._macierz_przynaleznosci(wartosci)
+        komorki = np.zeros(len(macierz), dtype=np.int64)
+        for wartosc, granice in zip(wartosci, self.granice):
+            przedzialy = np.clip(np.searchsorted(granice, wartosc, side='right') - 1, 0, len(granice) - 2)
+            komorki = komorki * (len(granice) - 1) + przedzialy
+        kolejnosc = np.argsort(komorki, kind='stable')
+        numery, poczatki = np.unique(komorki[kolejnosc], return_index=True)
+
+        sily = np.zeros((len(macierz), len(self.poziomy)))
+        for numer, poczatek, koniec in zip(numery.tolist(), poczatki.tolist(), np.append(poczatki[1:], len(komorki)).tolist()):
+            reguly, czy_and, poziomy, poczatki_poziomow = self._reguly_komorki(numer)
+            if not len(reguly):
+                continue
+            wiersze = kolejnosc[poczatek:koniec]
+            przeslanki = macierz[wiersze][:, self.indeksy_regul[reguly]]
+            aktywacje = przeslanki.max(axis=2)
+            if czy_and.any():
+                aktywacje[:, czy_and] = przeslanki[:, czy_and].min(axis=2)
+            sily[np.ix_(wiersze, poziomy)] = np.maximum.reduceat(aktywacje, poczatki_poziomow, axis=1)
+        return sily
+
+    def _reguly_komorki(self, numer):
+        """
+            Description:
+                Reguły, które mogą zadziałać w komórce: OR - co najmniej jedna przesłanka ma w komórce niezerową
+                przynależność, AND - wszystkie przesłanki. Kolumna zer (dopełnienie OR) jest zawsze nieaktywna,
+                kolumna jedynek (dopełnienie AND) zawsze aktywna. Wynik jest zapamiętywany dla numeru komórki.
+
+            Zwraca:
+                tuple: (reguły posortowane według poziomu, maska AND, poziomy z regułami, początki poziomów).
+        """
+        if numer not in self.reguly_komorek:
+            przedzialy = np.unravel_index(numer, [len(granice) - 1 for granice in self.granice])
+            aktywne = np.concatenate([terminy[przedzial] for terminy, przedzial in zip(self.terminy_przedzialow, przedzialy)]
+                                     + [[False, True]])
+            przeslanki = aktywne[self.indeksy_regul]
+            reguly = self.kolejnosc_regul[np.where(self.czy_and, przeslanki.all(axis=1), przeslanki.any(axis=1))[self.kolejnosc_regul]]
+            poziomy, poczatki = np.unique(self.poziomy_regul[reguly], return_index=True)
+            self.reguly_komorek[numer] = (reguly, self.czy_and[reguly], poziomy, poczatki)
+        return self.reguly_komorek[numer]
+
+    def aktywacje_regul(self, *wartosci):
+        """
+            Zwraca:
+                numpy.ndarray: Tablica (wiersze x reguły) z siłą zadziałania każdej reguły z bazy reguł
+                    (maksimum albo minimum przynależności jej przesłanek).
+        """
+        return self._aktywacje(self._sprawdz(wartosci))
+
+    def przynaleznosci(self, *wartosci):
+        """
+            Zwraca:
+                dict: (zmienna, termin) -> numpy.ndarray z przynależnością dla każdego wiersza.
+        """
+        macierz = self._macierz_przynaleznosci(self._sprawdz(wartosci))
+        return {kolumna: macierz[:, i] for i, kolumna in enumerate(self.kolumny)}
+
+    def _sprawdz(self, wartosci):
+        """
+            Description:
+                Zamienia wartości wejściowe na jednowymiarowe tablice float64 i sprawdza ich liczbę.
+        """
+        if len(wartosci) != len(self.wejscia):
+            raise ValueError(f"Oczekiwano {len(self.wejscia)} wartości wejściowych ({', '.join(self.wejscia)}), "
+                             f"podano {len(wartosci)}.")
+        return [np.asarray(wartosc, dtype=np.float64).ravel() for wartosc in wartosci]
+
+    def _macierz_przynaleznosci(self, wartosci):
+        """
+            Description:
+                Rozmycie wejść: przynależność każdej wartości do każdego terminu zmiennych wejściowych
+                (np.interp), wartości spoza uniwersum są przycinane, tak jak w skfuzzy.
+
+            Zwraca:
+                numpy.ndarray: Macierz (wiersze x kolumny z self.kolumny + kolumna zer + kolumna jedynek).
+        """
+        macierz = np.empty((len(wartosci[0]), len(self.kolumny) + 2))
+        i = 0
+        for wartosc, zmienna in zip(wartosci, self.zmienne.values()):
+            x = np.clip(wartosc, zmienna.universe.min(), zmienna.universe.max())
+            for termin in zmienna.terms:
+                macierz[:, i] = np.interp(x, zmienna.universe, zmienna[termin].mf)
+                i += 1
+        macierz[:, -2] = 0
+        macierz[:, -1] = 1
+        return macierz
+
+    def _aktywacje(self, wartosci):
+        """
+            Description:
+                Siły wszystkich reguł: pobranie kolumn indeksy_regul z macierzy przynależności daje tablicę
+                (wiersze x reguły x przesłanki), którą redukuje max (OR) albo min (AND).
+        """
+        przeslanki = self._macierz_przynaleznosci(wartosci)[:, self.indeksy_regul]
+        aktywacje = przeslanki.max(axis=2)
+        if self.czy_and.any():
+            aktywacje[:, self.czy_and] = przeslanki[:, self.czy_and].min(axis=2)
+        return aktywacje
+
+    def diagnozuj(self, *wartosci):
+        """
+            Description:
+                Ocena jednego odczytu razem z danymi pośrednimi wnioskowania, bez rysowania i wypisywania.
+                Ryzyko jest liczone metodą 'analityczna' z ocen_wsadowo, agregacja jest podana w punktach
+                uniwersum zmiennej ryzyko (do wykresu albo zapisu).
+
+            Parametry:
+                wartosci (float): Wartości zmiennych wejściowych w kolejności self.wejscia.
+
+            Zwraca:
+                dict:
+                    ryzyko (float) - poziom ryzyka jazdy (0 - 100),
+                    przynaleznosci (dict) - zmienna -> {termin: przynależność},
+                    aktywacje (list) - siła zadziałania każdej reguły z bazy reguł,
+                    sily (dict) - poziom ryzyka -> siła (maksimum aktywacji reguł z tym poziomem),
+                    uniwersum, agregacja (numpy.ndarray) - zagregowana funkcja przynależności ryzyka.
+        """
+        przynaleznosc = self.przynaleznosci(*wartosci)
+        sily = self.sily_regul(*wartosci)[0]
+        agregat = np.max([np.minimum(sila, self.ryzyko[poziom].mf) for sila, poziom in zip(sily, self.poziomy)], axis=0)
+        return {
+            'ryzyko': float(self._srodek_analityczny(sily[None, :], 1)[0]),
+            'przynaleznosci': {nazwa: {termin: float(przynaleznosc[nazwa, termin][0]) for termin in zmienna.terms}
+                               for nazwa, zmienna in self.zmienne.items()},
+            'aktywacje': self.aktywacje_regul(*wartosci)[0].tolist(),
+            'sily': dict(zip(self.poziomy, sily.tolist())),
+            'uniwersum': self.ryzyko.universe,
+            'agregacja': agregat,
+        }
+
+    def rysuj(self, diagnostyka, sciezka, figsize=(8, 4), dpi=100):
+        """
+            Description:
+                Rysuje wykres podobny do ryzyko.view(sim=...): terminy ryzyka, zagregowaną funkcję przynależności
+                i wynik. Rysowanie odbywa się na płótnie Agg bez pyplot, więc nie wymaga okna ani interaktywnego
+                backendu i może działać w usłudze.
+
+            Parametry:
+                diagnostyka (dict): Wynik diagnozuj().
+                sciezka (str): Plik wynikowy (PNG, SVG, PDF - według rozszerzenia).
+                figsize (tuple): Rozmiar wykresu w calach. Default: (8, 4).
+                dpi (int): Rozdzielczość dla formatów rastrowych. Default: 100.
+
+            Zwraca:
+                matplotlib.figure.Figure: Narysowany wykres.
+        """
+        figure = Figure(figsize=figsize)
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        uniwersum = diagnostyka['uniwersum']
+        for poziom in self.poziomy:
+            axes.plot(uniwersum, self.ryzyko[poziom].mf, linewidth=1.5, label=poziom)
+        axes.fill_between(uniwersum, 0, diagnostyka['agregacja'], facecolor='Orange', alpha=0.7)
+        axes.axvline(diagnostyka['ryzyko'], color='black', linewidth=3)
+        axes.set_ylim(0, 1.01)
+        axes.set_xlabel(self.ryzyko.label)
+        axes.set_ylabel('Przynależność')
+        axes.set_title(f"Ryzyko jazdy: {diagnostyka['ryzyko']:.2f}")
+        axes.legend(loc='upper right')
+        figure.savefig(sciezka, dpi=dpi)
+        return figure
+
+
+def _iloraz(moment, pole):
+    """
+        Description:
+            Środek ciężkości moment / pole, NaN (bez ostrzeżenia o dzieleniu przez zero) dla wierszy z polem 0,
+            czyli bez żadnej działającej reguły.
+    """
+    return np.divide(moment, pole, out=np.full(len(pole), np.nan), where=pole > 0)
+
+
+def lamana(uniwersum, mf):
+    """
+        Description:
+            Zamienia funkcję przynależności zapisaną w punktach uniwersum na łamaną: zostają tylko końce uniwersum
+            i punkty, w których zmienia się nachylenie. Dla funkcji odcinkami liniowych (trimf, trapmf) łamana
+            opisuje dokładnie tę samą funkcję, którą skfuzzy interpoluje między punktami uniwersum.
+
+        Parametry:
+            uniwersum (numpy.ndarray): Punkty uniwersum zmiennej.
+            mf (numpy.ndarray): Wartości funkcji przynależności w tych punktach.
+
+        Zwraca:
+            tuple: (x, y) - wierzchołki łamanej.
+    """
+    nachylenie = np.diff(mf) / np.diff(uniwersum)
+    zalamania = np.flatnonzero(np.abs(np.diff(nachylenie)) > 1e-6) + 1
+    indeksy = np.concatenate(([0], zalamania, [len(uniwersum) - 1]))
+    return uniwersum[indeksy], mf[indeksy]
+
+
+def _punkty_zalaman(lamane):
+    """
+        Description:
+            Punkty załamania agregacji niezależne od sił reguł: wierzchołki wszystkich łamanych oraz przecięcia
+            odcinków różnych łamanych. Dodatkowo pochyłe odcinki (x1, y1, nachylenie), których przecięcia
+            z poziomami sił reguł zależą od wiersza.
+
+        Zwraca:
+            tuple: (stałe punkty, (x1, y1, nachylenie)).
+    """
+    odcinki = [(k, x[i], y[i], x[i + 1], y[i + 1]) for k, (x, y) in enumerate(lamane) for i in range(len(x) - 1)]
+    stale = [x for x, _ in lamane]
+    for i, (k, ax1, ay1, ax2, ay2) in enumerate(odcinki):
+        for l, bx1, by1, bx2, by2 in odcinki[i + 1:]:
+            na = (ay2 - ay1) / (ax2 - ax1)
+            nb = (by2 - by1) / (bx2 - bx1)
+            if k == l or na == nb:
+                continue
+            x = (by1 - ay1 + na * ax1 - nb * bx1) / (na - nb)
+            if max(ax1, bx1) < x < min(ax2, bx2):
+                stale.append([x])
+    pochyle = np.array([(x1, y1, (y2 - y1) / (x2 - x1)) for _, x1, y1, x2, y2 in odcinki if y1 != y2]).T
+    return np.unique(np.concatenate(stale)), tuple(pochyle[:, None, :])
+
+
+def _nosnik(uniwersum, mf):
+    """
+        Description:
+            Przedział, poza którym funkcja przynależności (interpolowana liniowo między punktami uniwersum)
+            jest równa 0: od punktu przed pierwszą niezerową próbką do punktu po ostatniej.
+
+        Zwraca:
+            tuple: (początek, koniec) nośnika; pusty przedział (inf, -inf) dla funkcji równej 0.
+    """
+    niezerowe = np.flatnonzero(mf > 0)
+    if not len(niezerowe):
+        return np.inf, -np.inf
+    return uniwersum[max(niezerowe[0] - 1, 0)], uniwersum[min(niezerowe[-1] + 1, len(uniwersum) - 1)]
+
+
+_silnik = None
+
+
+def pobierz_silnik():
+    """
+        Description:
+            Zwraca wspólny dla modułu SilnikRyzyka, tworząc go przy pierwszym wywołaniu.
+
+        Zwraca:
+            SilnikRyzyka: Zbudowany silnik oceny ryzyka.
+    """
+    global _silnik
+    if _silnik is None:
+        _silnik = SilnikRyzyka()
+    return _silnik
+
+
+def ocena_ryzyka_jazdy(widocznosc_v, intensywnosc_opadow_v, natezenie_ruchu_v, pokaz=False, plik=None):
     """
         Autorzy:
             Kamil Powierza
@@ -22,6 +684,9 @@ def ocena_ryzyka_jazdy(widocznosc_v, intensywnosc_opadow_v, natezenie_ruchu_v):
 
         Description:
             Ocena ryzyka jazdy na podstawie widoczności, intensywności opadów i natężenia ruchu.
+            Obliczenia wykonuje wspólny SilnikRyzyka (pobierz_silnik()), zbudowany tylko raz.
+            Domyślnie funkcja tylko liczy ryzyko - wykres i wypisanie wyniku są włączane parametrami,
+            a dane pośrednie (aktywacje reguł, agregacja) zwraca SilnikRyzyka.diagnozuj().
 
         Parametry:
             widocznosc (float): Wartość widoczności w zakresie od 0 do 100.
@@ -33,68 +698,27 @@ def ocena_ryzyka_jazdy(widocznosc_v, intensywnosc_opadow_v, natezenie_ruchu_v):
             natezenie_ruchu (float): Wartość natężenia ruchu w zakresie od 0 do 100.
                 0 - Brak natężenia ruchu, puste drogi.
                 100 - Duże natężenie ruchu, wiele aut na drodze.
+            pokaz (bool): Wykres w oknie (ryzyko.view, plt.show) i wypisanie wyniku. Default: False.
+            plik (str): Plik, do którego zostanie zapisany wykres (backend Agg, bez okna). Default: None.
 
         Zwraca:
             float: Poziom ryzyka jazdy w zakresie od 0 do 100.
                 0 - Małe ryzyko wypadku.
                 100 - Duże ryzyko wypadku.
     """
+    silnik = pobierz_silnik()
+    wynik = silnik.ocen(widocznosc_v, intensywnosc_opadow_v, natezenie_ruchu_v)
     """
         Description:
-            Tworzenie zmiennych rozmytych [Antecedents] oraz zmiennej wyjściowej [Consequent] 
-            dla systemu rozmytego, które będą wykorzystywane w ocenie ryzyka.
-    """
-    widocznosc = ctrl.Antecedent(np.arange(0, 101, 0.1), 'widocznosc')
-    intensywnosc_opadow = ctrl.Antecedent(np.arange(0, 101, 0.1), 'intensywnosc_opadow')
-    natezenie_ruchu = ctrl.Antecedent(np.arange(0, 101, 0.1), 'natezenie_ruchu')
-    ryzyko = ctrl.Consequent(np.arange(0, 101, 0.1), 'ryzyko')
-    """
-        Description:
-            Użycie funkcji automf do automatycznego przypisania trzech funkcji przynależności 
-            [poor, average, good] dla zmiennych wejściowych.
-    """
-    intensywnosc_opadow.automf(3)
-    widocznosc.automf(3)
-    natezenie_ruchu.automf(3)
-    """
-        Description:
-            Tworzenie funkcji przynależności dla zmiennej wyjściowej 'ryzyko' 
-            przy użyciu funkcji trójkątnej (trimf) dla trzech poziomów ryzyka: niski, średni, wysoki.
+            Opcjonalny zapis wykresu do pliku oraz wyświetlenie wykresu i wyniku.
     """
-    ryzyko['poor'] = fuzz.trimf(ryzyko.universe, [0, 0, 50])
-    ryzyko['average'] = fuzz.trimf(ryzyko.universe, [0, 50, 100])
-    ryzyko['good'] = fuzz.trimf(ryzyko.universe, [50, 100, 100])
-    """
-        Description:
-            Ustalanie reguł rozmytych, które definiują, jak poziomy zmiennych wejściowych 
-            wpływają na poziom ryzyka. 
-    """
-    rule1 = ctrl.Rule(widocznosc['good'] | intensywnosc_opadow['poor'] | natezenie_ruchu['poor'], ryzyko['poor'])
-    rule2 = ctrl.Rule(widocznosc['average'] | intensywnosc_opadow['average'] | natezenie_ruchu['average'], ryzyko['average'])
-    rule3 = ctrl.Rule(widocznosc['poor'] | intensywnosc_opadow['good'] | natezenie_ruchu['good'], ryzyko['good'])
-    """
-        Description:
-            Inicjalizacja systemu kontrolnego zdefiniowanego wcześniej regułami.
-    """
-    ryzyko_ctrl = ctrl.ControlSystem([rule1, rule2, rule3])
-    ryzyko_sim = ctrl.ControlSystemSimulation(ryzyko_ctrl)
-    """
-        Description:
-            Ustawienie wartości wejściowych dla zmiennych rozmytych na podstawie przekazanych 
-            parametrów funkcji.
-    """
-    ryzyko_sim.input['widocznosc'] = widocznosc_v
-    ryzyko_sim.input['intensywnosc_opadow'] = intensywnosc_opadow_v
-    ryzyko_sim.input['natezenie_ruchu'] = natezenie_ruchu_v
-    """
-        Description:
-            Wykonanie obliczeń w systemie rozmytym, wyświetlenie wyniku oraz wizualizacja wyników.
-    """
-    ryzyko_sim.compute()
-    ryzyko.view(sim=ryzyko_sim)
-    plt.show()
+    if plik is not None:
+        silnik.rysuj(silnik.diagnozuj(widocznosc_v, intensywnosc_opadow_v, natezenie_ruchu_v), plik)
+    if pokaz:
+        silnik.ryzyko.view(sim=silnik.ryzyko_sim)
+        plt.show()
 
-    print(f"Wynik ryzyka jazdy: {ryzyko_sim.output['ryzyko']:.2f}")
+        print(f"Wynik ryzyka jazdy: {wynik:.2f}")
     """
         Zwraca:
             float: Obliczona wartość ryzyka jazdy w zakresie od 0 do 100, na podstawie
@@ -102,19 +726,29 @@ def ocena_ryzyka_jazdy(widocznosc_v, intensywnosc_opadow_v, natezenie_ruchu_v):
                 0 - Bardzo niskie ryzyko.
                 100 - Bardzo wysokie ryzyko.
     """
-    return ryzyko_sim.output['ryzyko']
+    return wynik
 
-def animacja_car(widocznosc, intensywnosc_opadow, natezenie_ruchu):
+def animacja_car(widocznosc, intensywnosc_opadow, natezenie_ruchu, katalog_klatek=None, fps=60):
     """
         Description:
             Funkcja animuje przejazd samochodu na podstawie oceny ryzyka jazdy.
+            Tło (trawa, droga, nagłówek, granice okna) jest rysowane raz na osobnej powierzchni, a w każdej klatce
+            odświeżany jest tylko prostokąt, który zajmował samochód w poprzedniej klatce, i prostokąt, który
+            zajmuje teraz (pygame.display.update z listą prostokątów zamiast flip całego ekranu).
+
+            Z katalogiem klatek animacja działa bez okna (sterownik SDL "dummy"), bez wykresu ryzyka i bez
+            czekania na zegar: czas animacji to numer klatki / fps, a każda klatka jest zapisywana jako PNG.
+            Z klatek można złożyć film, np. ffmpeg -framerate 60 -i klatka_%05d.png przejazd.mp4.
 
         Parametry:
             widocznosc (float): Wartość widoczności.
             intensywnosc_opadow (float): Wartość intensywności opadów.
             natezenie_ruchu (float): Wartość natężenia ruchu.
+            katalog_klatek (str): Katalog, do którego zapisywane są klatki. Default: None (animacja w oknie).
+            fps (int): Liczba klatek na sekundę. Default: 60.
     """
-    ryzyko = ocena_ryzyka_jazdy(widocznosc, intensywnosc_opadow, natezenie_ruchu)
+    bez_okna = katalog_klatek is not None
+    ryzyko = ocena_ryzyka_jazdy(widocznosc, intensywnosc_opadow, natezenie_ruchu, pokaz=not bez_okna)
     """
         Description:
             Ustalenie czasu przejazdu oraz koloru samochodu w zależności od poziomu ryzyka:
@@ -136,11 +770,47 @@ def animacja_car(widocznosc, intensywnosc_opadow, natezenie_ruchu):
             Funkcja inicjalizuje Pygame, ustawia rozmiar okna na 860x150 pikseli,
             ustawia tytuł okna na 'Animacja samochodu' oraz tworzy obiekt zegara,
             który będzie kontrolował liczbę klatek na sekundę w animacji.
-    """
-    pygame.init()
-    screen = pygame.display.set_mode((860, 150))
+            Bez okna przed inicjalizacją wybierany jest sterownik SDL "dummy". SDL odczytuje go tylko przy
+            tworzeniu ekranu, więc zaraz potem zmienna środowiskowa wraca do poprzedniej wartości i późniejsze
+            użycie pygame w tym samym procesie ma zwykły ekran.
+    """
+    if bez_okna:
+        poprzedni_sterownik = os.environ.get('SDL_VIDEODRIVER')
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.makedirs(katalog_klatek, exist_ok=True)
+    try:
+        pygame.init()
+        screen = pygame.display.set_mode((860, 150))
+    finally:
+        if bez_okna:
+            if poprzedni_sterownik is None:
+                del os.environ['SDL_VIDEODRIVER']
+            else:
+                os.environ['SDL_VIDEODRIVER'] = poprzedni_sterownik
     pygame.display.set_caption('Animacja samochodu')
     clock = pygame.time.Clock()
+    """
+        Description:
+            Tło rysowane raz: wypełnienie kolorem zielonym, szary prostokąt drogi, nagłówek z informacją
+            o czasie przejazdu (czcionka i tekst renderowane tylko raz) oraz granice po bokach ekranu.
+            Tło jest kopiowane na ekran w całości tylko raz, przed pętlą animacji.
+    """
+    tlo = pygame.Surface(screen.get_size()).convert()
+    tlo.fill((41, 138, 64))
+
+    pygame.draw.rect(tlo, (128, 128, 128), (0, 80, 860, 30))
+
+    font = pygame.font.SysFont('Arial', 20)
+    naglowek_text = f'Samochód przejechał dystans w {czas_przejazdu / 1000} sekund. Ryzyko wyniosło: {round(ryzyko, 2)}'
+    naglowek_surface = font.render(naglowek_text, True, (0, 0, 0))
+    naglowek_rect = naglowek_surface.get_rect(center=(425, 20))
+    tlo.blit(naglowek_surface, naglowek_rect)
+
+    pygame.draw.line(tlo, (0, 0, 0), (0, 0), (0, 150), 5)
+    pygame.draw.line(tlo, (0, 0, 0), (860, 0), (860, 150), 5)
+
+    screen.blit(tlo, (0, 0))
+    pygame.display.flip()
     """
         Description:
             Ustala położenie samochodu oraz jego wymiary, w tym szerokość i wysokość
@@ -152,17 +822,21 @@ def animacja_car(widocznosc, intensywnosc_opadow, natezenie_ruchu):
             car_width (int): Szerokość samochodu w pikselach.
             car_height (int): Wysokość samochodu w pikselach.
             wheel_radius (int): Promień kół samochodu w pikselach.            
+            car_rect (pygame.Rect): Prostokąt zajmowany przez samochód w poprzedniej klatce (None przed pierwszą).
+            narysowany_x (int): Położenie, w którym samochód był ostatnio narysowany.
     """
     car_x = 0
     car_width = 60
     car_height = 30
     wheel_radius = 8
+    car_rect = None
+    narysowany_x = None
     """
         Description:
             Pętla animacyjna, która jest odpowiedzialna za rysowanie samochodu na ekranie oraz 
             aktualizowanie jego stanu w czasie rzeczywistym. Oblicza czas animacji, 
             monitorując, jak długo samochód przemieszcza się na osi X, 
-            aż osiągnie określoną pozycję (800 pikseli).
+            aż osiągnie określoną pozycję (800 pikseli). Bez okna pętla kończy się po czasie przejazdu.
 
         Zawartość:
             - Inicjalizacja zmiennej `start_ticks` do śledzenia czasu rozpoczęcia animacji.
@@ -174,6 +848,7 @@ def animacja_car(widocznosc, intensywnosc_opadow, natezenie_ruchu):
             animację w czasie rzeczywistym.
     """
     start_ticks = pygame.time.get_ticks()
+    klatka = 0
     while car_x < 800:
         """
             Description:
@@ -190,54 +865,56 @@ def animacja_car(widocznosc, intensywnosc_opadow, natezenie_ruchu):
                 Oblicza czas, jaki upłynął od rozpoczęcia animacji, i na jego podstawie aktualizuje
                 położenie samochodu na osi x. Umożliwia to płynne przesuwanie 
                 samochodu wzdłuż ekranu w czasie rzeczywistym.
+                Bez okna czas wynika z numeru klatki, a ostatnia klatka pokazuje samochód na końcu drogi.
         """
-        elapsed_time = pygame.time.get_ticks() - start_ticks
-        if elapsed_time < czas_przejazdu:
-            car_x = (elapsed_time / czas_przejazdu) * 800
+        if bez_okna:
+            elapsed_time = klatka * 1000 / fps
+            car_x = min(elapsed_time / czas_przejazdu, 1) * 800
+        else:
+            elapsed_time = pygame.time.get_ticks() - start_ticks
+            if elapsed_time < czas_przejazdu:
+                car_x = (elapsed_time / czas_przejazdu) * 800
         """
             Description:
-                Funkcja wypełnia tło kolorem, rysuje drogę, samochód oraz jego szczegóły.
-                Wyświetla także nagłówek z informacją o czasie przejazdu i rysuje granice okna.
-                Wszystkie elementy są dodawane do ekranu przy użyciu funkcji Pygame, co tworzy
-                animację ruchu samochodu.
+                Funkcja przywraca tło w miejscu, w którym samochód był w poprzedniej klatce,
+                rysuje samochód oraz jego szczegóły w nowym położeniu i odświeża tylko te dwa obszary.
+                Gdy samochód stoi (koniec trasy), ekran nie jest przerysowywany.
 
             Elementy:
-                - Wypełnienie ekranu tłem o kolorze zielonym.
-                - Rysowanie szarego prostokąta, symbolizującego drogę.
-                - Wyświetlanie tekstu informacyjnego o czasie przejazdu w górnej części ekranu.
-                - Rysowanie granicznych linii po bokach ekranu.
+                - Przywrócenie tła pod poprzednim położeniem samochodu.
                 - Rysowanie samochodu, jego kół, lamp oraz okien w zadanym położeniu.
+                - Odświeżenie prostokąta poprzedniego i obecnego położenia samochodu.
         """
-        screen.fill((41, 138, 64))
-
-        pygame.draw.rect(screen, (128, 128, 128), (0, 80, 860, 30))
-
-        font = pygame.font.SysFont('Arial', 20)
-        naglowek_text = f'Samochód przejechał dystans w {czas_przejazdu / 1000} sekund. Ryzyko wyniosło: {round(ryzyko, 2)}'
-        naglowek_surface = font.render(naglowek_text, True, (0, 0, 0))
-        naglowek_rect = naglowek_surface.get_rect(center=(425, 20))
-        screen.blit(naglowek_surface, naglowek_rect)
-
-        pygame.draw.line(screen, (0, 0, 0), (0, 0), (0, 150), 5)
-        pygame.draw.line(screen, (0, 0, 0), (860, 0), (860, 150), 5)
+        if int(car_x) != narysowany_x:
+            if car_rect is not None:
+                screen.blit(tlo, car_rect, car_rect)
 
-        pygame.draw.rect(screen, car_color, (car_x, 100 - car_height, car_width, car_height))
+            nowy_rect = pygame.draw.rect(screen, car_color, (car_x, 100 - car_height, car_width, car_height))
 
-        pygame.draw.circle(screen, (0, 0, 0), (int(car_x + 15), 100), wheel_radius)
-        pygame.draw.circle(screen, (0, 0, 0), (int(car_x + car_width - 14), 100), wheel_radius)
+            nowy_rect.union_ip(pygame.draw.circle(screen, (0, 0, 0), (int(car_x + 15), 100), wheel_radius))
+            nowy_rect.union_ip(pygame.draw.circle(screen, (0, 0, 0), (int(car_x + car_width - 14), 100), wheel_radius))
 
-        pygame.draw.rect(screen, (255, 255, 0), (car_x + car_width - 1, 105 - (car_height / 2), 5, 5))
+            nowy_rect.union_ip(pygame.draw.rect(screen, (255, 255, 0), (car_x + car_width - 1, 105 - (car_height / 2), 5, 5)))
 
-        pygame.draw.rect(screen, (0, 0, 255), (car_x + 35, 95 - (car_height / 1.5), 17, 12))
+            nowy_rect.union_ip(pygame.draw.rect(screen, (0, 0, 255), (car_x + 35, 95 - (car_height / 1.5), 17, 12)))
+            narysowany_x = int(car_x)
+            """
+                Description:
+                    Odświeża na ekranie tylko obszar poprzedniego i obecnego położenia samochodu
+                    (`pygame.display.update` z listą prostokątów).
+            """
+            pygame.display.update([car_rect, nowy_rect] if car_rect is not None else [nowy_rect])
+            car_rect = nowy_rect
         """
             Description:
-                Odświeża zawartość ekranu, aby wyświetlić nowe położenie i stan elementów
-                animacji. Używa funkcji `pygame.display.flip()`, aby zaktualizować ekran, 
-                a następnie `clock.tick(60)` do ograniczenia liczby klatek na sekundę do 60, 
-                co zapewnia płynność animacji.
+                W oknie `clock.tick(fps)` ogranicza liczbę klatek na sekundę, co zapewnia płynność animacji.
+                Bez okna klatka jest zapisywana do pliku, a pętla nie czeka na zegar.
         """
-        pygame.display.flip()
-        clock.tick(60)
+        if bez_okna:
+            pygame.image.save(screen, os.path.join(katalog_klatek, f'klatka_{klatka:05d}.png'))
+        else:
+            clock.tick(fps)
+        klatka += 1
     """
         Description:
             Wywołanie funkcji `pygame.quit()` kończy działanie Pygame i zwalnia wszystkie
@@ -0,0 +1,281 @@
+import argparse
+import contextlib
+import os
+import queue
+import select
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # komunikat pygame trafiłby na stdout razem z wynikami
+from fuzzy import SilnikRyzyka, pobierz_silnik, wczytaj_baze
+
+ROZMIAR_ODCZYTU = 1 << 16
+
+"""
+    MAKS_DLUGOSC_WIERSZA
+        Description:
+            Maksymalna długość wiersza w bajtach. Dłuższy wiersz (np. nadawca, który nie wysyła znaku nowej linii)
+            nie jest gromadzony w pamięci - daje jeden błędny wiersz ("nan"), a jego reszta do najbliższego znaku
+            nowej linii jest pomijana.
+"""
+MAKS_DLUGOSC_WIERSZA = 1 << 12
+ZA_DLUGI_WIERSZ = b'!'
+
+
+class StrumienRyzyka:
+    """
+        Autorzy:
+            Kamil Powierza
+            Dawid Feister
+
+        Wymagane biblioteki:
+            1. numpy
+
+        Description:
+            Ciągła ocena ryzyka dla strumienia odczytów z czujników drogowych (plik, stdin albo gniazdo).
+            Każdy wiersz wejścia to wartości zmiennych wejściowych silnika oddzielone przecinkami (dla domyślnej
+            bazy reguł "widocznosc,opady,ruch"), każdy wiersz wyjścia to ryzyko dla odpowiadającego mu odczytu
+            ("nan" dla wiersza, którego nie da się odczytać).
+
+            Wątek czytający zbiera wiersze w mikro-partie: partia jest wysyłana, gdy ma rozmiar_partii odczytów
+            albo gdy najstarszy odczyt czeka maks_opoznienie sekund. Partie trafiają do kolejki o ograniczonej
+            długości - gdy ocena nie nadąża, wątek czytający czeka na miejsce w kolejce i przestaje czytać
+            wejście, więc pamięć jest ograniczona, a nadawca (potok, gniazdo) jest spowalniany przez bufor
+            systemu operacyjnego. Partie ocenia jeden, zbudowany raz SilnikRyzyka metodą 'analityczna'.
+
+        Przykład:
+            statystyki = StrumienRyzyka().przetworz(sys.stdin.buffer, sys.stdout.buffer)
+    """
+
+    def __init__(self, silnik=None, rozmiar_partii=4096, maks_opoznienie=0.05, dlugosc_kolejki=8):
+        """
+            Parametry:
+                silnik (SilnikRyzyka): Silnik oceny ryzyka. Default: None (wspólny silnik z pobierz_silnik()).
+                rozmiar_partii (int): Maksymalna liczba odczytów w partii. Default: 4096.
+                maks_opoznienie (float): Maksymalny czas oczekiwania odczytu na skompletowanie partii
+                    w sekundach. Default: 0.05.
+                dlugosc_kolejki (int): Maksymalna liczba partii czekających na ocenę. Default: 8.
+        """
+        self.silnik = silnik if silnik is not None else pobierz_silnik()
+        self.rozmiar_partii = rozmiar_partii
+        self.maks_opoznienie = maks_opoznienie
+        self.dlugosc_kolejki = dlugosc_kolejki
+
+    def przetworz(self, wejscie, wyjscie):
+        """
+            Description:
+                Przetwarza strumień do końca wejścia.
+
+            Parametry:
+                wejscie (file | socket.socket): Źródło odczytów z metodą fileno() (plik binarny, sys.stdin.buffer,
+                    gniazdo).
+                wyjscie (file): Binarny strumień wyników.
+
+            Zwraca:
+                dict: Statystyki z Statystyki.podsumowanie().
+        """
+        kolejka = queue.Queue(maxsize=self.dlugosc_kolejki)
+        statystyki = Statystyki()
+        blad = []
+
+        def czytaj():
+            try:
+                for partia in self._partie(wejscie.fileno()):
+                    kolejka.put(partia)
+            except BaseException as wyjatek:
+                blad.append(wyjatek)
+            finally:
+                kolejka.put(None)
+
+        czytnik = threading.Thread(target=czytaj, daemon=True)
+        statystyki.start()
+        czytnik.start()
+        while True:
+            partia = kolejka.get()
+            if partia is None:
+                break
+            wiersze, nadejscie = partia
+            wartosci, poprawne = _parsuj(wiersze, len(self.silnik.wejscia))
+            wynik = np.full(len(wiersze), np.nan)
+            if poprawne.any():
+                wynik[poprawne] = self.silnik.ocen_wsadowo(*wartosci[:, poprawne], metoda='analityczna')
+            wyjscie.write(('\n'.join(map('{:.2f}'.format, wynik.tolist())) + '\n').encode())
+            wyjscie.flush()
+            statystyki.dodaj(len(wiersze), int((~poprawne).sum()), time.perf_counter() - nadejscie)
+        czytnik.join()
+        if blad:
+            raise blad[0]
+        return statystyki.podsumowanie()
+
+    def _partie(self, deskryptor):
+        """
+            Description:
+                Czyta wejście blokami po ROZMIAR_ODCZYTU bajtów (os.read zwraca to, co jest już dostępne)
+                i dzieli je na partie pełnych wierszy. select() z limitem czasu pozwala wysłać niepełną partię,
+                gdy odczyty napływają wolno. Niepełny wiersz dłuższy niż MAKS_DLUGOSC_WIERSZA jest zastępowany
+                błędnym wierszem, a dalsze bajty do końca tego wiersza są pomijane.
+
+            Zwraca:
+                generator: Krotki (lista wierszy w bajtach, czas nadejścia najstarszego wiersza).
+        """
+        bufor, wiersze, nadejscie, pomijaj = b'', [], None, False
+        while True:
+            limit = None if nadejscie is None else max(0.0, nadejscie + self.maks_opoznienie - time.perf_counter())
+            gotowe, _, _ = select.select([deskryptor], [], [], limit)
+            if gotowe:
+                blok = os.read(deskryptor, ROZMIAR_ODCZYTU)
+                if not blok:
+                    break
+                czesci = (bufor + blok).split(b'\n')
+                if pomijaj:
+                    pomijaj = len(czesci) == 1
+                    czesci = [b''] if pomijaj else czesci[1:]
+                *nowe, bufor = czesci
+                nowe = [wiersz for wiersz in nowe if wiersz.strip()]
+                if len(bufor) > MAKS_DLUGOSC_WIERSZA:
+                    nowe.append(ZA_DLUGI_WIERSZ)
+                    bufor, pomijaj = b'', True
+                if nowe and nadejscie is None:
+                    nadejscie = time.perf_counter()
+                wiersze.extend(nowe)
+            while len(wiersze) >= self.rozmiar_partii:
+                yield wiersze[:self.rozmiar_partii], nadejscie
+                wiersze = wiersze[self.rozmiar_partii:]
+                nadejscie = time.perf_counter() if wiersze else None
+            if wiersze and time.perf_counter() - nadejscie >= self.maks_opoznienie:
+                yield wiersze, nadejscie
+                wiersze, nadejscie = [], None
+        if bufor.strip():
+            wiersze.append(bufor)
+        if wiersze:
+            yield wiersze, nadejscie if nadejscie is not None else time.perf_counter()
+
+
+def _parsuj(wiersze, liczba_pol):
+    """
+        Description:
+            Zamienia wiersze "widocznosc,opady,ruch" na tablicę (liczba_pol x liczba wierszy) jedną konwersją numpy.
+            Gdy w partii jest błędny wiersz (inna liczba pól albo nie-liczba), partia jest parsowana wiersz
+            po wierszu, a błędne wiersze są oznaczane w masce.
+
+        Zwraca:
+            tuple: (wartości (liczba_pol x wiersze), maska poprawnych wierszy).
+    """
+    if all(wiersz.count(b',') == liczba_pol - 1 for wiersz in wiersze):
+        try:
+            wartosci = np.array(b','.join(wiersze).split(b','), dtype=np.float64)
+            return wartosci.reshape(-1, liczba_pol).T, np.ones(len(wiersze), dtype=bool)
+        except ValueError:
+            pass
+    wartosci = np.zeros((liczba_pol, len(wiersze)))
+    poprawne = np.zeros(len(wiersze), dtype=bool)
+    for i, wiersz in enumerate(wiersze):
+        pola = wiersz.split(b',')
+        try:
+            if len(pola) == liczba_pol:
+                wartosci[:, i] = [float(pole) for pole in pola]
+                poprawne[i] = True
+        except ValueError:
+            pass
+    return wartosci, poprawne
+
+
+class Statystyki:
+    """
+        Description:
+            Przepustowość i opóźnienia strumienia. Opóźnienie partii to czas od nadejścia jej najstarszego odczytu
+            do zapisania wyników, przypisywany wszystkim odczytom partii (górne oszacowanie). Pamiętanych jest
+            ostatnie maks_partii partii, więc pamięć nie rośnie z długością strumienia.
+    """
+
+    def __init__(self, maks_partii=100000):
+        self.opoznienia = deque(maxlen=maks_partii)
+        self.liczby = deque(maxlen=maks_partii)
+        self.odczyty = 0
+        self.bledne = 0
+        self.poczatek = None
+
+    def start(self):
+        self.poczatek = time.perf_counter()
+
+    def dodaj(self, liczba, bledne, opoznienie):
+        self.odczyty += liczba
+        self.bledne += bledne
+        self.opoznienia.append(opoznienie)
+        self.liczby.append(liczba)
+
+    def podsumowanie(self):
+        """
+            Zwraca:
+                dict: odczyty, bledne, sekundy, odczyty_na_sekunde oraz percentyle opóźnienia p50, p95, p99
+                    i maksimum (w milisekundach, ważone liczbą odczytów w partii).
+        """
+        sekundy = time.perf_counter() - self.poczatek
+        wynik = {'odczyty': self.odczyty, 'bledne': self.bledne, 'sekundy': sekundy,
+                 'odczyty_na_sekunde': self.odczyty / sekundy if sekundy else 0.0}
+        if self.opoznienia:
+            opoznienia = np.array(self.opoznienia) * 1000
+            kolejnosc = np.argsort(opoznienia)
+            skumulowane = np.cumsum(np.array(self.liczby)[kolejnosc])
+            for nazwa, procent in (('p50_ms', 50), ('p95_ms', 95), ('p99_ms', 99)):
+                indeks = np.searchsorted(skumulowane, procent / 100 * skumulowane[-1])
+                wynik[nazwa] = float(opoznienia[kolejnosc[min(indeks, len(kolejnosc) - 1)]])
+            wynik['max_ms'] = float(opoznienia.max())
+        return wynik
+
+
+def otworz_zrodlo(adres):
+    """
+        Description:
+            Otwiera źródło odczytów. Dla gniazd program nasłuchuje i przyjmuje jedno połączenie od nadawcy.
+
+        Parametry:
+            adres (str): '-' (stdin), 'tcp:host:port', 'unix:ścieżka' albo ścieżka do pliku.
+
+        Zwraca:
+            file | socket.socket: Źródło z metodą fileno().
+    """
+    if adres == '-':
+        return sys.stdin.buffer
+    if adres.startswith('tcp:'):
+        _, host, port = adres.split(':')
+        serwer = socket.create_server((host, int(port)))
+    elif adres.startswith('unix:'):
+        serwer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        serwer.bind(adres[len('unix:'):])
+        serwer.listen(1)
+    else:
+        return open(adres, 'rb')
+    with serwer:
+        polaczenie, _ = serwer.accept()
+    return polaczenie
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Strumieniowa ocena ryzyka jazdy (wiersze "widocznosc,opady,ruch")')
+    parser.add_argument('zrodlo', nargs='?', default='-', help='"-" (stdin), plik, "tcp:host:port" albo "unix:ścieżka" (domyślnie stdin)')
+    parser.add_argument('--wyjscie', type=str, help='Plik wyników (domyślnie stdout)')
+    parser.add_argument('--partia', type=int, default=4096, help='Maksymalny rozmiar mikro-partii (domyślnie 4096)')
+    parser.add_argument('--opoznienie', type=float, default=0.05, help='Maksymalne oczekiwanie na partię w sekundach (domyślnie 0.05)')
+    parser.add_argument('--reguly', type=str, help='Plik bazy reguł JSON/YAML (domyślnie BAZA_REGUL)')
+    parser.add_argument('--kolejka', type=int, default=8, help='Maksymalna liczba partii w kolejce (domyślnie 8)')
+    args = parser.parse_args()
+
+    silnik = SilnikRyzyka(wczytaj_baze(args.reguly)) if args.reguly else None
+    strumien = StrumienRyzyka(silnik, rozmiar_partii=args.partia, maks_opoznienie=args.opoznienie, dlugosc_kolejki=args.kolejka)
+    with contextlib.ExitStack() as zamknij:
+        wejscie = otworz_zrodlo(args.zrodlo)
+        if wejscie is not sys.stdin.buffer:
+            zamknij.enter_context(wejscie)
+        wyjscie = zamknij.enter_context(open(args.wyjscie, 'wb')) if args.wyjscie else sys.stdout.buffer
+        statystyki = strumien.przetworz(wejscie, wyjscie)
+    print(' '.join(f'{klucz}={wartosc:.6g}' for klucz, wartosc in statystyki.items()), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
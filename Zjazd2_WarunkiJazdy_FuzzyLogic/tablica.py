@@ -0,0 +1,160 @@
+import itertools
+import os
+
+import numpy as np
+
+from fuzzy import pobierz_silnik
+
+
+class TablicaRyzyka:
+    """
+        Autorzy:
+            Kamil Powierza
+            Dawid Feister
+
+        Wymagane biblioteki:
+            1. numpy
+
+        Description:
+            Gdy reguły są ustalone, ryzyko jest stałą funkcją zmiennych wejściowych silnika (dla domyślnej bazy
+            trzech zmiennych). Tablica wylicza ją raz na siatce rozmiar^liczba zmiennych punktów rozpiętej na
+            uniwersach zmiennych (np. 101^3) dokładną metodą 'analityczna' SilnikRyzyka.ocen_wsadowo i zapisuje
+            do pliku .npy, który przy kolejnych uruchomieniach jest otwierany przez memmap (tylko do odczytu,
+            współdzielony między procesami). Zapytania są obsługiwane interpolacją wieloliniową z sąsiednich punktów
+            siatki (dla trzech zmiennych trójliniową z 8 punktów), wektorowo dla całych tablic odczytów, więc
+            ocena kosztuje ok. 200 ns zamiast pełnego wnioskowania rozmytego.
+
+            Funkcja ryzyka ma załamania (minimum i maksimum w regułach), więc interpolacja nie jest dokładna -
+            maksymalny_blad() porównuje tablicę z silnikiem na losowych punktach (dla domyślnej bazy i siatki 101^3
+            błąd maksymalny ok. 0.31, średni ok. 0.0016).
+
+        Przykład:
+            tablica = TablicaRyzyka.zbuduj('ryzyko_101.npy', rozmiar=101)
+            ryzyko = tablica.odczytaj(widocznosc, opady, ruch)
+            print(tablica.maksymalny_blad())
+    """
+
+    def __init__(self, wartosci, zakresy=None):
+        """
+            Parametry:
+                wartosci (numpy.ndarray): Ryzyko na siatce (rozmiar x ... x rozmiar), jedna oś na zmienną wejściową
+                    silnika, w kolejności silnik.wejscia (dla domyślnej bazy: widoczność, intensywność opadów,
+                    natężenie ruchu).
+                zakresy (numpy.ndarray): Początek i koniec siatki na każdej osi (osie x 2).
+                    Default: None ([0, 100] na każdej osi).
+        """
+        if min(wartosci.shape, default=0) < 2:
+            raise ValueError(f"Siatka musi mieć co najmniej 2 punkty na każdej osi, otrzymano kształt {wartosci.shape}.")
+        self.wartosci = wartosci
+        self.rozmiar = wartosci.shape[0]
+        self.zakresy = np.array(zakresy if zakresy is not None else [[0, 100]] * wartosci.ndim, dtype=np.float64)
+        self.krok = (self.zakresy[:, 1] - self.zakresy[:, 0]) / (np.array(wartosci.shape) - 1)
+
+    @classmethod
+    def zbuduj(cls, sciezka, rozmiar=101, silnik=None):
+        """
+            Description:
+                Wylicza ryzyko w każdym punkcie siatki i zapisuje je do pliku .npy. Liczba osi i zakres każdej
+                z nich (początek i koniec uniwersum zmiennej) pochodzą z silnik.wejscia; zakresy są zapisywane
+                obok tablicy w pliku _zakresy_pliku(sciezka). Plik jest zapisywany warstwami (jedna wartość
+                pierwszej zmiennej naraz) przez open_memmap, więc cała siatka nie musi mieścić się w pamięci.
+
+            Parametry:
+                sciezka (str): Ścieżka do pliku .npy.
+                rozmiar (int): Liczba punktów siatki na każdej osi (co najmniej 2). Default: 101.
+                silnik (SilnikRyzyka): Silnik oceny ryzyka. Default: None (wspólny silnik z pobierz_silnik()).
+
+            Zwraca:
+                TablicaRyzyka: Tablica otwarta z zapisanego pliku.
+        """
+        if rozmiar < 2:
+            raise ValueError(f"Siatka musi mieć co najmniej 2 punkty na każdej osi, otrzymano rozmiar={rozmiar}.")
+        silnik = silnik if silnik is not None else pobierz_silnik()
+        zakresy = np.array([[silnik.zmienne[nazwa].universe[0], silnik.zmienne[nazwa].universe[-1]]
+                            for nazwa in silnik.wejscia])
+        siatki = [np.linspace(poczatek, koniec, rozmiar) for poczatek, koniec in zakresy]
+        pozostale = [os_siatki.ravel() for os_siatki in np.meshgrid(*siatki[1:], indexing='ij')]
+        ksztalt = (rozmiar,) * len(siatki)
+        wartosci = np.lib.format.open_memmap(sciezka, mode='w+', dtype=np.float64, shape=ksztalt)
+        for i, pierwsza in enumerate(siatki[0]):
+            warstwa = silnik.ocen_wsadowo(np.full(rozmiar ** (len(siatki) - 1), pierwsza), *pozostale,
+                                          metoda='analityczna')
+            wartosci[i] = warstwa.reshape(ksztalt[1:])
+        wartosci.flush()
+        del wartosci
+        np.save(_zakresy_pliku(sciezka), zakresy)
+        return cls.otworz(sciezka)
+
+    @classmethod
+    def otworz(cls, sciezka):
+        """
+            Parametry:
+                sciezka (str): Ścieżka do pliku zapisanego przez zbuduj().
+
+            Zwraca:
+                TablicaRyzyka: Tablica z wartościami otwartymi przez memmap.
+        """
+        plik_zakresow = _zakresy_pliku(sciezka)
+        zakresy = np.load(plik_zakresow) if os.path.exists(plik_zakresow) else None
+        return cls(np.load(sciezka, mmap_mode='r'), zakresy)
+
+    def odczytaj(self, *wartosci):
+        """
+            Description:
+                Interpolacja wieloliniowa (dla trzech zmiennych trójliniowa) z 2^liczba zmiennych sąsiednich punktów
+                siatki. Wartości wejściowe są przycinane do zakresu siatki.
+
+            Parametry:
+                wartosci (float | numpy.ndarray): Wartości zmiennych wejściowych w kolejności osi tablicy; dla
+                    domyślnej bazy widoczność, intensywność opadów i natężenie ruchu.
+
+            Zwraca:
+                numpy.ndarray: Poziomy ryzyka jazdy (0 - 100), kształt jak wejście.
+        """
+        if len(wartosci) != self.wartosci.ndim:
+            raise ValueError(f"Oczekiwano {self.wartosci.ndim} wartości wejściowych, otrzymano {len(wartosci)}.")
+        wartosci = np.broadcast_arrays(*(np.asarray(wartosc, dtype=np.float64) for wartosc in wartosci))
+        ksztalt = wartosci[0].shape
+        kroki = np.cumprod((1,) + self.wartosci.shape[:0:-1])[::-1]
+
+        baza, ulamki = 0, []
+        for wartosc, (poczatek, koniec), krok, rozmiar, krok_indeksu in zip(
+                wartosci, self.zakresy, self.krok, self.wartosci.shape, kroki):
+            pozycja = (np.clip(wartosc.ravel(), poczatek, koniec) - poczatek) / krok
+            indeks = np.minimum(pozycja.astype(np.intp), rozmiar - 2)
+            baza = baza + indeks * krok_indeksu
+            ulamki.append(pozycja - indeks)
+
+        naroza = np.array(list(itertools.product((0, 1), repeat=len(kroki)))) @ kroki
+        wynik = self.wartosci.reshape(-1)[naroza[:, None] + baza].reshape((2,) * len(kroki) + (-1,))
+        for ulamek in ulamki:
+            wynik = wynik[0] * (1 - ulamek) + wynik[1] * ulamek
+        return wynik.reshape(ksztalt)
+
+    def maksymalny_blad(self, liczba_probek=100000, silnik=None, ziarno=0):
+        """
+            Description:
+                Porównuje interpolację z silnikiem na losowych punktach z zakresu siatki. Odniesieniem jest dokładny
+                środek ciężkości (metoda 'analityczna'), a nie przybliżenie próbkowaniem uniwersum.
+
+            Parametry:
+                liczba_probek (int): Liczba losowych punktów. Default: 100000.
+                silnik (SilnikRyzyka): Silnik odniesienia. Default: None (wspólny silnik z pobierz_silnik()).
+                ziarno (int): Ziarno generatora liczb losowych. Default: 0.
+
+            Zwraca:
+                dict: maksymalny (największy błąd bezwzględny), sredni (średni błąd), punkt (wejście z największym błędem).
+        """
+        silnik = silnik if silnik is not None else pobierz_silnik()
+        punkty = np.random.default_rng(ziarno).uniform(self.zakresy[:, :1], self.zakresy[:, 1:],
+                                                       (len(self.zakresy), liczba_probek))
+        blad = np.abs(self.odczytaj(*punkty) - silnik.ocen_wsadowo(*punkty, metoda='analityczna'))
+        return {'maksymalny': float(blad.max()), 'sredni': float(blad.mean()), 'punkt': punkty[:, blad.argmax()].tolist()}
+
+
+def _zakresy_pliku(sciezka):
+    """
+        Zwraca:
+            str: Ścieżka pliku z zakresami osi tablicy zapisanej w sciezka (np. ryzyko_101.zakresy.npy).
+    """
+    return os.path.splitext(sciezka)[0] + '.zakresy.npy'
@@ -0,0 +1,140 @@
+import os
+
+import numpy as np
+import pytest
+
+from fuzzy import SilnikRyzyka, animacja_car
+from tablica import TablicaRyzyka
+
+pytestmark = pytest.mark.filterwarnings('ignore::DeprecationWarning:skfuzzy')
+
+"""
+    TOLERANCJA_PROBKOWANIA
+        Description:
+            Największa dopuszczalna różnica metody 'probkowanie' względem skfuzzy dla uniwersum wyjścia o kroku 0.1.
+            skfuzzy zagęszcza uniwersum w punktach obcięcia terminów, a metoda 'probkowanie' nie, więc wyniki różnią
+            się o setne części (dla domyślnej bazy do ok. 0.012, dla terminów trapmf do ok. 0.025).
+"""
+TOLERANCJA_PROBKOWANIA = 0.05
+
+"""
+    TOLERANCJA_ANALITYCZNA
+        Description:
+            Największa dopuszczalna różnica metody 'analityczna' względem skfuzzy. Obie liczą środek ciężkości tej
+            samej łamanej, różnice wynikają tylko z interpolacji funkcji przynależności w punktach uniwersum.
+"""
+TOLERANCJA_ANALITYCZNA = 1e-3
+
+BAZA_MIESZANA = {
+    'wejscia': {
+        'widocznosc': {'uniwersum': [0, 101, 0.1], 'automf': 5},
+        'opady': {'uniwersum': [0, 101, 0.1], 'terminy': {
+            'slabe': {'gaussmf': [0, 20]},
+            'srednie': {'trimf': [20, 50, 80]},
+            'silne': {'trapmf': [60, 80, 100, 100]},
+        }},
+    },
+    'wyjscie': {
+        'nazwa': 'ryzyko',
+        'uniwersum': [0, 101, 0.1],
+        'terminy': {
+            'niskie': {'trimf': [0, 0, 50]},
+            'srednie': {'trapmf': [20, 40, 60, 80]},
+            'wysokie': {'trimf': [50, 100, 100]},
+        },
+    },
+    'reguly': [
+        {'jezeli': [['widocznosc', 'good'], ['widocznosc', 'decent']], 'to': 'niskie'},
+        {'jezeli': [['widocznosc', 'average'], ['opady', 'srednie']], 'operator': 'and', 'to': 'srednie'},
+        {'jezeli': [['widocznosc', 'mediocre'], ['opady', 'silne']], 'to': 'wysokie'},
+        {'jezeli': [['widocznosc', 'poor'], ['opady', 'silne']], 'operator': 'and', 'to': 'wysokie'},
+        {'jezeli': [['opady', 'slabe']], 'to': 'niskie'},
+    ],
+}
+
+
+def _skfuzzy(silnik, punkty):
+    wyniki = []
+    for punkt in punkty.T:
+        for nazwa, wartosc in zip(silnik.wejscia, punkt):
+            silnik.ryzyko_sim.input[nazwa] = wartosc
+        silnik.ryzyko_sim.compute()
+        wyniki.append(silnik.ryzyko_sim.output[silnik.ryzyko.label])
+    return np.array(wyniki)
+
+
+@pytest.mark.parametrize('baza', [None, BAZA_MIESZANA], ids=['domyslna', 'mieszana'])
+def test_ocen_wsadowo_zgodne_z_controlsystem(baza):
+    silnik = SilnikRyzyka(baza)
+    punkty = np.random.default_rng(1).uniform(0, 100, (len(silnik.wejscia), 300))
+    oczekiwane = _skfuzzy(silnik, punkty)
+    np.testing.assert_allclose(silnik.ocen_wsadowo(*punkty), oczekiwane, rtol=0, atol=TOLERANCJA_PROBKOWANIA)
+
+
+@pytest.mark.parametrize('baza', [None, BAZA_MIESZANA], ids=['domyslna', 'mieszana'])
+def test_wyostrzanie_analityczne_zgodne_na_siatce(baza):
+    silnik = SilnikRyzyka(baza)
+    osie = np.meshgrid(*[np.linspace(0, 100, 7)] * len(silnik.wejscia), indexing='ij')
+    punkty = np.array([os_siatki.ravel() for os_siatki in osie])
+    analityczna = silnik.ocen_wsadowo(*punkty, metoda='analityczna')
+    probkowanie = silnik.ocen_wsadowo(*punkty, metoda='probkowanie')
+    skalarne = np.array([silnik.ocen(*punkt) for punkt in punkty.T])
+    np.testing.assert_allclose(analityczna, skalarne, rtol=0, atol=TOLERANCJA_ANALITYCZNA)
+    np.testing.assert_allclose(analityczna, probkowanie, rtol=0, atol=TOLERANCJA_PROBKOWANIA)
+
+
+def test_porownaj_wyostrzanie():
+    wynik = SilnikRyzyka().porownaj_wyostrzanie(liczba_probek=5000, liczba_probek_skfuzzy=50)
+    assert wynik['probkowanie'] < TOLERANCJA_PROBKOWANIA
+    assert wynik['skfuzzy'] < TOLERANCJA_ANALITYCZNA
+
+
+@pytest.mark.parametrize('baza', [None, BAZA_MIESZANA], ids=['domyslna', 'mieszana'])
+def test_tryb_rzadki_zgodny_z_pelnym(baza):
+    punkty = np.random.default_rng(2).uniform(-10, 110, (len(SilnikRyzyka(baza).wejscia), 20000))
+    pelne = SilnikRyzyka(baza, rzadkie=False).sily_regul(*punkty)
+    rzadkie = SilnikRyzyka(baza, rzadkie=True).sily_regul(*punkty)
+    np.testing.assert_array_equal(pelne, rzadkie)
+
+
+def test_brak_dzialajacej_reguly_daje_nan():
+    baza = {
+        'wejscia': BAZA_MIESZANA['wejscia'],
+        'wyjscie': BAZA_MIESZANA['wyjscie'],
+        'reguly': [{'jezeli': [['widocznosc', 'good'], ['opady', 'silne']], 'operator': 'and', 'to': 'wysokie'}],
+    }
+    silnik = SilnikRyzyka(baza)
+    with np.errstate(all='raise'):
+        for metoda in ('probkowanie', 'analityczna'):
+            wynik = silnik.ocen_wsadowo(np.array([0.0, 100.0]), np.array([0.0, 100.0]), metoda=metoda)
+            assert np.isnan(wynik[0])
+            assert wynik[1] == pytest.approx(250 / 3, abs=0.05)
+    with pytest.raises((ValueError, KeyError)):
+        silnik.ocen(0, 0)
+
+
+def test_tablica_dla_silnika_dwoch_zmiennych(tmp_path):
+    silnik = SilnikRyzyka(BAZA_MIESZANA)
+    tablica = TablicaRyzyka.zbuduj(str(tmp_path / 'ryzyko.npy'), rozmiar=41, silnik=silnik)
+    assert tablica.wartosci.shape == (41, 41)
+    np.testing.assert_allclose(tablica.zakresy, [[0, 100.9], [0, 100.9]])
+    otwarta = TablicaRyzyka.otworz(str(tmp_path / 'ryzyko.npy'))
+    siatka = np.linspace(0, 100.9, 41)[[0, 7, 40]]
+    np.testing.assert_allclose(otwarta.odczytaj(siatka, siatka), silnik.ocen_wsadowo(siatka, siatka, metoda='analityczna'))
+    assert otwarta.maksymalny_blad(2000, silnik)['sredni'] < 0.5
+
+
+def test_tablica_wymaga_dwoch_punktow_siatki(tmp_path):
+    with pytest.raises(ValueError):
+        TablicaRyzyka.zbuduj(str(tmp_path / 'ryzyko.npy'), rozmiar=1)
+
+
+@pytest.mark.parametrize('sterownik', [None, 'x11'])
+def test_animacja_bez_okna_przywraca_sterownik(tmp_path, monkeypatch, sterownik):
+    if sterownik is None:
+        monkeypatch.delenv('SDL_VIDEODRIVER', raising=False)
+    else:
+        monkeypatch.setenv('SDL_VIDEODRIVER', sterownik)
+    animacja_car(90, 10, 10, katalog_klatek=str(tmp_path), fps=5)
+    assert os.environ.get('SDL_VIDEODRIVER') == sterownik
+    assert len(list(tmp_path.glob('klatka_*.png'))) > 3 * 5
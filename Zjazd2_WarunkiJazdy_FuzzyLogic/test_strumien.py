@@ -0,0 +1,55 @@
+import io
+import os
+import threading
+import tracemalloc
+
+import numpy as np
+
+from strumien import MAKS_DLUGOSC_WIERSZA, StrumienRyzyka
+
+
+def _przetworz(dane, rozmiar_bloku=None):
+    odczyt, zapis = os.pipe()
+
+    def wyslij():
+        with os.fdopen(zapis, 'wb') as plik:
+            krok = rozmiar_bloku or len(dane) or 1
+            for poczatek in range(0, len(dane), krok):
+                plik.write(dane[poczatek:poczatek + krok])
+                plik.flush()
+
+    nadawca = threading.Thread(target=wyslij)
+    nadawca.start()
+    wyjscie = io.BytesIO()
+    with os.fdopen(odczyt, 'rb') as wejscie:
+        statystyki = StrumienRyzyka(rozmiar_partii=4).przetworz(wejscie, wyjscie)
+    nadawca.join()
+    return [float(wiersz) for wiersz in wyjscie.getvalue().split()], statystyki
+
+
+def test_wyniki_w_kolejnosci_wierszy():
+    wyniki, statystyki = _przetworz(b'80,10,30\nzly wiersz\n20,90,90\n1,2\n50,50,50')
+    assert len(wyniki) == 5
+    assert np.isnan(wyniki[1]) and np.isnan(wyniki[3])
+    assert statystyki['odczyty'] == 5 and statystyki['bledne'] == 2
+
+
+def test_za_dlugi_wiersz_nie_jest_gromadzony():
+    dlugi = b'1' * (20 * MAKS_DLUGOSC_WIERSZA)
+    wyniki, statystyki = _przetworz(b'80,10,30\n' + dlugi + b'\n20,90,90\n' + dlugi, rozmiar_bloku=1000)
+    assert len(wyniki) == 4
+    assert not np.isnan(wyniki[0]) and not np.isnan(wyniki[2])
+    assert np.isnan(wyniki[1]) and np.isnan(wyniki[3])
+    assert statystyki['bledne'] == 2
+
+
+def test_pamiec_ograniczona_bez_znakow_nowej_linii():
+    dane = b'1' * (16 << 20)
+    tracemalloc.start()
+    try:
+        wyniki, _ = _przetworz(dane, rozmiar_bloku=1 << 16)
+        _, szczyt = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(wyniki) == 1 and np.isnan(wyniki[0])
+    assert szczyt < 4 << 20
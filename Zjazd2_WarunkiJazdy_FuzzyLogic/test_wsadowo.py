@@ -0,0 +1,30 @@
+import numpy as np
+
+from fuzzy import SilnikRyzyka
+from wsadowo import ocen_plik
+
+
+def test_csv_z_naglowkiem_zgodny_z_ocen_wsadowo(tmp_path):
+    punkty = np.random.default_rng(0).uniform(0, 100, (3, 500))
+    wejscie = tmp_path / 'odczyty.csv'
+    wiersze = ['natezenie_ruchu,id,widocznosc,intensywnosc_opadow']
+    wiersze += [f'{ruch},{i},{widocznosc},{opady}' for i, (widocznosc, opady, ruch) in enumerate(punkty.T)]
+    wejscie.write_text('\n'.join(wiersze) + '\n')
+    assert ocen_plik(str(wejscie), str(tmp_path / 'ryzyko.npy'), procesy=2) == 500
+    np.testing.assert_allclose(np.load(tmp_path / 'ryzyko.npy'),
+                               SilnikRyzyka().ocen_wsadowo(*punkty, metoda='analityczna'))
+
+
+def test_npy(tmp_path):
+    punkty = np.random.default_rng(1).uniform(0, 100, (200, 3))
+    np.save(tmp_path / 'odczyty.npy', punkty)
+    assert ocen_plik(str(tmp_path / 'odczyty.npy'), str(tmp_path / 'ryzyko.npy'), procesy=1) == 200
+    np.testing.assert_allclose(np.load(tmp_path / 'ryzyko.npy'),
+                               SilnikRyzyka().ocen_wsadowo(*punkty.T, metoda='analityczna'))
+
+
+def test_pusty_csv(tmp_path):
+    for nazwa, tresc in (('pusty.csv', ''), ('naglowek.csv', 'widocznosc,intensywnosc_opadow,natezenie_ruchu\n')):
+        (tmp_path / nazwa).write_text(tresc)
+        assert ocen_plik(str(tmp_path / nazwa), str(tmp_path / 'ryzyko.npy'), procesy=1) == 0
+        assert np.load(tmp_path / 'ryzyko.npy').shape == (0,)
@@ -0,0 +1,257 @@
+import argparse
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # komunikat pygame przy imporcie fuzzy w każdym procesie
+from fuzzy import BAZA_REGUL, SilnikRyzyka, wczytaj_baze
+
+"""
+    ROZMIAR_CZESCI, WIERSZE_CZESCI, ROZMIAR_BLOKU
+        Description:
+            ROZMIAR_CZESCI - przybliżony rozmiar jednej części pliku CSV w bajtach (jedno zadanie dla procesu).
+            WIERSZE_CZESCI - liczba wierszy jednej części pliku .npy.
+            ROZMIAR_BLOKU - liczba bajtów CSV parsowanych naraz w procesie roboczym (ogranicza pamięć procesu).
+"""
+ROZMIAR_CZESCI = 1 << 25
+WIERSZE_CZESCI = 1 << 20
+ROZMIAR_BLOKU = 1 << 22
+
+_proces = {}
+
+
+def ocen_plik(wejscie, wyjscie, procesy=None, metoda='analityczna', baza=None, log=None):
+    """
+        Autorzy:
+            Kamil Powierza
+            Dawid Feister
+
+        Wymagane biblioteki:
+            1. numpy
+            2. pyarrow (tylko dla plików .parquet)
+
+        Description:
+            Ocena ryzyka dla dużego pliku odczytów (np. rok odczytów minutowych dla tysięcy odcinków dróg)
+            na wielu rdzeniach. Plik jest dzielony na części, a każda część jest zadaniem dla puli procesów.
+            Każdy proces buduje raz własny SilnikRyzyka (inicjalizacja puli) i sam czyta swoją część pliku:
+                - CSV - zakres bajtów zaczynający i kończący się na granicy wiersza (plik otwarty przez mmap),
+                - .npy - zakres wierszy tablicy (liczba wierszy x 3) otwartej przez memmap,
+                - Parquet - grupy wierszy (row groups), czytane przez pyarrow tylko w potrzebnych kolumnach.
+            Wyniki są zapisywane przez memmap do wspólnego pliku .npy pod indeksami wierszy wejścia, więc
+            kolejność wyników odpowiada kolejności wierszy, a między procesami przesyłane są tylko opisy części
+            (ścieżka, zakres, pierwszy wiersz) - żadne dane nie są serializowane.
+
+            CSV może mieć nagłówek z nazwami kolumn (wtedy brane są kolumny o nazwach zmiennych wejściowych bazy
+            reguł, pozostałe kolumny są pomijane) albo kolumny bez nagłówka w kolejności zmiennych wejściowych. Liczba wierszy w każdej
+            części CSV nie jest znana z góry, dlatego pierwsza runda zadań liczy wiersze części, a druga ocenia je
+            z już znanym przesunięciem w pliku wyników.
+
+        Parametry:
+            wejscie (str): Plik odczytów (.csv, .npy albo .parquet).
+            wyjscie (str): Plik wyników .npy (float64, jeden poziom ryzyka na wiersz wejścia).
+            procesy (int): Liczba procesów. Default: None (liczba rdzeni).
+            metoda (str): Metoda wyostrzania z SilnikRyzyka.ocen_wsadowo. Default: 'analityczna'.
+            baza (dict): Baza reguł dla SilnikRyzyka (np. z wczytaj_baze()). Default: None (BAZA_REGUL).
+            log (callable): Funkcja wywoływana z opisem postępu (np. print). Default: None.
+
+        Zwraca:
+            int: Liczba ocenionych wierszy.
+
+        Przykład:
+            ocen_plik('odczyty.csv', 'ryzyko.npy', procesy=8)
+            ryzyko = np.load('ryzyko.npy', mmap_mode='r')
+    """
+    rozszerzenie = os.path.splitext(wejscie)[1].lower()
+    wejscia = list((baza if baza is not None else BAZA_REGUL)['wejscia'])
+    with multiprocessing.Pool(procesy, _init_proces, (metoda, baza)) as pula:
+        if rozszerzenie == '.csv':
+            kolumny, czesci = _czesci_csv(wejscie, wejscia)
+            liczby = pula.map(_policz_wiersze, [(wejscie, poczatek, koniec) for poczatek, koniec in czesci])
+            przesuniecia = np.concatenate(([0], np.cumsum(liczby, dtype=np.int64))).tolist()
+            zadania = [(_czytaj_csv, wejscie, poczatek, koniec, kolumny, przesuniecie)
+                       for (poczatek, koniec), przesuniecie in zip(czesci, przesuniecia)]
+        elif rozszerzenie == '.npy':
+            liczba = len(np.load(wejscie, mmap_mode='r'))
+            przesuniecia = list(range(0, liczba, WIERSZE_CZESCI)) + [liczba]
+            zadania = [(_czytaj_npy, wejscie, poczatek, koniec, None, poczatek)
+                       for poczatek, koniec in zip(przesuniecia[:-1], przesuniecia[1:])]
+        elif rozszerzenie == '.parquet':
+            metadane = _parquet().ParquetFile(wejscie).metadata
+            liczby = [metadane.row_group(i).num_rows for i in range(metadane.num_row_groups)]
+            przesuniecia = np.concatenate(([0], np.cumsum(liczby, dtype=np.int64))).tolist()
+            zadania = [(_czytaj_parquet, wejscie, i, i + 1, wejscia, przesuniecie)
+                       for i, przesuniecie in enumerate(przesuniecia[:-1])]
+        else:
+            raise ValueError(f"Nieobsługiwany format pliku: {wejscie}. Dostępne: .csv, .npy, .parquet.")
+
+        liczba = przesuniecia[-1]
+        wyniki = np.lib.format.open_memmap(wyjscie, mode='w+', dtype=np.float64, shape=(liczba,))
+        del wyniki
+        for gotowe, _ in enumerate(pula.imap_unordered(_zadanie, [zadanie + (wyjscie,) for zadanie in zadania]), 1):
+            if log is not None:
+                log(f"Ocenione części: {gotowe}/{len(zadania)}")
+    return liczba
+
+
+def _parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Odczyt plików Parquet wymaga biblioteki pyarrow (pip install pyarrow).")
+    return pq
+
+
+def _init_proces(metoda, baza):
+    """
+        Description:
+            Inicjalizacja procesu roboczego: własny SilnikRyzyka budowany raz na cały czas życia procesu.
+    """
+    _proces['silnik'] = SilnikRyzyka(baza)
+    _proces['metoda'] = metoda
+
+
+def _zadanie(zadanie):
+    """
+        Description:
+            Wczytuje część wejścia funkcją czytającą z zadania, ocenia ją i zapisuje wynik przez memmap
+            od wiersza przesuniecie.
+
+        Parametry:
+            zadanie (tuple): (funkcja czytająca, plik wejścia, początek, koniec, kolumny, przesunięcie, plik wyników).
+
+        Zwraca:
+            int: Liczba ocenionych wierszy.
+    """
+    czytaj, wejscie, poczatek, koniec, kolumny, przesuniecie, wyjscie = zadanie
+    wyniki = np.load(wyjscie, mmap_mode='r+')
+    liczba = 0
+    for wartosci in czytaj(wejscie, poczatek, koniec, kolumny):
+        ryzyko = _proces['silnik'].ocen_wsadowo(*wartosci, metoda=_proces['metoda'])
+        wyniki[przesuniecie + liczba:przesuniecie + liczba + len(ryzyko)] = ryzyko
+        liczba += len(ryzyko)
+    wyniki.flush()
+    return liczba
+
+
+def _czesci_csv(sciezka, wejscia):
+    """
+        Description:
+            Czyta nagłówek i dzieli resztę pliku na zakresy bajtów po około ROZMIAR_CZESCI, przesuwając każdą
+            granicę do końca wiersza. Pusty plik (którego nie da się otworzyć przez mmap) nie ma żadnej części.
+
+        Parametry:
+            sciezka (str): Plik CSV.
+            wejscia (list): Nazwy zmiennych wejściowych.
+
+        Zwraca:
+            tuple: ((indeksy kolumn wejść, liczba kolumn), lista zakresów (początek, koniec)).
+    """
+    if not os.path.getsize(sciezka):
+        return (list(range(len(wejscia))), len(wejscia)), []
+    with open(sciezka, 'rb') as plik, mmap.mmap(plik.fileno(), 0, access=mmap.ACCESS_READ) as dane:
+        pierwszy = dane.readline()
+        pola = [pole.strip().decode() for pole in pierwszy.split(b',')]
+        try:
+            [float(pole) for pole in pola]
+            indeksy, poczatek = list(range(len(wejscia))), 0
+        except ValueError:
+            brakujace = [nazwa for nazwa in wejscia if nazwa not in pola]
+            if brakujace:
+                raise ValueError(f"W nagłówku pliku {sciezka} brakuje kolumn: {', '.join(brakujace)}.")
+            indeksy, poczatek = [pola.index(nazwa) for nazwa in wejscia], len(pierwszy)
+        kolumny = (indeksy, len(pola))
+
+        czesci = []
+        while poczatek < len(dane):
+            koniec = dane.find(b'\n', min(poczatek + ROZMIAR_CZESCI, len(dane) - 1))
+            koniec = len(dane) if koniec < 0 else koniec + 1
+            czesci.append((poczatek, koniec))
+            poczatek = koniec
+    return kolumny, czesci
+
+
+def _bloki_csv(sciezka, poczatek, koniec):
+    """
+        Description:
+            Dzieli zakres bajtów CSV na bloki po około ROZMIAR_BLOKU pełnych, niepustych wierszy.
+
+        Zwraca:
+            generator: Listy wierszy (bajty).
+    """
+    with open(sciezka, 'rb') as plik, mmap.mmap(plik.fileno(), 0, access=mmap.ACCESS_READ) as dane:
+        while poczatek < koniec:
+            granica = dane.find(b'\n', min(poczatek + ROZMIAR_BLOKU, koniec - 1), koniec)
+            granica = koniec if granica < 0 else granica + 1
+            wiersze = [wiersz for wiersz in dane[poczatek:granica].split(b'\n') if wiersz.strip()]
+            if wiersze:
+                yield wiersze
+            poczatek = granica
+
+
+def _policz_wiersze(czesc):
+    """
+        Zwraca:
+            int: Liczba niepustych wierszy w zakresie bajtów (ścieżka, początek, koniec).
+    """
+    return sum(len(wiersze) for wiersze in _bloki_csv(*czesc))
+
+
+def _czytaj_csv(sciezka, poczatek, koniec, kolumny):
+    """
+        Description:
+            Parsuje bloki CSV jedną konwersją numpy na blok: wszystkie pola bloku trafiają do jednej listy,
+            z której co liczba_kolumn-te pole to kolejna kolumna.
+
+        Zwraca:
+            generator: Tablice (liczba wejść x wiersze bloku).
+    """
+    indeksy, liczba_kolumn = kolumny
+    for wiersze in _bloki_csv(sciezka, poczatek, koniec):
+        pola = b','.join(wiersze).split(b',')
+        if len(pola) != liczba_kolumn * len(wiersze):
+            raise ValueError(f"Wiersze w bajtach {poczatek}-{koniec} pliku {sciezka} mają złą liczbę kolumn "
+                             f"(oczekiwano {liczba_kolumn}).")
+        yield np.array([pola[i::liczba_kolumn] for i in indeksy], dtype=np.float64)
+
+
+def _czytaj_npy(sciezka, poczatek, koniec, kolumny):
+    """
+        Zwraca:
+            generator: Tablica (liczba wejść x wiersze) z wierszy [poczatek, koniec) pliku .npy
+                (liczba wierszy x liczba wejść).
+    """
+    yield np.asarray(np.load(sciezka, mmap_mode='r')[poczatek:koniec], dtype=np.float64).T
+
+
+def _czytaj_parquet(sciezka, poczatek, koniec, kolumny):
+    """
+        Zwraca:
+            generator: Tablica (liczba wejść x wiersze) z grup wierszy [poczatek, koniec) pliku Parquet
+                (kolumny o nazwach wejść).
+    """
+    tabela = _parquet().ParquetFile(sciezka).read_row_groups(list(range(poczatek, koniec)), columns=kolumny)
+    yield np.array([tabela.column(nazwa).to_numpy() for nazwa in kolumny], dtype=np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ocena ryzyka jazdy dla dużego pliku odczytów na wielu rdzeniach')
+    parser.add_argument('wejscie', help='Plik odczytów: .csv (kolumny ' + ','.join(BAZA_REGUL['wejscia']) + '), .npy albo .parquet')
+    parser.add_argument('wyjscie', help='Plik wyników .npy')
+    parser.add_argument('--procesy', type=int, default=None, help='Liczba procesów (domyślnie liczba rdzeni)')
+    parser.add_argument('--reguly', type=str, help='Plik bazy reguł JSON/YAML (domyślnie BAZA_REGUL)')
+    parser.add_argument('--metoda', choices=['analityczna', 'probkowanie'], default='analityczna', help='Metoda wyostrzania (domyślnie analityczna)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    baza = wczytaj_baze(args.reguly) if args.reguly else None
+    liczba = ocen_plik(args.wejscie, args.wyjscie, args.procesy, args.metoda, baza)
+    sekundy = time.perf_counter() - start
+    print(f"Ocenione wiersze: {liczba} w {sekundy:.2f} s ({liczba / sekundy:.0f} wierszy/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()